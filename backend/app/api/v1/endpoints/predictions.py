@@ -10,11 +10,18 @@ Created: 2025-12-25
 """
 
 from typing import List
-from datetime import datetime, timedelta
+from datetime import datetime
 
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, status
 from loguru import logger
 
+from app.core.epiweek import (
+    dates_to_epiweek_ids,
+    epiweek_ids_to_dates,
+    shift_epiweek_ids,
+    split_epiweek_ids,
+)
 from app.schemas.prediction import (
     PredictionRequest,
     PredictionResponse,
@@ -26,6 +33,7 @@ from app.schemas.prediction import (
     ModelMetadata,
 )
 from app.services.ml_service import (
+    LOOKBACK_WEEKS,
     MLService,
     get_ml_service,
     InsufficientDataError,
@@ -37,6 +45,10 @@ from app.services.data_service import (
     GeocodeNotFoundError,
     DataNotFoundError,
 )
+from app.services.forecast_features import get_city_forecast_features
+
+# Semanas do gráfico (linha verde); o modelo usa as últimas LOOKBACK_WEEKS
+CHART_WEEKS = 12
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -251,19 +263,11 @@ async def predict_dengue_cases(
         # ────────────────────────────────────────────────────────────────
         logger.debug(f"📊 Buscando dados históricos para {geocode}...")
         
-        # Busca últimas 12 semanas para gráfico (linha verde)
-        historical_data_full = await data_service.get_historical_data(
-            geocode=geocode,
-            weeks=12  # Últimas 12 semanas para exibir no gráfico
-        )
-        
-        # Últimas 4 semanas para input do modelo
-        historical_data = await data_service.get_historical_data(
-            geocode=geocode,
-            weeks=4  # Modelo requer 4 semanas
-        )
-        
-        city_name = await data_service.get_city_name(geocode)
+        # Uma busca só (janela do gráfico); o modelo usa uma fatia dela
+        series = await data_service.get_series(geocode, weeks=CHART_WEEKS)
+        historical_data_full = series.last(CHART_WEEKS)  # Linha verde
+        historical_data = series.last(LOOKBACK_WEEKS)  # Modelo requer 4 semanas
+        city_name = series.city_name
         
         logger.success(f"✅ Dados históricos carregados: {len(historical_data_full)} semanas (gráfico), {len(historical_data)} semanas (modelo)")
         
@@ -272,12 +276,15 @@ async def predict_dengue_cases(
         # ────────────────────────────────────────────────────────────────
         historical_weeks: List[HistoricalWeek] = []
         
-        # Ordena por data
-        historical_sorted = historical_data_full.sort_values("data_iniSE")
+        # Série já vem ordenada por data (mais antiga primeiro)
+        # Semanas epidemiológicas (calendário do MS, não ISO)
+        _, historical_epiweeks = split_epiweek_ids(
+            dates_to_epiweek_ids(historical_data_full["data_iniSE"])
+        )
         
-        for _, row in historical_sorted.iterrows():
+        for (_, row), week_number in zip(historical_data_full.iterrows(), historical_epiweeks):
             week_date = row["data_iniSE"]
-            week_number = week_date.isocalendar()[1]
+            week_number = int(week_number)
             cases = int(row["casos_est"]) if "casos_est" in row else 0
             
             historical_weeks.append(
@@ -300,10 +307,12 @@ async def predict_dengue_cases(
             cases, confidence = await ml_service.predict_next_week(historical_data)
             predictions_raw = [(cases, confidence)]
         else:
-            # Multi-step (recursivo)
+            # Multi-step (recursivo), com o clima previsto da célula do grid
+            future_climate = await get_city_forecast_features(geocode)
             predictions_raw = await ml_service.predict_multiple_weeks(
                 historical_data,
-                weeks_ahead=weeks_ahead
+                weeks_ahead=weeks_ahead,
+                future_climate=future_climate,
             )
         
         # ────────────────────────────────────────────────────────────────
@@ -311,16 +320,16 @@ async def predict_dengue_cases(
         # ────────────────────────────────────────────────────────────────
         predictions: List[WeekPrediction] = []
         
-        # Data base (última semana + 1)
-        last_date = historical_data["data_iniSE"].max()
-        next_date = last_date + timedelta(days=7)
+        # Semanas previstas: as seguintes à última semana observada
+        last_week_id = dates_to_epiweek_ids([historical_data["data_iniSE"].max()])[0]
+        future_ids = shift_epiweek_ids(last_week_id, np.arange(1, len(predictions_raw) + 1))
+        future_dates = epiweek_ids_to_dates(future_ids).tolist()
+        _, future_epiweeks = split_epiweek_ids(future_ids)
         
         for week_idx, (cases, conf) in enumerate(predictions_raw, start=1):
-            # Calcula data da semana
-            week_date = next_date + timedelta(days=7 * (week_idx - 1))
-            
-            # Semana epidemiológica
-            week_number = week_date.isocalendar()[1]
+            # Data e semana epidemiológica
+            week_date = future_dates[week_idx - 1]
+            week_number = int(future_epiweeks[week_idx - 1])
             
             # Intervalo de confiança
             lower, upper = _calculate_confidence_interval(cases, conf)
@@ -331,7 +340,7 @@ async def predict_dengue_cases(
             predictions.append(
                 WeekPrediction(
                     week_number=week_number,
-                    date=week_date.date(),
+                    date=week_date,
                     predicted_cases=round(cases, 1),
                     confidence=_map_confidence_to_level(adjusted_confidence),
                     lower_bound=round(lower, 1),
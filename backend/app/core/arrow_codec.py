@@ -0,0 +1,86 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+ARROW CODEC - SERIALIZAÇÃO DE DATAFRAMES PARA CACHE
+════════════════════════════════════════════════════════════════════════════
+
+Serializa DataFrames no formato Arrow IPC (streaming) para armazenamento
+no Redis, substituindo o pickle.
+
+Vantagens sobre pickle:
+    - Seguro: o payload é apenas dados (não executa código ao carregar)
+    - Estável entre versões de pandas/Python (formato Arrow é versionado)
+    - Leitura sem cópia: colunas numéricas sem nulos são mapeadas direto
+      do buffer recebido do Redis (zero-copy)
+
+Nota:
+    DataFrames decodificados com zero-copy são somente leitura
+    (os arrays apontam para o buffer original). Use ``df.copy()``
+    antes de modificar valores in-place.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import pandas as pd
+
+from app.core.logger import logger
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+    logger.warning("PyArrow não instalado - cache de DataFrames desabilitado")
+
+
+def encode_frame(df: pd.DataFrame) -> bytes:
+    """
+    Serializa DataFrame em bytes no formato Arrow IPC.
+
+    Args:
+        df: DataFrame a serializar (índice é descartado)
+
+    Returns:
+        bytes: Payload Arrow IPC (stream format)
+
+    Raises:
+        RuntimeError: Se PyArrow não estiver instalado
+    """
+    if not ARROW_AVAILABLE:
+        raise RuntimeError("PyArrow não instalado")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def decode_frame(payload: bytes) -> pd.DataFrame:
+    """
+    Reconstrói DataFrame a partir de payload Arrow IPC.
+
+    O buffer é envolvido sem cópia (``pa.py_buffer``) e convertido com
+    ``split_blocks=True``, o que permite ao pandas reutilizar a memória
+    das colunas numéricas em vez de consolidá-las em um novo bloco.
+
+    Args:
+        payload: Bytes gerados por ``encode_frame``
+
+    Returns:
+        DataFrame (colunas numéricas podem ser somente leitura)
+
+    Raises:
+        RuntimeError: Se PyArrow não estiver instalado
+        pyarrow.ArrowInvalid: Se o payload não for Arrow IPC válido
+    """
+    if not ARROW_AVAILABLE:
+        raise RuntimeError("PyArrow não instalado")
+
+    reader = pa.ipc.open_stream(pa.py_buffer(payload))
+    table = reader.read_all()
+
+    return table.to_pandas(split_blocks=True)
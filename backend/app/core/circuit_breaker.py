@@ -0,0 +1,275 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+CIRCUIT BREAKER - FALHA RÁPIDA QUANDO UM UPSTREAM ESTÁ DEGRADADO
+════════════════════════════════════════════════════════════════════════════
+
+Com o InfoDengue degradado, cada chamada esperava o timeout inteiro (15s)
+antes de cair no fallback. O breaker observa as últimas chamadas de cada
+upstream e, se muitas falharem ou ficarem lentas, passa a recusá-las
+imediatamente - os serviços caem direto no cache/fallback.
+
+Estados:
+
+    CLOSED     Normal. Cada chamada entra na janela deslizante.
+               Abre se, com pelo menos CIRCUIT_BREAKER_MIN_CALLS chamadas:
+                 - taxa de falhas  >= CIRCUIT_BREAKER_FAILURE_RATE, ou
+                 - taxa de lentas  >= CIRCUIT_BREAKER_SLOW_CALL_RATE
+    OPEN       Recusa tudo (CircuitOpenError) por CIRCUIT_BREAKER_OPEN_SECONDS
+    HALF_OPEN  Deixa passar até CIRCUIT_BREAKER_HALF_OPEN_PROBES sondas.
+               Todas com sucesso -> CLOSED; qualquer falha -> OPEN
+
+Falha = timeout, erro de rede, HTTP 5xx ou 429. Respostas 4xx mostram
+que o upstream está de pé e contam como sucesso.
+
+O breaker fica no transporte do httpx (CircuitBreakerTransport), então
+todos os clients de app.core.http_clients já passam por ele. Como
+CircuitOpenError herda de httpx.TransportError, os ``except httpx.HTTPError``
+existentes já tratam a recusa como qualquer outra falha de rede.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Chamada acima deste tempo (segundos até os headers) conta como lenta
+SLOW_CALL_THRESHOLDS = {
+    "infodengue": 5.0,
+    "openweather": 2.0,
+}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Upstream recusado localmente pelo circuit breaker (sem chamada de rede)."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(f"Circuit breaker aberto para {upstream} (retry em {retry_after:.0f}s)")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Breaker de um upstream (janela deslizante por contagem de chamadas).
+
+    Attributes:
+        upstream: Nome do upstream ("infodengue", "openweather")
+        state: CLOSED, OPEN ou HALF_OPEN
+    """
+
+    def __init__(self, upstream: str, slow_call_threshold: float):
+        """
+        Inicializa o breaker fechado.
+
+        Args:
+            upstream: Nome do upstream
+            slow_call_threshold: Segundos a partir dos quais a chamada é lenta
+        """
+        self.upstream = upstream
+        self.slow_call_threshold = slow_call_threshold
+        self.state = CLOSED
+        # (falhou, lenta) das últimas chamadas
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=settings.circuit_breaker_window)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    # ════════════════════════════════════════════════════════════════════════
+    # ADMISSÃO
+    # ════════════════════════════════════════════════════════════════════════
+
+    def before_call(self) -> None:
+        """
+        Admite ou recusa uma chamada.
+
+        Raises:
+            CircuitOpenError: Se o breaker estiver aberto (ou sem vaga de sonda)
+        """
+        if not settings.circuit_breaker_enabled:
+            return
+
+        if self.state == OPEN:
+            remaining = self._opened_at + settings.circuit_breaker_open_seconds - time.monotonic()
+            if remaining > 0:
+                self._reject(remaining)
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight >= settings.circuit_breaker_half_open_probes:
+                self._reject(0)
+            self._probes_in_flight += 1
+
+    def after_call(self, failed: bool, elapsed: float) -> None:
+        """
+        Registra o resultado de uma chamada admitida.
+
+        Args:
+            failed: True para timeout, erro de rede, 5xx ou 429
+            elapsed: Segundos até a resposta (ou até o erro)
+        """
+        if not settings.circuit_breaker_enabled:
+            return
+
+        slow = elapsed >= self.slow_call_threshold
+
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if failed or slow:
+                self._transition(OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= settings.circuit_breaker_half_open_probes:
+                self._transition(CLOSED)
+            return
+
+        if self.state == OPEN:
+            return  # Chamada admitida antes de abrir - não reabre a janela
+
+        self._window.append((failed, slow))
+        if len(self._window) < settings.circuit_breaker_min_calls:
+            return
+
+        failure_rate, slow_rate = self._rates()
+        if (
+            failure_rate >= settings.circuit_breaker_failure_rate
+            or slow_rate >= settings.circuit_breaker_slow_call_rate
+        ):
+            self._transition(OPEN)
+
+    def release(self) -> None:
+        """Libera a vaga de sonda de uma chamada cancelada (sem resultado)."""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    # ════════════════════════════════════════════════════════════════════════
+    # INTERNOS
+    # ════════════════════════════════════════════════════════════════════════
+
+    def _reject(self, retry_after: float) -> None:
+        metrics.incr("circuit_breaker_rejections_total", upstream=self.upstream)
+        raise CircuitOpenError(self.upstream, retry_after)
+
+    def _rates(self) -> Tuple[float, float]:
+        total = len(self._window)
+        if not total:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, slow in self._window if slow)
+        return failures / total, slow / total
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            if previous == HALF_OPEN:
+                reason = "sonda falhou"
+            else:
+                failure_rate, slow_rate = self._rates()
+                reason = f"falhas: {failure_rate:.0%}, lentas: {slow_rate:.0%}"
+            logger.warning(
+                f"🔌 Circuit breaker ABERTO para {self.upstream} "
+                f"({reason}, sondagem em {settings.circuit_breaker_open_seconds}s)"
+            )
+        elif state == CLOSED:
+            self._window.clear()
+            logger.success(f"🔌 Circuit breaker FECHADO para {self.upstream} (upstream recuperado)")
+        else:
+            logger.info(f"🔌 Circuit breaker SEMIABERTO para {self.upstream} (sondando)")
+
+        metrics.incr(
+            "circuit_breaker_transitions_total",
+            upstream=self.upstream,
+            from_state=previous,
+            to_state=state,
+        )
+
+    def stats(self) -> Dict:
+        """Estado e taxas da janela (para o /health)."""
+        failure_rate, slow_rate = self._rates()
+        retry_in: Optional[float] = None
+        if self.state == OPEN:
+            retry_in = max(
+                0.0,
+                self._opened_at + settings.circuit_breaker_open_seconds - time.monotonic(),
+            )
+
+        return {
+            "state": self.state if settings.circuit_breaker_enabled else "disabled",
+            "calls": len(self._window),
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_rate, 3),
+            "slow_call_threshold_s": self.slow_call_threshold,
+            "retry_in_s": round(retry_in, 1) if retry_in is not None else None,
+            "rejections": int(
+                metrics.value("circuit_breaker_rejections_total", upstream=self.upstream)
+            ),
+        }
+
+
+class CircuitBreakerTransport(httpx.AsyncBaseTransport):
+    """Transporte httpx que passa cada requisição pelo breaker do upstream."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, breaker: CircuitBreaker):
+        self.transport = transport
+        self.breaker = breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.breaker.before_call()
+
+        started = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError:
+            self.breaker.after_call(failed=True, elapsed=time.perf_counter() - started)
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        failed = response.status_code >= 500 or response.status_code == 429
+        self.breaker.after_call(failed=failed, elapsed=time.perf_counter() - started)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class CircuitBreakerRegistry:
+    """Um breaker por upstream, criado sob demanda."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, upstream: str) -> CircuitBreaker:
+        breaker = self._breakers.get(upstream)
+        if breaker is None:
+            breaker = self._breakers[upstream] = CircuitBreaker(
+                upstream, SLOW_CALL_THRESHOLDS.get(upstream, 5.0)
+            )
+        return breaker
+
+    def stats(self) -> Dict[str, Dict]:
+        return {upstream: breaker.stats() for upstream, breaker in self._breakers.items()}
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# INSTÂNCIA GLOBAL
+# ════════════════════════════════════════════════════════════════════════════
+
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,94 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+CONDITIONAL FETCH - VALIDADORES DE RESPOSTAS DO UPSTREAM
+════════════════════════════════════════════════════════════════════════════
+
+O InfoDengue muda uma vez por semana, mas cada refresh baixava e
+processava o payload inteiro. Para cada recurso (ex: cidade + intervalo
+de semanas) guardamos os validadores da última resposta:
+
+    etag           Header ETag          -> If-None-Match
+    last_modified  Header Last-Modified -> If-Modified-Since
+    hash           SHA-256 do corpo (quando o upstream não manda headers)
+
+Na próxima busca, a requisição é condicional. "Não modificado" é:
+
+    - HTTP 304, ou
+    - HTTP 200 com o mesmo hash do corpo anterior
+
+Nesse caso o chamador não faz parse nem regrava os dados: só renova os
+TTLs do que já está em cache.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.core.metrics import metrics
+
+
+class NotModified:
+    """Marcador de resposta igual à anterior (ver NOT_MODIFIED)."""
+
+    def __repr__(self) -> str:
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = NotModified()
+
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 (hex) do corpo da resposta."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def conditional_headers(validators: Optional[Dict]) -> Dict[str, str]:
+    """Headers If-None-Match / If-Modified-Since a partir dos validadores."""
+    headers: Dict[str, str] = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def check_response(
+    upstream: str, response: httpx.Response, previous: Optional[Dict]
+) -> Tuple[bool, Dict]:
+    """
+    Compara a resposta com os validadores anteriores.
+
+    Args:
+        upstream: Nome do upstream (label das métricas)
+        response: Resposta 200 ou 304 (corpo já lido)
+        previous: Validadores da resposta anterior (None se não houver)
+
+    Returns:
+        Tuple: (não modificado?, validadores a guardar)
+    """
+    checked_at = datetime.now().isoformat(timespec="seconds")
+
+    if response.status_code == 304 and previous:
+        metrics.incr("upstream_not_modified_total", upstream=upstream, via="304")
+        return True, {**previous, "checked_at": checked_at}
+
+    body_hash = content_hash(response.content)
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "hash": body_hash,
+        "checked_at": checked_at,
+    }
+
+    if previous and previous.get("hash") == body_hash:
+        metrics.incr("upstream_not_modified_total", upstream=upstream, via="hash")
+        return True, validators
+
+    return False, validators
@@ -6,6 +6,7 @@ Gerenciamento centralizado de variáveis de ambiente usando Pydantic Settings.
 Todas as configurações sensíveis vêm do arquivo .env
 """
 
+import tempfile
 from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
@@ -55,6 +56,23 @@ class Settings(BaseSettings):
     # ════════════════════════════════════════════════════════════════════════
     redis_url: str = Field(default="redis://localhost:6379", alias="REDIS_URL")
     redis_ttl: int = Field(default=86400, alias="REDIS_TTL")  # 24h
+    redis_reconnect_interval: int = Field(default=30, alias="REDIS_RECONNECT_INTERVAL")
+
+    # Cache em disco (SQLite) usado quando o Redis cai
+    cache_disk_enabled: bool = Field(default=True, alias="CACHE_DISK_ENABLED")
+    cache_disk_path: str = Field(
+        default=str(Path(tempfile.gettempdir()) / "dengo" / "cache.sqlite3"),
+        alias="CACHE_DISK_PATH",
+    )
+    cache_disk_max_mb: int = Field(default=100, alias="CACHE_DISK_MAX_MB")
+
+    # Orçamento de memória (plano free do Render: 25MB)
+    redis_max_memory_mb: int = Field(default=25, alias="REDIS_MAX_MEMORY_MB")
+    cache_compress_threshold: int = Field(default=1024, alias="CACHE_COMPRESS_THRESHOLD")  # bytes
+    cache_budget_interval: int = Field(default=300, alias="CACHE_BUDGET_INTERVAL")  # 5 min
+    # Evicção começa em 90% do limite e libera até 75%
+    cache_budget_high_watermark: float = Field(default=0.90, alias="CACHE_BUDGET_HIGH_WATERMARK")
+    cache_budget_low_watermark: float = Field(default=0.75, alias="CACHE_BUDGET_LOW_WATERMARK")
 
     # ════════════════════════════════════════════════════════════════════════
     # APIS EXTERNAS - Opcional para MVP
@@ -68,6 +86,88 @@ class Settings(BaseSettings):
         default="https://info.dengue.mat.br/api",
         alias="INFODENGUE_BASE_URL",
     )
+    # Pool de conexões compartilhado com as APIs externas (por upstream)
+    http2_enabled: bool = Field(default=True, alias="HTTP2_ENABLED")
+    http_max_connections: int = Field(default=10, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=5, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry: float = Field(default=60.0, alias="HTTP_KEEPALIVE_EXPIRY")  # segundos
+    # Token bucket do OpenWeather (free tier: 60/min) e cota diária (~1M/mês)
+    openweather_rate_limit_enabled: bool = Field(default=True, alias="OPENWEATHER_RATE_LIMIT_ENABLED")
+    openweather_rate_limit_per_minute: int = Field(default=60, alias="OPENWEATHER_RATE_LIMIT_PER_MINUTE")
+    openweather_rate_limit_burst: int = Field(default=10, alias="OPENWEATHER_RATE_LIMIT_BURST")
+    # Bucket no Redis, compartilhado entre instâncias
+    openweather_rate_limit_shared: bool = Field(default=False, alias="OPENWEATHER_RATE_LIMIT_SHARED")
+    openweather_daily_quota: int = Field(default=32000, alias="OPENWEATHER_DAILY_QUOTA")
+    # Fração do bucket reservada a usuários e da cota liberada ao background
+    openweather_user_reserve: float = Field(default=0.25, alias="OPENWEATHER_USER_RESERVE")
+    openweather_background_quota_share: float = Field(
+        default=0.5, alias="OPENWEATHER_BACKGROUND_QUOTA_SHARE"
+    )
+    openweather_max_wait: float = Field(default=2.0, alias="OPENWEATHER_MAX_WAIT")  # segundos
+    # Retry com backoff + jitter (deadline total por chamada) e hedging
+    infodengue_max_retries: int = Field(default=2, alias="INFODENGUE_MAX_RETRIES")
+    infodengue_retry_deadline: float = Field(default=25.0, alias="INFODENGUE_RETRY_DEADLINE")  # segundos
+    openweather_max_retries: int = Field(default=1, alias="OPENWEATHER_MAX_RETRIES")
+    openweather_retry_deadline: float = Field(default=12.0, alias="OPENWEATHER_RETRY_DEADLINE")
+    http_retry_base_delay: float = Field(default=0.5, alias="HTTP_RETRY_BASE_DELAY")
+    http_retry_max_delay: float = Field(default=8.0, alias="HTTP_RETRY_MAX_DELAY")
+    http_hedge_enabled: bool = Field(default=True, alias="HTTP_HEDGE_ENABLED")
+    # Fração máxima das requisições que podem ganhar uma cópia hedged
+    http_hedge_budget: float = Field(default=0.1, alias="HTTP_HEDGE_BUDGET")
+    # Circuit breaker por upstream (janela das últimas N chamadas)
+    circuit_breaker_enabled: bool = Field(default=True, alias="CIRCUIT_BREAKER_ENABLED")
+    circuit_breaker_window: int = Field(default=20, alias="CIRCUIT_BREAKER_WINDOW")
+    circuit_breaker_min_calls: int = Field(default=5, alias="CIRCUIT_BREAKER_MIN_CALLS")
+    circuit_breaker_failure_rate: float = Field(default=0.5, alias="CIRCUIT_BREAKER_FAILURE_RATE")
+    circuit_breaker_slow_call_rate: float = Field(default=0.8, alias="CIRCUIT_BREAKER_SLOW_CALL_RATE")
+    circuit_breaker_open_seconds: int = Field(default=30, alias="CIRCUIT_BREAKER_OPEN_SECONDS")
+    circuit_breaker_half_open_probes: int = Field(default=2, alias="CIRCUIT_BREAKER_HALF_OPEN_PROBES")
+    # Publicação semanal do InfoDengue (usada nos TTLs de cache)
+    infodengue_publish_weekday: int = Field(
+        default=0, ge=0, le=6, alias="INFODENGUE_PUBLISH_WEEKDAY"
+    )  # 0=segunda ... 6=domingo
+    infodengue_publish_hour: int = Field(
+        default=12, ge=0, le=23, alias="INFODENGUE_PUBLISH_HOUR"
+    )
+
+    # ════════════════════════════════════════════════════════════════════════
+    # DASHBOARD (clima e histórico buscados em paralelo)
+    # ════════════════════════════════════════════════════════════════════════
+    # Prazo de cada ramo; estourou -> fallback daquele ramo (resposta parcial)
+    dashboard_weather_timeout: float = Field(default=4.0, alias="DASHBOARD_WEATHER_TIMEOUT")  # segundos
+    dashboard_history_timeout: float = Field(default=8.0, alias="DASHBOARD_HISTORY_TIMEOUT")  # segundos
+    # Máximo de cidades por chamada ao /dashboard/batch
+    dashboard_batch_max_cities: int = Field(default=20, alias="DASHBOARD_BATCH_MAX_CITIES")
+
+    # ════════════════════════════════════════════════════════════════════════
+    # CACHE WARMER (pré-aquecimento no startup e periódico)
+    # ════════════════════════════════════════════════════════════════════════
+    cache_warmer_enabled: bool = Field(default=True, alias="CACHE_WARMER_ENABLED")
+    cache_warmer_interval: int = Field(default=3600, alias="CACHE_WARMER_INTERVAL")  # 1h
+    cache_warmer_max_cities: int = Field(default=399, alias="CACHE_WARMER_MAX_CITIES")
+    cache_warmer_concurrency: int = Field(default=4, alias="CACHE_WARMER_CONCURRENCY")
+
+    # ════════════════════════════════════════════════════════════════════════
+    # WEATHER GRID (refresh das células do Smart Grid)
+    # ════════════════════════════════════════════════════════════════════════
+    weather_grid_refresh_enabled: bool = Field(default=True, alias="WEATHER_GRID_REFRESH_ENABLED")
+    # Células que expiram antes do próximo ciclo são buscadas de novo
+    weather_grid_refresh_interval: int = Field(default=600, alias="WEATHER_GRID_REFRESH_INTERVAL")
+    # Sem a célula (falha/rate limit), serve a célula em cache mais próxima neste raio
+    weather_nearest_radius_km: float = Field(default=25.0, alias="WEATHER_NEAREST_RADIUS_KM")
+
+    # ════════════════════════════════════════════════════════════════════════
+    # INFODENGUE PREFETCH (ingestão em lote de todos os municípios)
+    # ════════════════════════════════════════════════════════════════════════
+    infodengue_prefetch_enabled: bool = Field(default=True, alias="INFODENGUE_PREFETCH_ENABLED")
+    infodengue_prefetch_weeks: int = Field(default=104, alias="INFODENGUE_PREFETCH_WEEKS")  # 2 anos
+    infodengue_prefetch_concurrency: int = Field(default=4, alias="INFODENGUE_PREFETCH_CONCURRENCY")
+    infodengue_prefetch_rps: float = Field(default=2.0, alias="INFODENGUE_PREFETCH_RPS")
+    infodengue_prefetch_retries: int = Field(default=3, alias="INFODENGUE_PREFETCH_RETRIES")
+    infodengue_store_path: str = Field(
+        default=str(Path(tempfile.gettempdir()) / "dengo" / "infodengue.arrow"),
+        alias="INFODENGUE_STORE_PATH",
+    )
 
     # ════════════════════════════════════════════════════════════════════════
     # CORS
@@ -0,0 +1,315 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+EPIWEEK - CALENDÁRIO DE SEMANAS EPIDEMIOLÓGICAS
+════════════════════════════════════════════════════════════════════════════
+
+Conversões entre datas e semanas epidemiológicas (SE) no padrão usado
+pelo Ministério da Saúde / InfoDengue (mesma regra do MMWR):
+
+    - A semana começa no domingo e termina no sábado
+    - A SE 1 é a primeira semana com pelo menos 4 dias no ano,
+      ou seja, a semana que contém 4 de janeiro
+    - Um ano epidemiológico tem 52 ou 53 semanas
+
+Tabela pré-calculada (2000-2040):
+    Os domingos de início de todas as SEs do intervalo ficam em arrays
+    NumPy ordenados (datas e ids YYYYWW). As conversões vetorizadas
+    (dates_to_epiweek_ids, epiweek_ids_to_dates, shift_epiweek_ids...)
+    são um searchsorted na tabela, e as funções escalares usam a mesma
+    tabela (com fallback aritmético fora do intervalo). Assim joins e
+    janelas trabalham com ids inteiros de semana, nunca com ISO
+    (isocalendar) nem com o ``SE`` que vem do upstream.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import List, Tuple, Union
+
+import numpy as np
+
+DateLike = Union[date, datetime]
+
+# Anos epidemiológicos cobertos pela tabela pré-calculada
+TABLE_FIRST_YEAR = 2000
+TABLE_LAST_YEAR = 2040
+
+
+def _as_date(value: DateLike) -> date:
+    """Normaliza datetime/date para date."""
+    return value.date() if isinstance(value, datetime) else value
+
+
+def epiweek_start(value: DateLike) -> date:
+    """
+    Retorna o domingo que inicia a semana epidemiológica da data.
+
+    Args:
+        value: Data qualquer
+
+    Returns:
+        date: Domingo de início da SE
+    """
+    d = _as_date(value)
+    # weekday(): segunda=0 ... domingo=6
+    return d - timedelta(days=(d.weekday() + 1) % 7)
+
+
+def epiyear_start(year: int) -> date:
+    """
+    Retorna o início da SE 1 do ano epidemiológico.
+
+    Args:
+        year: Ano epidemiológico
+
+    Returns:
+        date: Domingo de início da SE 1
+    """
+    return epiweek_start(date(year, 1, 4))
+
+
+def date_to_epiweek(value: DateLike) -> Tuple[int, int]:
+    """
+    Converte data em (ano epidemiológico, semana).
+
+    Args:
+        value: Data qualquer
+
+    Returns:
+        Tuple[int, int]: (ano, semana 1-53)
+
+    Exemplo:
+        >>> date_to_epiweek(date(2025, 1, 1))
+        (2025, 1)
+        >>> date_to_epiweek(date(2022, 1, 1))
+        (2021, 52)
+    """
+    d = _as_date(value)
+    index = _table_index(d)
+    if index is not None:
+        return int(_YEARS[index]), int(_WEEKS[index])
+
+    year = d.year
+    if d >= epiyear_start(year + 1):
+        year += 1
+    elif d < epiyear_start(year):
+        year -= 1
+
+    week = (epiweek_start(d) - epiyear_start(year)).days // 7 + 1
+    return year, week
+
+
+def epiweek_to_date(year: int, week: int) -> date:
+    """
+    Retorna o domingo de início de uma semana epidemiológica.
+
+    Args:
+        year: Ano epidemiológico
+        week: Semana (1-53)
+
+    Returns:
+        date: Domingo de início da SE
+    """
+    start = _START_BY_ID.get(year * 100 + week)
+    if start is not None:
+        return start
+    return epiyear_start(year) + timedelta(weeks=week - 1)
+
+
+def weeks_in_year(year: int) -> int:
+    """Número de semanas epidemiológicas do ano (52 ou 53)."""
+    return (epiyear_start(year + 1) - epiyear_start(year)).days // 7
+
+
+def epiweek_id(value: DateLike) -> int:
+    """
+    Identificador inteiro da semana no formato YYYYWW (igual ao campo
+    ``SE`` do InfoDengue).
+
+    Exemplo:
+        >>> epiweek_id(date(2025, 12, 8))
+        202550
+    """
+    year, week = date_to_epiweek(value)
+    return year * 100 + week
+
+
+def last_epiweeks(value: DateLike, count: int) -> List[date]:
+    """
+    Lista as últimas ``count`` semanas até a semana da data (inclusive).
+
+    Args:
+        value: Data de referência (normalmente hoje)
+        count: Número de semanas
+
+    Returns:
+        List[date]: Domingos de início, da mais recente para a mais antiga
+    """
+    start = epiweek_start(value)
+    return [start - timedelta(weeks=i) for i in range(count)]
+
+
+def anchored_epiweek(value: DateLike, block: int) -> date:
+    """
+    Arredonda a semana para trás até um múltiplo fixo de ``block`` semanas.
+
+    Usado como início estável de intervalos que andam toda semana: o
+    mesmo início vale por ``block`` semanas seguidas.
+
+    Args:
+        value: Data qualquer
+        block: Tamanho do bloco em semanas
+
+    Returns:
+        date: Domingo de início do bloco (<= semana da data)
+    """
+    origin = epiyear_start(TABLE_FIRST_YEAR)
+    offset = (epiweek_start(value) - origin).days // 7
+    return origin + timedelta(weeks=offset - offset % block)
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# TABELA PRÉ-CALCULADA
+# ════════════════════════════════════════════════════════════════════════════
+
+
+def _build_table() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Domingos de início, ids, anos e semanas de todas as SEs da tabela."""
+    year_starts = np.array(
+        [epiyear_start(year) for year in range(TABLE_FIRST_YEAR, TABLE_LAST_YEAR + 2)],
+        dtype="datetime64[D]",
+    )
+    starts = np.arange(year_starts[0], year_starts[-1], np.timedelta64(7, "D"))
+
+    year_index = np.searchsorted(year_starts, starts, side="right") - 1
+    years = (TABLE_FIRST_YEAR + year_index).astype(np.int32)
+    weeks = ((starts - year_starts[year_index]) // np.timedelta64(7, "D") + 1).astype(np.int32)
+    return starts, years * 100 + weeks, years, weeks
+
+
+_STARTS, _IDS, _YEARS, _WEEKS = _build_table()
+
+# Versões Python para as conversões escalares (sem overhead do NumPy)
+_START_ORDINALS = [int(day) for day in _STARTS.astype(np.int64)]
+_ORDINAL_OFFSET = date(1970, 1, 1).toordinal()
+_START_BY_ID = {
+    int(week_id): start.astype(date) for week_id, start in zip(_IDS, _STARTS)
+}
+
+
+def _table_index(d: date) -> Union[int, None]:
+    """Posição da SE da data na tabela (None fora de 2000-2040)."""
+    day = d.toordinal() - _ORDINAL_OFFSET
+    index = bisect_right(_START_ORDINALS, day) - 1
+    if index < 0 or day >= _START_ORDINALS[-1] + 7:
+        return None
+    return index
+
+
+def _dates_index(values) -> np.ndarray:
+    """Posições na tabela de um array de datas (ValueError fora dela)."""
+    days = np.asarray(values).astype("datetime64[D]")
+    index = np.searchsorted(_STARTS, days, side="right") - 1
+    if days.size and (
+        (index < 0).any() or (days >= _STARTS[-1] + np.timedelta64(7, "D")).any()
+    ):
+        raise ValueError(
+            f"Data fora do calendário epidemiológico "
+            f"({TABLE_FIRST_YEAR}-{TABLE_LAST_YEAR})"
+        )
+    return index
+
+
+def _ids_index(ids) -> np.ndarray:
+    """Posições na tabela de um array de ids YYYYWW (ValueError se inválido)."""
+    ids = np.asarray(ids, dtype=np.int64)
+    index = np.minimum(np.searchsorted(_IDS, ids), len(_IDS) - 1)
+    if (_IDS[index] != ids).any():
+        raise ValueError("Semana epidemiológica inválida ou fora do calendário")
+    return index
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# CONVERSÕES VETORIZADAS
+# ════════════════════════════════════════════════════════════════════════════
+
+
+def dates_to_epiweek_ids(values) -> np.ndarray:
+    """
+    Converte um array de datas em ids YYYYWW.
+
+    Args:
+        values: Datas (datetime64, pd.Series/DatetimeIndex, list de date)
+
+    Returns:
+        np.ndarray: ids int32 (mesmo formato do campo ``SE``)
+
+    Raises:
+        ValueError: Data fora da tabela (2000-2040)
+    """
+    return _IDS[_dates_index(values)]
+
+
+def epiweek_starts(values) -> np.ndarray:
+    """
+    Domingo de início da SE de cada data.
+
+    Returns:
+        np.ndarray: datetime64[D]
+    """
+    return _STARTS[_dates_index(values)]
+
+
+def epiweek_ids_to_dates(ids) -> np.ndarray:
+    """
+    Converte ids YYYYWW no domingo de início de cada SE.
+
+    Returns:
+        np.ndarray: datetime64[D]
+
+    Raises:
+        ValueError: id inexistente (ex: semana 53 de um ano com 52)
+    """
+    return _STARTS[_ids_index(ids)]
+
+
+def split_epiweek_ids(ids) -> Tuple[np.ndarray, np.ndarray]:
+    """Separa ids YYYYWW em (anos, semanas)."""
+    years, weeks = np.divmod(np.asarray(ids, dtype=np.int32), 100)
+    return years, weeks
+
+
+def epiweek_ids_from(years, weeks) -> np.ndarray:
+    """
+    Monta ids YYYYWW a partir de (anos, semanas), validando na tabela.
+
+    Raises:
+        ValueError: Semana inexistente no ano
+    """
+    ids = np.asarray(years, dtype=np.int32) * 100 + np.asarray(weeks, dtype=np.int32)
+    _ids_index(ids)
+    return ids
+
+
+def shift_epiweek_ids(ids, weeks) -> np.ndarray:
+    """
+    Avança (ou recua, se negativo) ``weeks`` semanas, atravessando anos
+    de 52/53 semanas corretamente. ``weeks`` pode ser um array (broadcast).
+
+    Exemplo:
+        >>> shift_epiweek_ids([202052, 202053], 1)
+        array([202053, 202101], dtype=int32)
+    """
+    index = _ids_index(ids) + weeks
+    if (index < 0).any() or (index >= len(_IDS)).any():
+        raise ValueError("Semana resultante fora do calendário epidemiológico")
+    return _IDS[index]
+
+
+def epiweek_id_range(first_id: int, last_id: int) -> np.ndarray:
+    """Todos os ids de ``first_id`` a ``last_id`` (inclusive), em ordem."""
+    first, last = _ids_index([first_id, last_id])
+    return _IDS[first:last + 1]
@@ -0,0 +1,197 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+HTTP CLIENTS - CONEXÕES COMPARTILHADAS COM AS APIS EXTERNAS
+════════════════════════════════════════════════════════════════════════════
+
+Um ``httpx.AsyncClient`` por upstream (InfoDengue, OpenWeather), criado
+no lifespan da aplicação e fechado no shutdown. Antes, cada chamada abria
+um client novo e pagava DNS + TCP + TLS; com o pool as conexões ficam
+vivas (keep-alive) e, se o servidor suportar, multiplexadas em HTTP/2.
+
+Uso:
+    from app.core.http_clients import http_clients
+
+    client = http_clients.get("infodengue")
+    response = await client.get(url, params=params)
+
+Cada client passa pelo circuit breaker do seu upstream
+(app.core.circuit_breaker): com o upstream degradado, as chamadas falham
+na hora com CircuitOpenError em vez de esperar o timeout. O OpenWeather
+passa antes pelo token bucket (app.core.rate_limiter).
+
+Observabilidade:
+    - Handshakes TCP/TLS contados via extensão ``trace`` do httpx
+    - Requisições por versão HTTP e classe de status
+    - Conexões do pool (ativas/ociosas) em stats() -> /health
+
+HTTP/2 depende do pacote ``h2`` (``httpx[http2]``); sem ele, usa HTTP/1.1.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.circuit_breaker import CircuitBreakerTransport, circuit_breakers
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.core.rate_limiter import RateLimitedTransport, rate_limiters
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Timeout padrão (segundos) por upstream - a InfoDengue pode ser lenta
+UPSTREAM_TIMEOUTS = {
+    "infodengue": 15.0,
+    "openweather": 10.0,
+}
+
+
+class HttpClientRegistry:
+    """Clients HTTP compartilhados, um por upstream."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @property
+    def http2_enabled(self) -> bool:
+        return settings.http2_enabled and HTTP2_AVAILABLE
+
+    def start(self) -> None:
+        """Cria os clients de todos os upstreams (chamado no startup)."""
+        for upstream in UPSTREAM_TIMEOUTS:
+            self.get(upstream)
+
+        logger.info(
+            f"🔗 HTTP clients prontos: {', '.join(self._clients)} "
+            f"(HTTP/2: {'sim' if self.http2_enabled else 'não'}, "
+            f"pool: {settings.http_max_connections} conexões)"
+        )
+        if settings.http2_enabled and not HTTP2_AVAILABLE:
+            logger.warning("⚠️  Pacote h2 ausente - usando HTTP/1.1 (pip install httpx[http2])")
+
+    async def close(self) -> None:
+        """Fecha todas as conexões (chamado no shutdown)."""
+        for upstream, client in self._clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"❌ Erro ao fechar HTTP client {upstream}: {e}")
+        self._clients.clear()
+        logger.info("🔗 HTTP clients fechados")
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """
+        Retorna o client compartilhado do upstream.
+
+        Criado sob demanda se ainda não existir (ex: scripts fora do
+        lifespan da API).
+
+        Args:
+            upstream: "infodengue" ou "openweather"
+        """
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._clients[upstream] = self._create(upstream)
+        return client
+
+    def _create(self, upstream: str) -> httpx.AsyncClient:
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                metrics.incr("http_client_tcp_connects_total", upstream=upstream)
+            elif event_name == "connection.start_tls.complete":
+                metrics.incr("http_client_tls_handshakes_total", upstream=upstream)
+
+        async def on_request(request: httpx.Request) -> None:
+            request.extensions["trace"] = trace
+
+        async def on_response(response: httpx.Response) -> None:
+            metrics.incr(
+                "http_client_requests_total",
+                upstream=upstream,
+                http_version=response.http_version,
+                status=response.status_code // 100 * 100,
+            )
+
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+            http2=self.http2_enabled,
+        )
+
+        transport = CircuitBreakerTransport(transport, circuit_breakers.get(upstream))
+
+        # Token bucket por fora do breaker: espera por token não conta como lentidão
+        limiter = rate_limiters.get(upstream)
+        if limiter is not None:
+            transport = RateLimitedTransport(transport, limiter)
+
+        return httpx.AsyncClient(
+            timeout=UPSTREAM_TIMEOUTS.get(upstream, 10.0),
+            transport=transport,
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    # ════════════════════════════════════════════════════════════════════════
+    # OBSERVABILIDADE
+    # ════════════════════════════════════════════════════════════════════════
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Uso do pool e handshakes por upstream (para o /health).
+
+        ``reuse_ratio`` = fração das requisições que reaproveitaram uma
+        conexão aberta (1 - conexões TCP / requisições).
+        """
+        result = {}
+        for upstream, client in self._clients.items():
+            requests = metrics.value("http_client_requests_total", upstream=upstream)
+            connects = metrics.value("http_client_tcp_connects_total", upstream=upstream)
+
+            result[upstream] = {
+                "http2": self.http2_enabled,
+                "max_connections": settings.http_max_connections,
+                **self._pool_state(client),
+                "requests": int(requests),
+                "tcp_connects": int(connects),
+                "tls_handshakes": int(
+                    metrics.value("http_client_tls_handshakes_total", upstream=upstream)
+                ),
+                "reuse_ratio": round(1 - connects / requests, 3) if requests else None,
+            }
+        return result
+
+    @staticmethod
+    def _pool_state(client: httpx.AsyncClient) -> Dict[str, Optional[int]]:
+        """Conexões abertas/ativas/ociosas do pool do httpcore (API interna)."""
+        transport = client._transport
+        while hasattr(transport, "transport"):  # Desembrulha breaker/rate limiter
+            transport = transport.transport
+        try:
+            connections = transport._pool.connections
+        except AttributeError:
+            return {"connections": None, "active": None, "idle": None}
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+        }
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# INSTÂNCIA GLOBAL
+# ════════════════════════════════════════════════════════════════════════════
+
+http_clients = HttpClientRegistry()
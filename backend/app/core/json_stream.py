@@ -0,0 +1,103 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+JSON STREAM - LEITURA INCREMENTAL DE LISTAS JSON
+════════════════════════════════════════════════════════════════════════════
+
+``response.json()`` precisa do corpo inteiro em memória e materializa
+todos os objetos de uma vez. Para respostas grandes (séries do
+InfoDengue), iter_json_array decodifica os itens de uma lista JSON à
+medida que os chunks chegam:
+
+    - Só o objeto em andamento fica no buffer (limite: max_pending)
+    - Cada item é entregue assim que termina de chegar; o chamador
+      decide o que guardar
+
+Uso:
+    async with client.stream("GET", url) as response:
+        async for row in iter_json_array(response.aiter_bytes()):
+            ...
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import codecs
+import json
+from typing import Any, AsyncIterator
+
+# Maior objeto incompleto aceito no buffer (proteção contra JSON inválido)
+DEFAULT_MAX_PENDING = 1024 * 1024
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes],
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> AsyncIterator[Any]:
+    """
+    Itera sobre os itens de uma lista JSON recebida em chunks.
+
+    Args:
+        chunks: Bytes do corpo (ex: response.aiter_bytes())
+        max_pending: Tamanho máximo (caracteres) de um item incompleto
+
+    Yields:
+        Any: Cada item da lista, já decodificado
+
+    Raises:
+        ValueError: Corpo não é uma lista JSON, está truncado ou tem um
+                    item maior que ``max_pending``
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    started = False
+
+    async for chunk in chunks:
+        buffer = buffer[pos:] + utf8.decode(chunk)
+        pos = 0
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError("Resposta JSON não é uma lista")
+                started = True
+                pos += 1
+                continue
+            if char == ",":
+                pos += 1
+                continue
+            if char == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Item incompleto: espera o próximo chunk
+                if len(buffer) - pos > max_pending:
+                    raise ValueError(f"Item JSON maior que {max_pending} caracteres")
+                break
+
+            # Número/literal só termina num delimitador: "12" ou "-1." no fim
+            # do buffer podem continuar no próximo chunk ("125", "-1.5")
+            if not isinstance(item, (dict, list, str)) and (
+                end == len(buffer) or buffer[end] not in _DELIMITERS
+            ):
+                break
+
+            yield item
+            pos = end
+
+    if not started:
+        raise ValueError("Resposta JSON vazia")
+    raise ValueError("Resposta JSON truncada")
@@ -68,12 +68,12 @@ def log_request(method: str, path: str, status_code: int, duration: float):
 
 def log_cache_hit(key: str):
     """Log de cache hit (economia de API calls)."""
-    logger.success(f"CACHE HIT: {key} (Custo Zero ✓)")
+    logger.debug(f"CACHE HIT: {key} (Custo Zero ✓)")
 
 
 def log_cache_miss(key: str):
     """Log de cache miss (nova chamada à API)."""
-    logger.warning(f"CACHE MISS: {key} (API Call necessária)")
+    logger.debug(f"CACHE MISS: {key} (API Call necessária)")
 
 
 def log_external_api_call(api_name: str, endpoint: str):
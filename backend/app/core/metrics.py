@@ -0,0 +1,220 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+METRICS - CONTADORES EM MEMÓRIA DO PROCESSO
+════════════════════════════════════════════════════════════════════════════
+
+Registro simples de métricas (sem dependências externas), lido pelo
+/health e exposto em /metrics (formato texto do Prometheus).
+
+Contadores têm um nome e, opcionalmente, labels:
+
+    metrics.incr("infodengue_requests_total")
+    metrics.incr("infodengue_negative_cache_stores_total", error_class="timeout")
+
+    metrics.value("infodengue_requests_total")  # -> 1.0
+    metrics.snapshot()
+    # {
+    #     "infodengue_requests_total": 1.0,
+    #     "infodengue_negative_cache_stores_total": {"error_class=timeout": 1.0},
+    # }
+
+Histogramas acumulam durações (segundos) em buckets fixos:
+
+    metrics.observe("cache_get_latency_seconds", 0.004, namespace="dashboard")
+
+Os valores são por processo (cada worker do Uvicorn tem os seus) e
+zeram no restart.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# Limites superiores (segundos) dos buckets de latência
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _label_set(labels: Dict[str, Any]) -> LabelSet:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(label_set: LabelSet) -> str:
+    return ",".join(f"{key}={value}" for key, value in label_set)
+
+
+def _prometheus_labels(label_set: LabelSet, extra: str = "") -> str:
+    parts = [
+        '{}="{}"'.format(
+            key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for key, value in label_set
+    ]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Histogram:
+    """Contagens por bucket (não cumulativas), soma e total de observações."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Metrics:
+    """Contadores monotônicos e histogramas com labels, seguros entre threads."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters: Dict[str, Dict[LabelSet, float]] = defaultdict(dict)
+        self._histograms: Dict[str, Dict[LabelSet, _Histogram]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        """Incrementa o contador ``name`` (com os labels informados)."""
+        label_set = _label_set(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[label_set] = series.get(label_set, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Registra uma observação (ex: latência em segundos) no histograma."""
+        label_set = _label_set(labels)
+        with self._lock:
+            series = self._histograms[name]
+            histogram = series.get(label_set)
+            if histogram is None:
+                histogram = series[label_set] = _Histogram(len(self.buckets) + 1)
+
+            index = len(self.buckets)  # bucket +Inf
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    index = i
+                    break
+
+            histogram.counts[index] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    def histogram(self, name: str, **labels: Any) -> Dict[str, Any]:
+        """
+        Resumo de um histograma: total, soma, média e quantis estimados.
+
+        Os quantis são o limite superior do bucket onde caem (estimativa
+        conservadora, como o histogram_quantile do Prometheus sem interpolação).
+        """
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(_label_set(labels))
+            if histogram is None:
+                return {"count": 0, "sum": 0.0, "avg": 0.0, "p50": None, "p95": None}
+            counts = list(histogram.counts)
+            total, count = histogram.sum, histogram.count
+
+        return {
+            "count": count,
+            "sum": round(total, 6),
+            "avg": round(total / count, 6) if count else 0.0,
+            "p50": self._bucket_quantile(counts, count, 0.50),
+            "p95": self._bucket_quantile(counts, count, 0.95),
+        }
+
+    def _bucket_quantile(self, counts: List[int], count: int, q: float):
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0
+        for i, bucket_count in enumerate(counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def value(self, name: str, **labels: Any) -> float:
+        """
+        Valor atual de um contador.
+
+        Soma todas as séries que têm os labels informados (sem labels,
+        soma o contador inteiro).
+        """
+        wanted = set(_label_set(labels))
+        with self._lock:
+            series = dict(self._counters.get(name, {}))
+        return sum(value for label_set, value in series.items() if wanted <= set(label_set))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Todos os contadores (valor simples ou {labels: valor})."""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        result: Dict[str, Any] = {}
+        for name, series in sorted(counters.items()):
+            if list(series) == [()]:
+                result[name] = series[()]
+            else:
+                result[name] = {
+                    _format_labels(label_set): value
+                    for label_set, value in sorted(series.items())
+                }
+        return result
+
+    def render_prometheus(self) -> str:
+        """Exporta contadores e histogramas no formato texto do Prometheus."""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {
+                    label_set: (list(h.counts), h.sum, h.count)
+                    for label_set, h in series.items()
+                }
+                for name, series in self._histograms.items()
+            }
+
+        lines: List[str] = []
+
+        for name, series in sorted(counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            for label_set, value in sorted(series.items()):
+                lines.append(f"{name}{_prometheus_labels(label_set)} {_format_number(value)}")
+
+        for name, series in sorted(histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for label_set, (counts, total, count) in sorted(series.items()):
+                cumulative = 0
+                bounds = [_format_number(b) for b in self.buckets] + ["+Inf"]
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    labels = _prometheus_labels(label_set, f'le="{bound}"')
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                lines.append(f"{name}_sum{_prometheus_labels(label_set)} {total!r}")
+                lines.append(f"{name}_count{_prometheus_labels(label_set)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zera contadores e histogramas."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# INSTÂNCIA GLOBAL
+# ════════════════════════════════════════════════════════════════════════════
+
+metrics = Metrics()
@@ -0,0 +1,332 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+RATE LIMITER - TOKEN BUCKET E COTA DIÁRIA DO OPENWEATHER
+════════════════════════════════════════════════════════════════════════════
+
+O free tier do OpenWeather aceita 60 chamadas/minuto. Antes, o
+WeatherService só percebia o limite depois de receber um 429. Agora cada
+requisição ao upstream passa por um token bucket no próprio transporte
+do httpx (RateLimitedTransport):
+
+    - Bucket de OPENWEATHER_RATE_LIMIT_PER_MINUTE tokens/minuto, com
+      rajada de até OPENWEATHER_RATE_LIMIT_BURST
+    - Compartilhado entre corrotinas (asyncio.Lock) e, com
+      OPENWEATHER_RATE_LIMIT_SHARED=true, entre instâncias (script Lua
+      no Redis; sem Redis, volta ao bucket local)
+    - Ledger de cota diária (``ratelimit:quota:{upstream}:{AAAA-MM-DD}``)
+
+Prioridades (contextvar ``upstream_priority``):
+
+    interactive  Requisições de usuários (padrão). Podem usar o bucket
+                 inteiro, mas esperam no máximo OPENWEATHER_MAX_WAIT
+                 segundos por um token.
+    background   Warmers e refreshers. Deixam OPENWEATHER_USER_RESERVE
+                 do bucket livre para usuários, esperam o quanto for
+                 preciso e param ao atingir
+                 OPENWEATHER_BACKGROUND_QUOTA_SHARE da cota diária.
+
+Tarefas de background marcam a prioridade uma vez (set_background_priority)
+e todas as tarefas filhas herdam o valor.
+
+Sem token (ou sem cota), a requisição falha com RateLimitExceeded, que
+herda de httpx.TransportError: os ``except httpx.HTTPError`` existentes
+já caem no fallback, sem chamar a API.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from datetime import date
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+upstream_priority: ContextVar[str] = ContextVar("upstream_priority", default=INTERACTIVE)
+
+# Ledger guardado por 2 dias (o dia anterior ainda aparece no /health)
+QUOTA_KEY_TTL = 2 * 86400
+
+# Token bucket atômico no Redis: devolve quantos segundos esperar (0 = liberado)
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens - 1 >= reserve then
+    tokens = tokens - 1
+else
+    wait = (1 + reserve - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+def set_background_priority() -> None:
+    """Marca a tarefa atual (e as filhas) como tráfego de background."""
+    upstream_priority.set(BACKGROUND)
+
+
+class RateLimitExceeded(httpx.TransportError):
+    """Requisição recusada localmente por falta de token ou de cota diária."""
+
+    def __init__(self, upstream: str, reason: str):
+        super().__init__(f"Rate limit local de {upstream}: {reason}")
+        self.upstream = upstream
+        self.reason = reason
+
+
+class UpstreamRateLimiter:
+    """
+    Token bucket + ledger de cota diária de um upstream.
+
+    Attributes:
+        upstream: Nome do upstream
+        rate: Tokens por segundo
+        capacity: Tamanho máximo da rajada
+        daily_quota: Chamadas por dia (todas as prioridades)
+    """
+
+    def __init__(self, upstream: str, per_minute: int, burst: int, daily_quota: int):
+        self.upstream = upstream
+        self.rate = per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self.daily_quota = daily_quota
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        # Espelho local do ledger (atualizado pelo Redis quando disponível)
+        self._quota_day = date.today().isoformat()
+        self._quota_used: Dict[str, int] = {}
+
+    @property
+    def bucket_key(self) -> str:
+        return f"ratelimit:bucket:{self.upstream}"
+
+    def quota_key(self, day: str) -> str:
+        return f"ratelimit:quota:{self.upstream}:{day}"
+
+    # ════════════════════════════════════════════════════════════════════════
+    # ADMISSÃO
+    # ════════════════════════════════════════════════════════════════════════
+
+    async def acquire(self, priority: Optional[str] = None) -> None:
+        """
+        Espera um token (respeitando a prioridade e a cota diária).
+
+        Raises:
+            RateLimitExceeded: Cota esgotada, ou usuário esperaria demais
+        """
+        priority = priority or upstream_priority.get()
+        self._roll_day()
+
+        if not self._within_quota(priority):
+            metrics.incr("rate_limit_denials_total", upstream=self.upstream, reason="quota")
+            raise RateLimitExceeded(self.upstream, f"cota diária ({priority})")
+
+        reserve = 0.0
+        if priority == BACKGROUND:
+            reserve = self.capacity * settings.openweather_user_reserve
+        max_wait = settings.openweather_max_wait if priority == INTERACTIVE else None
+        waited = 0.0
+
+        while True:
+            wait = await self._take(reserve)
+            if wait <= 0:
+                break
+            if max_wait is not None and waited + wait > max_wait:
+                metrics.incr("rate_limit_denials_total", upstream=self.upstream, reason="tokens")
+                raise RateLimitExceeded(self.upstream, f"sem token em {max_wait}s")
+            await asyncio.sleep(wait)
+            waited += wait
+
+        if waited:
+            metrics.observe("rate_limit_wait_seconds", waited, upstream=self.upstream)
+
+    async def _take(self, reserve: float) -> float:
+        """Tenta retirar um token; devolve a espera necessária (0 = retirado)."""
+        if settings.openweather_rate_limit_shared:
+            wait = await self._take_shared(reserve)
+            if wait is not None:
+                return wait
+
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens - 1 >= reserve:
+                self._tokens -= 1
+                return 0.0
+            return (1 + reserve - self._tokens) / self.rate
+
+    async def _take_shared(self, reserve: float) -> Optional[float]:
+        """Bucket no Redis (entre instâncias). None se o Redis não responder."""
+        from app.services.cache_service import cache_service
+
+        if not cache_service.is_connected or not cache_service.redis_client:
+            return None
+        try:
+            wait = await cache_service.redis_client.eval(
+                TOKEN_BUCKET_SCRIPT,
+                1,
+                self.bucket_key,
+                self.rate,
+                self.capacity,
+                time.time(),
+                reserve,
+            )
+            return float(wait)
+        except Exception as e:
+            logger.debug(f"⚠️  Rate limit compartilhado indisponível ({e}) - usando bucket local")
+            return None
+
+    # ════════════════════════════════════════════════════════════════════════
+    # COTA DIÁRIA
+    # ════════════════════════════════════════════════════════════════════════
+
+    def _roll_day(self) -> None:
+        today = date.today().isoformat()
+        if today != self._quota_day:
+            self._quota_day = today
+            self._quota_used = {}
+
+    def _within_quota(self, priority: str) -> bool:
+        used = sum(self._quota_used.values())
+        if priority == BACKGROUND:
+            return used < self.daily_quota * settings.openweather_background_quota_share
+        return used < self.daily_quota
+
+    async def record_call(self, priority: Optional[str] = None) -> None:
+        """Registra no ledger uma requisição que chegou ao upstream."""
+        priority = priority or upstream_priority.get()
+        self._roll_day()
+        self._quota_used[priority] = self._quota_used.get(priority, 0) + 1
+        metrics.incr("rate_limit_calls_total", upstream=self.upstream, priority=priority)
+
+        from app.services.cache_service import cache_service
+
+        if not cache_service.is_connected or not cache_service.redis_client:
+            return
+        try:
+            key = self.quota_key(self._quota_day)
+            pipe = cache_service.redis_client.pipeline(transaction=False)
+            pipe.hincrby(key, priority, 1)
+            pipe.expire(key, QUOTA_KEY_TTL)
+            pipe.hgetall(key)
+            *_, ledger = await pipe.execute()
+            # Soma das instâncias: o espelho local passa a refletir o total
+            self._quota_used = {field.decode(): int(value) for field, value in ledger.items()}
+        except Exception as e:
+            logger.debug(f"⚠️  Ledger de cota indisponível: {e}")
+
+    def _available_tokens(self) -> float:
+        """Tokens do bucket local agora (sem retirar nenhum)."""
+        return min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+
+    def under_pressure(self) -> bool:
+        """
+        True se um usuário agora esperaria por token ou seria recusado.
+
+        Com o bucket compartilhado, só a cota é considerada (o bucket local
+        não reflete as outras instâncias).
+        """
+        self._roll_day()
+        if not self._within_quota(INTERACTIVE):
+            return True
+        if settings.openweather_rate_limit_shared:
+            return False
+        return self._available_tokens() < 1
+
+    def stats(self) -> Dict:
+        """Tokens disponíveis e uso da cota do dia (para o /health)."""
+        self._roll_day()
+        tokens = self._available_tokens()
+        used = sum(self._quota_used.values())
+        return {
+            "per_minute": round(self.rate * 60),
+            "burst": int(self.capacity),
+            "tokens": None if settings.openweather_rate_limit_shared else round(tokens, 1),
+            "shared": settings.openweather_rate_limit_shared,
+            "quota_day": self._quota_day,
+            "quota_used": used,
+            "quota_limit": self.daily_quota,
+            "quota_by_priority": dict(self._quota_used),
+            "denials": int(metrics.value("rate_limit_denials_total", upstream=self.upstream)),
+        }
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Transporte httpx que retira um token antes de cada requisição."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: UpstreamRateLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except CircuitOpenError:
+            raise  # Não saiu do processo - não conta na cota
+        except httpx.TransportError:
+            await self.limiter.record_call()
+            raise
+
+        await self.limiter.record_call()
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class RateLimiterRegistry:
+    """Limitadores configurados por upstream (hoje, só o OpenWeather)."""
+
+    def __init__(self):
+        self._limiters: Dict[str, UpstreamRateLimiter] = {}
+
+    def get(self, upstream: str) -> Optional[UpstreamRateLimiter]:
+        """Limiter do upstream, ou None se ele não tiver limite configurado."""
+        if upstream != "openweather" or not settings.openweather_rate_limit_enabled:
+            return None
+
+        limiter = self._limiters.get(upstream)
+        if limiter is None:
+            limiter = self._limiters[upstream] = UpstreamRateLimiter(
+                upstream,
+                per_minute=settings.openweather_rate_limit_per_minute,
+                burst=settings.openweather_rate_limit_burst,
+                daily_quota=settings.openweather_daily_quota,
+            )
+        return limiter
+
+    def stats(self) -> Dict[str, Dict]:
+        return {upstream: limiter.stats() for upstream, limiter in self._limiters.items()}
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# INSTÂNCIA GLOBAL
+# ════════════════════════════════════════════════════════════════════════════
+
+rate_limiters = RateLimiterRegistry()
@@ -0,0 +1,243 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+RETRY POLICY - NOVAS TENTATIVAS E REQUISIÇÕES HEDGED PARA OS UPSTREAMS
+════════════════════════════════════════════════════════════════════════════
+
+Política compartilhada pelas chamadas ao InfoDengue e ao OpenWeather:
+
+    - Backoff exponencial com jitter completo:
+        espera = uniforme(0, min(max_delay, base_delay * 2^tentativa))
+    - Respeita o Retry-After de respostas 429
+    - Prazo total (deadline): nenhuma espera ou tentativa passa dele
+    - Idempotência: requisições não idempotentes só são repetidas quando
+      a falha garante que nada chegou ao servidor (erro de conexão)
+    - Hedging opcional: se a 1ª tentativa passar do p95 observado do
+      upstream, dispara uma 2ª em paralelo e fica com a que responder
+      primeiro. Limitado a HTTP_HEDGE_BUDGET das requisições, para cortar
+      a cauda de latência sem multiplicar a carga.
+
+Não repete: CircuitOpenError (o breaker já decidiu falhar rápido),
+RateLimitExceeded (sem token/cota local), respostas 4xx (exceto 429) e
+erros que não são de rede.
+
+Uso:
+    response = await policy.run(lambda: client.get(url, params=params))
+    response.raise_for_status()
+
+``run`` devolve a última resposta mesmo se ela ainda for 5xx/429 - o
+chamador trata o status como antes.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.core.rate_limiter import RateLimitExceeded
+
+# Latência (segundos até a resposta) de cada tentativa, por upstream
+LATENCY_METRIC = "http_client_latency_seconds"
+
+# Amostras mínimas antes de confiar no p95 para disparar hedges
+HEDGE_MIN_SAMPLES = 20
+
+# Falhas em que a requisição certamente não chegou ao servidor
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def is_retryable_status(status_code: int) -> bool:
+    """True para respostas que valem nova tentativa (5xx e 429)."""
+    return status_code >= 500 or status_code == 429
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if value and value.strip().isdigit():
+        return float(value)
+    return None
+
+
+class RetryPolicy:
+    """
+    Retry com backoff + jitter, deadline total e hedging opcional.
+
+    Attributes:
+        upstream: Nome do upstream (labels das métricas)
+        max_retries: Novas tentativas após a primeira
+        deadline: Tempo total máximo (segundos), incluindo esperas
+        hedge: Se True, permite a requisição hedged
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        max_retries: int,
+        deadline: float,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+        hedge: bool = True,
+    ):
+        self.upstream = upstream
+        self.max_retries = max_retries
+        self.deadline = deadline
+        self.base_delay = base_delay if base_delay is not None else settings.http_retry_base_delay
+        self.max_delay = max_delay if max_delay is not None else settings.http_retry_max_delay
+        self.hedge = hedge
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[httpx.Response]],
+        idempotent: bool = True,
+    ) -> httpx.Response:
+        """
+        Executa ``call`` com novas tentativas.
+
+        Args:
+            call: Função que dispara a requisição (chamada a cada tentativa)
+            idempotent: False para requisições com efeito colateral
+
+        Returns:
+            httpx.Response: Primeira resposta boa ou a última recebida
+
+        Raises:
+            httpx.HTTPError: Última falha, se todas as tentativas falharem
+        """
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            remaining = self.deadline - (time.monotonic() - started)
+            error: Optional[Exception] = None
+            response: Optional[httpx.Response] = None
+
+            try:
+                response = await self._attempt(call, remaining, hedge=idempotent)
+            except (CircuitOpenError, RateLimitExceeded):
+                raise
+            except httpx.TransportError as e:
+                if not idempotent and not isinstance(e, _NOT_SENT_ERRORS):
+                    raise
+                error = e
+
+            if response is not None and not is_retryable_status(response.status_code):
+                return response
+
+            if attempt >= self.max_retries:
+                return self._give_up(response, error)
+
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+            if response is not None:
+                delay = max(delay, _retry_after_seconds(response) or 0.0)
+
+            elapsed = time.monotonic() - started
+            if elapsed + delay >= self.deadline:
+                return self._give_up(response, error)
+
+            attempt += 1
+            metrics.incr("http_client_retries_total", upstream=self.upstream)
+            logger.debug(
+                f"🔁 Retry {attempt}/{self.max_retries} para {self.upstream} em {delay:.2f}s "
+                f"({error or f'HTTP {response.status_code}'})"
+            )
+            await asyncio.sleep(delay)
+
+    def _give_up(
+        self, response: Optional[httpx.Response], error: Optional[Exception]
+    ) -> httpx.Response:
+        if response is not None:
+            return response
+        raise error
+
+    async def _attempt(
+        self,
+        call: Callable[[], Awaitable[httpx.Response]],
+        remaining: float,
+        hedge: bool,
+    ) -> httpx.Response:
+        """Uma tentativa (talvez hedged), limitada ao tempo restante."""
+        if remaining <= 0:
+            raise httpx.TimeoutException(f"Deadline de {self.deadline}s esgotado ({self.upstream})")
+
+        hedge_after = self._hedge_delay() if hedge else None
+        try:
+            if hedge_after is None or hedge_after >= remaining:
+                return await asyncio.wait_for(self._timed(call), remaining)
+            return await asyncio.wait_for(self._hedged(call, hedge_after), remaining)
+        except asyncio.TimeoutError:
+            raise httpx.TimeoutException(
+                f"Deadline de {self.deadline}s esgotado ({self.upstream})"
+            ) from None
+
+    async def _timed(self, call: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        metrics.incr("http_client_attempts_total", upstream=self.upstream)
+        started = time.perf_counter()
+        response = await call()
+        metrics.observe(LATENCY_METRIC, time.perf_counter() - started, upstream=self.upstream)
+        return response
+
+    # ════════════════════════════════════════════════════════════════════════
+    # HEDGING
+    # ════════════════════════════════════════════════════════════════════════
+
+    def _hedge_delay(self) -> Optional[float]:
+        """p95 observado do upstream, se houver amostras e orçamento de hedge."""
+        if not (self.hedge and settings.http_hedge_enabled):
+            return None
+
+        latency = metrics.histogram(LATENCY_METRIC, upstream=self.upstream)
+        p95 = latency["p95"]
+        if latency["count"] < HEDGE_MIN_SAMPLES or p95 is None or p95 == float("inf"):
+            return None
+
+        attempts = metrics.value("http_client_attempts_total", upstream=self.upstream)
+        hedges = metrics.value("http_client_hedges_total", upstream=self.upstream)
+        if hedges >= settings.http_hedge_budget * attempts:
+            return None
+
+        return p95
+
+    async def _hedged(
+        self, call: Callable[[], Awaitable[httpx.Response]], hedge_after: float
+    ) -> httpx.Response:
+        """Dispara a 2ª requisição se a 1ª passar de ``hedge_after`` segundos."""
+        primary = asyncio.ensure_future(self._timed(call))
+        tasks = {primary}
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if done:
+                return primary.result()
+
+            metrics.incr("http_client_hedges_total", upstream=self.upstream)
+            secondary = asyncio.ensure_future(self._timed(call))
+            tasks.add(secondary)
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    # 5xx/429 não vence: a outra requisição ainda pode dar certo
+                    if task.exception() is None and not is_retryable_status(
+                        task.result().status_code
+                    ):
+                        if task is secondary:
+                            metrics.incr("http_client_hedge_wins_total", upstream=self.upstream)
+                        return task.result()
+            # As duas falharam: devolve (ou propaga) o resultado da original
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # Marca a falha da perdedora como tratada
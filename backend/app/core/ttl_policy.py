@@ -0,0 +1,196 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+TTL POLICY - EXPIRAÇÃO DE CACHE ALINHADA ÀS SEMANAS EPIDEMIOLÓGICAS
+════════════════════════════════════════════════════════════════════════════
+
+Centraliza os TTLs de cache da API.
+
+O InfoDengue publica dados uma vez por semana. Um TTL fixo (ex: 24h)
+faz a API servir dados velhos logo após a publicação ou rebaixar dados
+que não mudaram durante a semana toda. Aqui os TTLs são calculados a
+partir da próxima publicação esperada:
+
+    - Semanas epidemiológicas completas: imutáveis (TTL "infinito")
+    - Séries que incluem a semana atual: expiram na próxima publicação
+    - Publicação atrasada (semana esperada ainda ausente): TTL curto,
+      para tentar de novo em breve em vez de esperar mais uma semana
+    - Falhas do upstream (cache negativo): TTL curto por classe de erro
+
+Configuração (.env):
+    INFODENGUE_PUBLISH_WEEKDAY: Dia da publicação (0=segunda ... 6=domingo)
+    INFODENGUE_PUBLISH_HOUR: Hora (horário do servidor) da publicação
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.core.epiweek import DateLike, epiweek_start
+
+# ════════════════════════════════════════════════════════════════════════════
+# CONSTANTES
+# ════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_TTL = 3600  # 1 hora (dados sem política específica)
+WEATHER_TTL = 7200  # 2 horas - clima não muda rapidamente
+FORECAST_TTL = 3 * 3600  # 3 horas - intervalo entre os pontos da previsão
+CITY_NAME_TTL = 30 * 86400  # 30 dias - nome -> coordenadas de cidade fora do índice
+UNKNOWN_CITY_NAME_TTL = 86400  # 1 dia - nome que o OpenWeather não reconhece
+IMMUTABLE_TTL = 180 * 86400  # 180 dias - semanas epidemiológicas fechadas
+LATE_PUBLICATION_TTL = 3600  # Retenta a cada 1h se a publicação atrasar
+MIN_TTL = 300  # Nunca expira em menos de 5 minutos
+PARTIAL_DASHBOARD_TTL = MIN_TTL  # Painel montado com alguma fonte em fallback
+DASHBOARD_STALE_TTL = 6 * 3600  # Painel vencido ainda servido enquanto revalida
+VALIDATORS_TTL = 14 * 86400  # ETag/Last-Modified/hash das respostas do upstream
+HEAD_REVALIDATE_TTL = 86400  # Cabeça da série vencida mantida para revalidação condicional
+PUBLICATION_GRACE = timedelta(minutes=30)  # Margem após o horário previsto
+
+
+def _now(now: Optional[datetime]) -> datetime:
+    return now if now is not None else datetime.now()
+
+
+def last_publication(now: Optional[datetime] = None) -> datetime:
+    """
+    Retorna o horário da publicação semanal mais recente (já ocorrida).
+
+    Inclui a margem PUBLICATION_GRACE, para não rebaixar os dados
+    enquanto o InfoDengue ainda está processando a atualização.
+
+    Args:
+        now: Instante de referência (padrão: agora)
+
+    Returns:
+        datetime: Última fronteira de publicação <= now
+    """
+    now = _now(now)
+    days_since = (now.weekday() - settings.infodengue_publish_weekday) % 7
+    boundary = (
+        datetime.combine(now.date() - timedelta(days=days_since), datetime.min.time())
+        + timedelta(hours=settings.infodengue_publish_hour)
+        + PUBLICATION_GRACE
+    )
+    if boundary > now:
+        boundary -= timedelta(weeks=1)
+    return boundary
+
+
+def next_publication(now: Optional[datetime] = None) -> datetime:
+    """
+    Retorna o horário da próxima publicação semanal do InfoDengue.
+
+    Args:
+        now: Instante de referência (padrão: agora)
+
+    Returns:
+        datetime: Próxima fronteira de publicação > now
+    """
+    return last_publication(now) + timedelta(weeks=1)
+
+
+def seconds_until_next_publication(now: Optional[datetime] = None) -> int:
+    """Segundos até a próxima publicação (mínimo MIN_TTL)."""
+    now = _now(now)
+    return max(MIN_TTL, int((next_publication(now) - now).total_seconds()))
+
+
+def expected_latest_week(now: Optional[datetime] = None) -> date:
+    """
+    Semana epidemiológica mais recente que já deveria estar publicada.
+
+    Na publicação da semana W o InfoDengue consolida a semana W-1
+    (a que terminou no sábado anterior).
+
+    Returns:
+        date: Domingo de início da semana esperada
+    """
+    return epiweek_start(last_publication(now)) - timedelta(weeks=1)
+
+
+def epiweek_ttl(week: DateLike, now: Optional[datetime] = None) -> int:
+    """
+    TTL para dados de uma única semana epidemiológica.
+
+    Args:
+        week: Qualquer data dentro da semana
+        now: Instante de referência (padrão: agora)
+
+    Returns:
+        int: IMMUTABLE_TTL para semanas completas; até a próxima
+             publicação para a semana atual (parcial)
+    """
+    now = _now(now)
+    if epiweek_start(week) < epiweek_start(now):
+        return IMMUTABLE_TTL
+    return seconds_until_next_publication(now)
+
+
+def series_ttl(
+    latest_week: Optional[DateLike] = None, now: Optional[datetime] = None
+) -> int:
+    """
+    TTL para uma série que inclui a cabeça (semanas mais recentes).
+
+    Args:
+        latest_week: Data da semana mais recente presente na série
+                     (None se desconhecida)
+        now: Instante de referência (padrão: agora)
+
+    Returns:
+        int: Segundos até a próxima publicação, ou LATE_PUBLICATION_TTL
+             se a semana esperada ainda não apareceu no upstream
+    """
+    now = _now(now)
+    if latest_week is not None and epiweek_start(latest_week) < expected_latest_week(now):
+        return min(LATE_PUBLICATION_TTL, seconds_until_next_publication(now))
+    return seconds_until_next_publication(now)
+
+
+def dashboard_ttl(now: Optional[datetime] = None) -> int:
+    """
+    TTL do payload completo do dashboard.
+
+    O dashboard combina clima (muda em horas) com a série do InfoDengue
+    (muda na publicação semanal): expira no que vencer primeiro.
+
+    É o TTL "soft": depois dele o payload ainda é servido por mais
+    DASHBOARD_STALE_TTL enquanto é refeito em background.
+    """
+    return min(WEATHER_TTL, seconds_until_next_publication(now))
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# CACHE NEGATIVO (FALHAS DE UPSTREAM)
+# ════════════════════════════════════════════════════════════════════════════
+
+# Janela (segundos) em que uma falha é reaproveitada, por classe de erro
+NEGATIVE_TTLS = {
+    "timeout": 120,  # API lenta: evita esperar o timeout inteiro de novo
+    "network": 60,  # DNS/conexão recusada: costuma voltar rápido
+    "server_error": 120,  # HTTP 5xx
+    "rate_limited": 300,  # HTTP 429 (sem Retry-After)
+    "client_error": 900,  # HTTP 4xx: geocode/parâmetros não vão mudar sozinhos
+    "invalid_response": 600,  # JSON inválido
+    "unexpected": 120,
+}
+MAX_NEGATIVE_TTL = 1800  # Nunca confia num Retry-After maior que 30 min
+
+
+def negative_ttl(error_class: str, retry_after: Optional[int] = None) -> int:
+    """
+    TTL da entrada negativa gravada após uma falha do upstream.
+
+    Args:
+        error_class: Classe do erro (chave de NEGATIVE_TTLS)
+        retry_after: Segundos pedidos pelo upstream (header Retry-After)
+
+    Returns:
+        int: Segundos até a próxima tentativa real
+    """
+    if retry_after is not None and retry_after > 0:
+        return min(MAX_NEGATIVE_TTL, retry_after)
+    return NEGATIVE_TTLS.get(error_class, NEGATIVE_TTLS["unexpected"])
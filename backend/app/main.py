@@ -9,6 +9,9 @@ Features:
     - Machine Learning Model (Gradient Boosting)
     - OpenWeather API Integration
     - Health Check com status de serviços
+    - Cache Warmer (pré-aquecimento por tráfego/população)
+    - Orçamento de memória do Redis por namespace (plano 25MB)
+    - Métricas de cache por namespace (/metrics)
 """
 
 from contextlib import asynccontextmanager
@@ -16,7 +19,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
@@ -25,10 +28,20 @@ from app.api import cities_router, dashboard_router
 from app.api.state_statistics import router as state_statistics_router
 from app.api.v1.endpoints.predictions import router as predictions_router
 from app.api.heatmap import router as heatmap_router
+from app.core.circuit_breaker import circuit_breakers
 from app.core.config import settings
+from app.core.http_clients import http_clients
 from app.core.logger import logger
+from app.core.metrics import metrics
+from app.core.rate_limiter import rate_limiters
 from app.services import cache_service
+from app.services.cache_budget import cache_budget
+from app.services.cache_warmer import cache_warmer
+from app.services.infodengue_prefetcher import infodengue_prefetcher
+from app.services.infodengue_service import infodengue_service
+from app.services.infodengue_store import infodengue_store
 from app.services.prediction_service import prediction_service
+from app.services.weather_grid import weather_grid_refresher
 
 
 @asynccontextmanager
@@ -38,9 +51,13 @@ async def lifespan(app: FastAPI):
     
     Startup:
         - Conecta no Redis (cache)
+        - Cria os HTTP clients compartilhados (InfoDengue/OpenWeather)
         - Carrega modelo ML do disco
+        - Agenda o cache warmer e o orçamento de memória (background)
     
     Shutdown:
+        - Para o cache warmer e o orçamento de memória
+        - Fecha os HTTP clients
         - Fecha conexão com Redis
     """
     # ════════════════════════════════════════════════════════════════════════
@@ -54,6 +71,9 @@ async def lifespan(app: FastAPI):
     # Conecta ao Redis
     await cache_service.connect()
 
+    # Pool de conexões com as APIs externas (keep-alive/HTTP/2)
+    http_clients.start()
+
     # Carrega modelo de Machine Learning
     logger.info("🤖 Carregando modelo de Machine Learning...")
     ml_loaded = prediction_service.load_model()
@@ -62,6 +82,18 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("⚠️  Modelo ML não carregado - usando fallback (regras baseadas em temperatura)")
 
+    # Ingere as séries de todas as cidades do InfoDengue em background
+    infodengue_prefetcher.start()
+
+    # Mantém as células do Smart Grid de clima em cache (uma busca por TTL)
+    weather_grid_refresher.start()
+
+    # Pré-aquece cache (InfoDengue, dashboards) em background
+    cache_warmer.start()
+
+    # Mede uso do Redis por namespace e remove chaves perto do limite
+    cache_budget.start()
+
     logger.success("✓ API Ready!")
     logger.info("─" * 80)
 
@@ -72,6 +104,15 @@ async def lifespan(app: FastAPI):
     # ════════════════════════════════════════════════════════════════════════
     logger.info("🛑 Shutting down Dengo API...")
 
+    # Para o cache warmer antes de fechar o Redis
+    await cache_warmer.stop()
+    await weather_grid_refresher.stop()
+    await cache_budget.stop()
+    await infodengue_prefetcher.stop()
+
+    # Fecha conexões com as APIs externas
+    await http_clients.close()
+
     # Fecha conexão com Redis
     await cache_service.disconnect()
 
@@ -226,6 +267,10 @@ async def health_check():
     
     health_status["services"]["redis"] = redis_status
 
+    # Cache em disco (ativo enquanto o Redis estiver fora)
+    disk_stats = await cache_service.disk_stats()
+    health_status["services"]["disk_cache"] = disk_stats or {"status": "disabled"}
+
     # Verifica Modelo ML
     ml_loaded = prediction_service.is_loaded
     # Nota: ML está desabilitado por baixa acurácia (R² < 0)
@@ -238,6 +283,41 @@ async def health_check():
         "model_path": str(prediction_service.model_path) if ml_loaded else None,
     }
 
+    # Conexões com as APIs externas (pool, handshakes, reuso)
+    health_status["services"]["http_clients"] = http_clients.stats()
+
+    # Circuit breakers por upstream (closed/open/half_open)
+    health_status["services"]["circuit_breakers"] = circuit_breakers.stats()
+
+    # Token bucket e cota diária (OpenWeather)
+    health_status["services"]["rate_limiters"] = rate_limiters.stats()
+
+    # InfoDengue (taxa de cache negativo)
+    health_status["services"]["infodengue"] = infodengue_service.negative_cache_stats()
+
+    # Store local do InfoDengue (cidades ingeridas e última execução do prefetch)
+    health_status["services"]["infodengue_prefetch"] = {
+        **infodengue_store.stats(),
+        "last_run": infodengue_prefetcher.last_run
+        or ("pending" if settings.infodengue_prefetch_enabled else "disabled"),
+    }
+
+    # Orçamento de memória do Redis (última verificação)
+    health_status["services"]["cache_budget"] = cache_budget.last_report or {
+        "status": "pending" if cache_service.is_connected else "offline",
+        "limit_bytes": cache_budget.limit_bytes,
+    }
+
+    # Weather grid refresher (último ciclo)
+    health_status["services"]["weather_grid"] = weather_grid_refresher.last_run or {
+        "status": "pending" if settings.weather_grid_refresh_enabled else "disabled"
+    }
+
+    # Cache Warmer (última execução)
+    health_status["services"]["cache_warmer"] = cache_warmer.last_run or {
+        "status": "pending" if settings.cache_warmer_enabled else "disabled"
+    }
+
     # Define status geral
     # Redis offline não é crítico (graceful degradation)
     # ML usando fallback não é erro, é decisão consciente
@@ -247,6 +327,26 @@ async def health_check():
     return health_status
 
 
+@app.get("/metrics", tags=["Health"])
+async def metrics_endpoint(format: str = "prometheus"):
+    """
+    Métricas do processo (cache por namespace, cache negativo do InfoDengue).
+
+    Args:
+        format: "prometheus" (texto, padrão) ou "json"
+
+    Returns:
+        Texto no formato de exposição do Prometheus, ou JSON com o
+        resumo por namespace (cache_service.stats()) e os contadores
+    """
+    if format == "json":
+        return {"cache": cache_service.stats(), "counters": metrics.snapshot()}
+
+    return PlainTextResponse(
+        metrics.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Endpoint raiz."""
@@ -255,4 +355,5 @@ async def root():
         "version": settings.api_version,
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
     }
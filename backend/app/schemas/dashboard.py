@@ -50,6 +50,10 @@ class DashboardResponse(BaseModel):
 
     # --- Metadados ---
     last_updated: Optional[str] = Field(None, description="Timestamp da última atualização")
+    degraded: List[str] = Field(
+        default=[],
+        description="Fontes em fallback (resposta parcial): weather, history"
+    )
 
     class Config:
         json_schema_extra = {
@@ -71,4 +75,19 @@ class DashboardResponse(BaseModel):
                     {"week_number": 43, "date": "2024-10-22", "cases": 60}
                 ]
             }
-        }
\ No newline at end of file
+        }
+
+
+class DashboardBatchResponse(BaseModel):
+    """
+    Dashboards de várias cidades numa única resposta (favoritos/comparação).
+    """
+
+    dashboards: List[DashboardResponse] = Field(
+        default=[],
+        description="Dashboards na ordem dos códigos pedidos"
+    )
+    not_found: List[str] = Field(
+        default=[],
+        description="Códigos IBGE não encontrados na base local"
+    )
@@ -0,0 +1,300 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+CACHE BUDGET - GOVERNANÇA DE MEMÓRIA DO REDIS (PLANO 25MB)
+════════════════════════════════════════════════════════════════════════════
+
+O render.yaml provisiona um Redis free de 25MB. Quando ele enche, o Redis
+recusa escritas (OOM) ou descarta chaves sem critério - inclusive os
+segmentos imutáveis do InfoDengue, que são os mais caros de refazer.
+
+A cada CACHE_BUDGET_INTERVAL segundos:
+
+    1. Mede o uso aproximado por namespace (SCAN + STRLEN em pipeline)
+       e o used_memory real (INFO memory)
+    2. Compara com o orçamento de cada namespace (fração do limite)
+    3. Se used_memory passar de CACHE_BUDGET_HIGH_WATERMARK do limite,
+       remove chaves até CACHE_BUDGET_LOW_WATERMARK:
+         - namespaces acima do orçamento primeiro
+         - depois, do menos valioso para o mais valioso (EVICTION_ORDER)
+         - dentro do namespace, as que expirariam antes (menor TTL)
+
+A evicção só afeta o Redis: a cópia em disco (DiskCache) é mantida.
+O relatório da última verificação aparece no /health.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.services.cache_service import cache_service, key_namespace
+
+# Fração do limite reservada para cada namespace
+NAMESPACE_BUDGETS: Dict[str, float] = {
+    "infodengue": 0.40,  # Série segmentada (semanas fechadas valem 180 dias)
+    "dashboard": 0.20,  # Payload derivado - reconstruível a partir dos outros
+    "dengo:data": 0.25,  # DataFrames Arrow das predições
+    "weather:grid": 0.08,  # Pequeno, mas protege a cota do OpenWeather
+    "weather:name": 0.01,  # Nome -> coordenadas (e nomes desconhecidos)
+    "traffic": 0.02,  # Ranking do CacheWarmer
+    "ratelimit": 0.01,  # Token bucket e ledger de cota do OpenWeather
+    "other": 0.03,
+}
+
+# Ordem de evicção: do menos valioso (mais barato de refazer) ao mais valioso.
+# "traffic" e "ratelimit" nunca são removidos.
+EVICTION_ORDER = ("other", "weather:name", "dengo:data", "dashboard", "weather:grid", "infodengue")
+
+# Overhead aproximado por chave no Redis (dicionário, expiração, SDS)
+KEY_OVERHEAD_BYTES = 64
+
+SCAN_COUNT = 500
+
+
+class CacheBudget:
+    """
+    Tarefa de background que mede e limita o uso de memória do Redis.
+
+    Attributes:
+        last_report: Resultado da última verificação (exibido no /health)
+    """
+
+    def __init__(self):
+        """Inicializa (tarefa criada no start())."""
+        self._task: Optional[asyncio.Task] = None
+        self.last_report: Optional[Dict] = None
+
+    @property
+    def limit_bytes(self) -> int:
+        return settings.redis_max_memory_mb * 1024 * 1024
+
+    def start(self) -> None:
+        """Agenda a verificação periódica em background."""
+        if self._task and not self._task.done():
+            return
+
+        self._task = asyncio.create_task(self._run_forever(), name="cache-budget")
+        logger.info(
+            f"📏 Cache budget agendado ({settings.redis_max_memory_mb}MB, "
+            f"intervalo: {settings.cache_budget_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Cancela a tarefa de background."""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Erro no cache budget: {e}")
+
+            await asyncio.sleep(settings.cache_budget_interval)
+
+    # ════════════════════════════════════════════════════════════════════════
+    # MEDIÇÃO E EVICÇÃO
+    # ════════════════════════════════════════════════════════════════════════
+
+    async def check(self) -> Optional[Dict]:
+        """
+        Mede o uso por namespace e remove chaves se necessário.
+
+        Returns:
+            Dict: Relatório (uso total, por namespace, chaves removidas)
+            None: Se o Redis estiver offline
+        """
+        if not cache_service.is_connected or not cache_service.redis_client:
+            return None
+
+        client = cache_service.redis_client
+
+        try:
+            keys_by_namespace = await self._measure(client)
+            used_memory = await self._used_memory(client)
+        except redis.RedisError as e:
+            logger.warning(f"⚠️  Cache budget: falha ao medir Redis: {e}")
+            return None
+
+        usage = {
+            namespace: sum(size for _, size, _ in keys)
+            for namespace, keys in keys_by_namespace.items()
+        }
+        # Sem INFO (alguns provedores bloqueiam), usa a soma estimada
+        if used_memory is None:
+            used_memory = sum(usage.values())
+
+        evicted: Dict[str, int] = {}
+        high = settings.cache_budget_high_watermark * self.limit_bytes
+        if used_memory >= high:
+            target = used_memory - settings.cache_budget_low_watermark * self.limit_bytes
+            evicted = await self._evict(client, keys_by_namespace, usage, target)
+
+        self.last_report = self._report(keys_by_namespace, usage, used_memory, evicted)
+        return self.last_report
+
+    async def _measure(
+        self, client: redis.Redis
+    ) -> Dict[str, List[Tuple[bytes, int, int]]]:
+        """
+        Lista as chaves de cada namespace com tamanho e TTL aproximados.
+
+        Returns:
+            Dict: {namespace: [(chave, bytes, ttl), ...]}
+        """
+        keys: List[bytes] = [key async for key in client.scan_iter(count=SCAN_COUNT)]
+
+        result: Dict[str, List[Tuple[bytes, int, int]]] = {
+            namespace: [] for namespace in NAMESPACE_BUDGETS
+        }
+
+        for start in range(0, len(keys), SCAN_COUNT):
+            batch = keys[start : start + SCAN_COUNT]
+
+            pipe = client.pipeline(transaction=False)
+            for key in batch:
+                if key.startswith(b"traffic:"):
+                    pipe.zcard(key)  # ZSET: estimado por membro
+                else:
+                    pipe.strlen(key)
+                pipe.ttl(key)
+            replies = await pipe.execute(raise_on_error=False)
+
+            for i, key in enumerate(batch):
+                size, ttl = replies[2 * i], replies[2 * i + 1]
+                if isinstance(size, Exception) or isinstance(ttl, Exception):
+                    continue
+                if key.startswith(b"traffic:"):
+                    size *= 32
+                namespace = key_namespace(key.decode(errors="replace"))
+                result[namespace].append((key, size + len(key) + KEY_OVERHEAD_BYTES, ttl))
+
+        return result
+
+    @staticmethod
+    async def _used_memory(client: redis.Redis) -> Optional[int]:
+        try:
+            info = await client.info("memory")
+        except redis.ResponseError:
+            return None
+        return info.get("used_memory")
+
+    async def _evict(
+        self,
+        client: redis.Redis,
+        keys_by_namespace: Dict[str, List[Tuple[bytes, int, int]]],
+        usage: Dict[str, int],
+        target: float,
+    ) -> Dict[str, int]:
+        """
+        Remove chaves até liberar ``target`` bytes (estimados).
+
+        Returns:
+            Dict: Chaves removidas por namespace
+        """
+        # Menor TTL primeiro (perde-se menos); sem TTL (-1) por último
+        by_ttl = {
+            namespace: sorted(
+                keys_by_namespace.get(namespace, []),
+                key=lambda item: item[2] if item[2] >= 0 else float("inf"),
+            )
+            for namespace in EVICTION_ORDER
+        }
+
+        # 1ª passada: excesso dos namespaces acima do orçamento
+        candidates: List[Tuple[str, bytes, int]] = []
+        taken = set()
+        for namespace in EVICTION_ORDER:
+            excess = usage.get(namespace, 0) - NAMESPACE_BUDGETS[namespace] * self.limit_bytes
+            for key, size, _ in by_ttl[namespace]:
+                if excess <= 0:
+                    break
+                candidates.append((namespace, key, size))
+                taken.add(key)
+                excess -= size
+
+        # 2ª passada: do namespace menos valioso ao mais valioso
+        for namespace in EVICTION_ORDER:
+            candidates.extend(
+                (namespace, key, size)
+                for key, size, _ in by_ttl[namespace]
+                if key not in taken
+            )
+
+        selected: List[Tuple[str, bytes, int]] = []
+        freed = 0
+        for candidate in candidates:
+            if freed >= target:
+                break
+            selected.append(candidate)
+            freed += candidate[2]
+
+        evicted: Dict[str, int] = {}
+        for start in range(0, len(selected), SCAN_COUNT):
+            await client.unlink(*[key for _, key, _ in selected[start : start + SCAN_COUNT]])
+
+        for namespace, _, size in selected:
+            evicted[namespace] = evicted.get(namespace, 0) + 1
+            usage[namespace] -= size
+
+        for namespace, count in evicted.items():
+            metrics.incr("cache_evictions_total", count, namespace=namespace)
+
+        if evicted:
+            logger.warning(
+                f"📏 Redis perto do limite - {len(selected)} chaves removidas "
+                f"(~{freed // 1024}KB): {evicted}"
+            )
+        return evicted
+
+    def _report(
+        self,
+        keys_by_namespace: Dict[str, List[Tuple[bytes, int, int]]],
+        usage: Dict[str, int],
+        used_memory: int,
+        evicted: Dict[str, int],
+    ) -> Dict:
+        namespaces = {}
+        for namespace, share in NAMESPACE_BUDGETS.items():
+            budget = int(share * self.limit_bytes)
+            used = max(0, usage.get(namespace, 0))
+            namespaces[namespace] = {
+                "keys": len(keys_by_namespace.get(namespace, [])) - evicted.get(namespace, 0),
+                "bytes": used,
+                "budget_bytes": budget,
+                "budget_usage": round(used / budget, 3) if budget else 0.0,
+            }
+
+        return {
+            "limit_bytes": self.limit_bytes,
+            "used_memory": used_memory,
+            "usage_ratio": round(used_memory / self.limit_bytes, 3),
+            "namespaces": namespaces,
+            "evicted": evicted,
+            "checked_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# SINGLETON INSTANCE
+# ════════════════════════════════════════════════════════════════════════════
+
+cache_budget = CacheBudget()
@@ -0,0 +1,204 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+CACHE WARMER - PRÉ-AQUECIMENTO DO CACHE
+════════════════════════════════════════════════════════════════════════════
+
+Após um deploy ou um flush do Redis, o primeiro usuário de cada cidade
+pagaria as chamadas ao InfoDengue e ao OpenWeather. O warmer roda no
+startup (em background) e depois a cada CACHE_WARMER_INTERVAL segundos,
+preenchendo:
+
+    1. Séries do InfoDengue (cache segmentado, janela do dashboard) -
+       só sem o InfoDenguePrefetcher, que já ingere todas as cidades
+    2. Payloads completos do dashboard
+
+As células do Smart Grid de clima são mantidas pelo WeatherGridRefresher
+(app.services.weather_grid).
+
+Prioridade:
+    Cidades mais acessadas primeiro (traffic:dashboard no Redis);
+    sem histórico de tráfego, maior população primeiro.
+
+Limites:
+    - Concorrência limitada (CACHE_WARMER_CONCURRENCY)
+    - OpenWeather com prioridade de background no token bucket
+      (deixa parte do limite e da cota diária para os usuários)
+    - Só busca o que não está em cache (não gasta cota à toa)
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.rate_limiter import set_background_priority
+from app.services.cache_service import cache_service
+from app.services.cities_service import cities_service
+from app.services.dashboard_service import DASHBOARD_HISTORY_WEEKS, refresh_dashboard
+from app.services.infodengue_service import infodengue_service
+
+
+class CacheWarmer:
+    """
+    Tarefa de background que pré-aquece o cache por prioridade.
+
+    Attributes:
+        last_run: Estatísticas da última execução (exibidas no /health)
+    """
+
+    def __init__(self):
+        """Inicializa o warmer (tarefa criada no start())."""
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[Dict] = None
+
+    def start(self) -> None:
+        """Agenda o warmer em background (não bloqueia o startup)."""
+        if not settings.cache_warmer_enabled:
+            logger.info("🔥 Cache warmer desabilitado (CACHE_WARMER_ENABLED=false)")
+            return
+
+        if self._task and not self._task.done():
+            return
+
+        self._task = asyncio.create_task(self._run_forever(), name="cache-warmer")
+        logger.info(
+            f"🔥 Cache warmer agendado (intervalo: {settings.cache_warmer_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Cancela a tarefa de background."""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("🔥 Cache warmer parado")
+
+    async def _run_forever(self) -> None:
+        """Executa warm_once no startup e depois periodicamente."""
+        set_background_priority()
+
+        while True:
+            try:
+                await self.warm_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Erro no cache warmer: {e}")
+
+            await asyncio.sleep(settings.cache_warmer_interval)
+
+    async def prioritized_cities(self) -> List[Dict]:
+        """
+        Ordena as cidades por tráfego observado e população.
+
+        Returns:
+            List[Dict]: Até CACHE_WARMER_MAX_CITIES cidades, da mais
+                        prioritária para a menos
+        """
+        ranking = await cache_service.get_traffic_ranking()
+
+        cities = sorted(
+            cities_service.cities_data,
+            key=lambda c: (ranking.get(c["ibge_codigo"], 0.0), c.get("populacao", 0)),
+            reverse=True,
+        )
+        return cities[: settings.cache_warmer_max_cities]
+
+    async def warm_once(self) -> Dict:
+        """
+        Executa um ciclo completo de pré-aquecimento.
+
+        Returns:
+            Dict: Estatísticas do ciclo
+        """
+        if not cache_service.is_connected:
+            logger.debug("⚠️  Redis offline - pulando cache warmer")
+            return {}
+
+        started = time.perf_counter()
+        cities = await self.prioritized_cities()
+
+        stats = {
+            "cities": len(cities),
+            "infodengue_series": await self._warm_infodengue(cities),
+            "dashboards": await self._warm_dashboards(cities),
+        }
+        stats["duration_s"] = round(time.perf_counter() - started, 1)
+        stats["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+        self.last_run = stats
+        logger.success(f"🔥 Cache warmer concluído: {stats}")
+        return stats
+
+    # ════════════════════════════════════════════════════════════════════════
+    # ETAPAS
+    # ════════════════════════════════════════════════════════════════════════
+
+    async def _warm_infodengue(self, cities: List[Dict]) -> int:
+        """Garante a janela do dashboard no cache segmentado do InfoDengue."""
+        # O prefetcher busca e ingere as mesmas séries: evita a segunda
+        # passada inteira pelo InfoDengue a cada deploy
+        if settings.infodengue_prefetch_enabled:
+            return 0
+
+        await self._run_bounded(
+            cities,
+            lambda city: infodengue_service.get_historical_data(
+                city["ibge_codigo"], weeks=DASHBOARD_HISTORY_WEEKS
+            ),
+        )
+        return len(cities)
+
+    async def _warm_dashboards(self, cities: List[Dict]) -> int:
+        """Monta e salva os payloads de dashboard ausentes no cache."""
+        keys = [f"dashboard:{city['ibge_codigo']}" for city in cities]
+        cached = await cache_service.get_many(keys)
+        # Ausentes ou vencidos (TTL soft): refeitos antes de alguém pedir
+        missing = [
+            city
+            for city, value in zip(cities, cached)
+            if value is None or not cache_service.split_dashboard_entry(value)[1]
+        ]
+
+        await self._run_bounded(missing, refresh_dashboard)
+        return len(missing)
+
+    async def _run_bounded(
+        self,
+        items: List[Dict],
+        worker: Callable[[Dict], Awaitable],
+    ) -> None:
+        """
+        Executa ``worker`` para cada item com concorrência limitada.
+
+        Args:
+            items: Cidades a processar (em ordem de prioridade)
+            worker: Corrotina por cidade
+        """
+        semaphore = asyncio.Semaphore(settings.cache_warmer_concurrency)
+
+        async def run(item: Dict) -> None:
+            async with semaphore:
+                try:
+                    await worker(item)
+                except Exception as e:
+                    logger.warning(f"⚠️  Warmer falhou para {item.get('ibge_codigo')}: {e}")
+
+        await asyncio.gather(*(run(item) for item in items))
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# SINGLETON INSTANCE
+# ════════════════════════════════════════════════════════════════════════════
+
+cache_warmer = CacheWarmer()
@@ -3,7 +3,7 @@ CITIES SERVICE - GESTÃO DE MUNICÍPIOS (VERSÃO LIMPA)
 """
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import unicodedata
 from app.core.logger import logger
 
@@ -16,6 +16,8 @@ class CitiesService:
     def __init__(self):
         self.cities_data: List[Dict] = []
         self.cities_by_ibge: Dict[str, Dict] = {}
+        # (nome normalizado, UF) -> cidade
+        self.cities_by_name: Dict[Tuple[str, str], Dict] = {}
         self._load_cities_data()
 
     def _load_cities_data(self):
@@ -33,6 +35,7 @@ class CitiesService:
                     str_id = str(city["ibge_codigo"])
                     city["ibge_codigo"] = str_id
                     self.cities_by_ibge[str_id] = city
+                    self.cities_by_name[(normalize_text(city["nome"]), city["uf"].upper())] = city
                 
                 logger.success(f"✅ {len(self.cities_data)} cidades do PR carregadas.")
             except Exception as e:
@@ -59,6 +62,10 @@ class CitiesService:
 
     def get_city_by_ibge(self, ibge_code: str) -> Optional[Dict]:
         return self.cities_by_ibge.get(str(ibge_code))
+
+    def get_city_by_name(self, name: str, uf: str) -> Optional[Dict]:
+        """Busca exata por nome (sem acento/caixa) e UF."""
+        return self.cities_by_name.get((normalize_text(name), uf.upper().strip()))
         
     def get_cities_by_uf(self, uf: str) -> List[Dict]:
         return [c for c in self.cities_data if c["uf"].upper() == uf.upper()]
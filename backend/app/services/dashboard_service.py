@@ -0,0 +1,407 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+DASHBOARD SERVICE - MONTAGEM DO PAINEL POR CIDADE
+════════════════════════════════════════════════════════════════════════════
+
+Agrega dados de múltiplas fontes para o painel principal:
+    - Dados climáticos (WeatherService)
+    - Dados históricos reais (InfoDengueService)
+    - Predições de risco (PredictionService)
+    - Informações demográficas (CitiesService)
+
+Usado pelo endpoint /dashboard e pelo CacheWarmer (pré-aquecimento),
+para que ambos produzam exatamente o mesmo payload.
+
+Clima e histórico são independentes e rodam em paralelo (a latência do
+painel é a do ramo mais lento, não a soma). Cada ramo tem prazo próprio
+(DASHBOARD_WEATHER_TIMEOUT / DASHBOARD_HISTORY_TIMEOUT): se estourar ou
+falhar, aquele ramo usa o fallback e o painel sai parcial (``degraded``).
+A busca que estourou o prazo continua em background e aquece o cache
+para a próxima requisição. A duração de cada ramo vai para a métrica
+``dashboard_branch_seconds``.
+
+Cache do payload completo (get_cached_dashboard), stale-while-revalidate:
+    - Fresco (TTL soft)   -> servido direto do cache (HIT)
+    - Vencido (até o TTL hard) -> servido na hora e refeito em background,
+      uma revalidação por cidade (STALE)
+    - Ausente             -> montado na requisição e salvo (MISS)
+Uma nova SE ingerida pelo prefetcher invalida o painel da cidade
+(invalidate_dashboard).
+
+Lote (get_cached_dashboards / build_dashboards, endpoint /dashboard/batch):
+uma leitura MGET do cache, clima uma vez por célula do grid, histórico
+das cidades ausentes em paralelo e uma única chamada de predição.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from app.core import ttl_policy
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.schemas.dashboard import DashboardResponse
+from app.services.cache_service import cache_service
+from app.services.infodengue_service import infodengue_service
+from app.services.prediction_service import prediction_service
+from app.services.weather_grid import weather_grid
+from app.services.weather_service import weather_service
+
+# Semanas de histórico (suporta filtro de 12 semanas no frontend)
+DASHBOARD_HISTORY_WEEKS = 16
+
+# Clima usado quando o ramo do OpenWeather falha ou estoura o prazo
+FALLBACK_WEATHER = {
+    "temperatura_atual": 25.0,
+    "temperatura_min": 20.0,
+    "temperatura_max": 30.0,
+    "umidade": 60,
+    "descricao": "Dados indisponíveis",
+    "icon": "01d",
+    "fonte": "Offline"
+}
+
+
+# Predição usada se o serviço de predição falhar
+FALLBACK_PREDICTION = {
+    "casos_estimados": 0,
+    "nivel_risco": "baixo",
+    "confianca": 0.0,
+    "tendencia": "estavel",
+    "fonte": "Erro"
+}
+
+# Revalidações em andamento (uma por cidade; referência forte às tasks)
+_refresh_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _consume_result(task: asyncio.Task) -> None:
+    """Evita 'Task exception was never retrieved' em ramos abandonados."""
+    if not task.cancelled():
+        task.exception()
+
+
+async def _resolve_fallback(fallback: Any) -> Any:
+    """Valor de fallback de um ramo (chama a função, se for uma)."""
+    if callable(fallback):
+        return await fallback()
+    return fallback
+
+
+def _history_fallback(ibge_code: str) -> Callable[[], Awaitable[List[Dict]]]:
+    """Histórico sem upstream: semanas em cache + estimativa para as ausentes."""
+    return lambda: infodengue_service.get_cached_window(ibge_code, DASHBOARD_HISTORY_WEEKS)
+
+
+async def _run_branch(
+    name: str, coro: Awaitable, timeout: float, fallback: Any
+) -> Tuple[Any, bool]:
+    """
+    Executa um ramo do dashboard com prazo, registrando a duração.
+
+    No timeout a tarefa não é cancelada: termina em background e grava
+    o resultado no cache do serviço correspondente.
+
+    Args:
+        name: Nome do ramo (label da métrica)
+        coro: Busca do ramo
+        timeout: Prazo em segundos
+        fallback: Valor usado se o ramo falhar ou estourar o prazo, ou
+                  função assíncrona (sem argumentos) que o produz
+
+    Returns:
+        Tuple: (resultado ou fallback, True se veio do fallback)
+    """
+    task = asyncio.ensure_future(coro)
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(asyncio.shield(task), timeout)
+        outcome = "ok"
+    except asyncio.TimeoutError:
+        task.add_done_callback(_consume_result)
+        logger.warning(f"⏱️  Dashboard: {name} excedeu {timeout}s (usando fallback)")
+        result, outcome = await _resolve_fallback(fallback), "timeout"
+    except Exception as e:
+        logger.error(f"Erro ao buscar {name}: {e}")
+        result, outcome = await _resolve_fallback(fallback), "error"
+
+    elapsed = time.perf_counter() - started
+    metrics.observe("dashboard_branch_seconds", elapsed, branch=name, outcome=outcome)
+    logger.debug(f"⏱️  Dashboard: {name} em {elapsed * 1000:.0f}ms ({outcome})")
+    return result, outcome != "ok"
+
+
+async def build_dashboard(city_info: Dict) -> DashboardResponse:
+    """
+    Monta o payload completo do dashboard para uma cidade.
+
+    Args:
+        city_info: Registro da cidade (CitiesService.get_city_by_ibge)
+
+    Returns:
+        DashboardResponse: Payload pronto para o Flutter
+    """
+    return (await build_dashboards([city_info]))[0]
+
+
+async def build_dashboards(cities: List[Dict]) -> List[DashboardResponse]:
+    """
+    Monta os dashboards de várias cidades juntos.
+
+    Todas as buscas rodam em paralelo: clima uma vez por célula do Smart
+    Grid (cidades da mesma célula compartilham a leitura) e histórico por
+    cidade. A predição é uma única chamada em lote.
+
+    Args:
+        cities: Registros das cidades (CitiesService.get_city_by_ibge)
+
+    Returns:
+        List[DashboardResponse]: Na mesma ordem de ``cities``
+    """
+    # Célula do grid de cada cidade (sem coordenadas -> célula própria)
+    city_cells = [
+        weather_grid.cell_for_city(city["ibge_codigo"]) or f"city:{city['ibge_codigo']}"
+        for city in cities
+    ]
+    cell_cities: Dict[str, Dict] = {}
+    for cell, city in zip(city_cells, cities):
+        cell_cities.setdefault(cell, city)
+
+    for city in cities:
+        logger.info(f"📍 Cidade: {city.get('nome', 'Desconhecida')} ({city.get('populacao', 10000)} hab)")
+
+    # 1 e 2. Clima atual (por célula) e histórico (por cidade) em paralelo
+    weather_branches = [
+        _run_branch(
+            "weather",
+            weather_service.get_current_weather(
+                city.get("latitude", -25.25),
+                city.get("longitude", -52.02),
+                grid_key=weather_grid.cell_for_city(city["ibge_codigo"]),
+            ),
+            settings.dashboard_weather_timeout,
+            FALLBACK_WEATHER,
+        )
+        for city in cell_cities.values()
+    ]
+    history_branches = [
+        _run_branch(
+            "history",
+            infodengue_service.get_historical_data(
+                city["ibge_codigo"], weeks=DASHBOARD_HISTORY_WEEKS
+            ),
+            settings.dashboard_history_timeout,
+            _history_fallback(city["ibge_codigo"]),
+        )
+        for city in cities
+    ]
+    results = await asyncio.gather(*weather_branches, *history_branches)
+    weather_by_cell = dict(zip(cell_cities, results[:len(weather_branches)]))
+    histories = results[len(weather_branches):]
+
+    # 3. Gera Predições (IA) - um lote para todas as cidades
+    inputs = []
+    for city, cell, (historical_rows, _) in zip(cities, city_cells, histories):
+        weather, _ = weather_by_cell[cell]
+        population = city.get("populacao", 10000)
+
+        # IMPORTANTE: Usar semanas COMPLETAS para predição
+        # historical_rows[0] = semana atual (pode ser parcial!)
+        # historical_rows[1] = última semana completa
+        # historical_rows[2] = semana anterior à última
+        valid_weeks = [
+            row for row in historical_rows or []
+            if int(row.get('semana_epidemiologica', 0)) > 0
+        ]
+        casos_semana_anterior = int(valid_weeks[1].get('casos', 0)) if len(valid_weeks) > 1 else 0
+        casos_2sem_anterior = int(valid_weeks[2].get('casos', 0)) if len(valid_weeks) > 2 else 0
+
+        logger.info(
+            f"📊 Dados para predição: "
+            f"sem_anterior={casos_semana_anterior}, "
+            f"2sem_anterior={casos_2sem_anterior}"
+        )
+
+        inputs.append({
+            "temperatura_media": weather.get("temperatura_atual", 25.0),
+            "temperatura_min": weather.get("temperatura_min", 20.0),
+            "temperatura_max": weather.get("temperatura_max", 30.0),
+            "umidade": weather.get("umidade", 60.0),
+            "precipitacao": 50.0,  # Valor médio estimado se não tiver realtime
+            "populacao_densidade": int(population / 100) if population else 100,
+            "casos_semana_anterior": casos_semana_anterior,
+            "casos_2sem_anterior": casos_2sem_anterior,
+        })
+
+    try:
+        predictions = prediction_service.predict_many(inputs)
+    except Exception as e:
+        logger.error(f"Erro na predição: {e}")
+        # Fallback
+        predictions = [FALLBACK_PREDICTION] * len(cities)
+
+    # 4. Monta Respostas Finais
+    return [
+        _dashboard_response(city, weather_by_cell[cell], history, prediction)
+        for city, cell, history, prediction in zip(cities, city_cells, histories, predictions)
+    ]
+
+
+def _dashboard_response(
+    city_info: Dict,
+    weather_branch: Tuple[Dict, bool],
+    history_branch: Tuple[List[Dict], bool],
+    prediction: Dict,
+) -> DashboardResponse:
+    """Monta o payload de uma cidade a partir dos ramos e da predição."""
+    weather, weather_degraded = weather_branch
+    historical_rows, history_degraded = history_branch
+    degraded: List[str] = [
+        name
+        for name, failed in (("weather", weather_degraded), ("history", history_degraded))
+        if failed
+    ]
+
+    # O Service retorna lista de dicts (mais recente primeiro)
+    historical_data = []
+    for row in historical_rows or []:
+        historical_data.append({
+            "week_number": int(row.get('semana_epidemiologica', 0)),
+            "date": row.get('data', '2024-01-01'),
+            "cases": int(row.get('casos', 0))
+        })
+
+    return DashboardResponse(
+        city=city_info.get("nome", "Desconhecida"),
+        geocode=city_info["ibge_codigo"],
+        state=city_info.get("uf", "PR"),
+        # Usa a população real do JSON, com fallback para 10k
+        population=city_info.get("populacao", 10000),
+
+        # Clima
+        current_temp=weather.get("temperatura_atual"),
+        min_temp=weather.get("temperatura_min"),
+        max_temp=weather.get("temperatura_max"),
+        weather_desc=weather.get("descricao"),
+        weather_icon=weather.get("icon"),
+
+        # Predição
+        risk_level=prediction["nivel_risco"],
+        predicted_cases=prediction["casos_estimados"],
+        trend=prediction["tendencia"],
+
+        # Histórico
+        historical_data=historical_data,
+
+        # Metadados
+        last_updated=None,
+        degraded=degraded,
+    )
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# CACHE DO PAYLOAD (STALE-WHILE-REVALIDATE)
+# ════════════════════════════════════════════════════════════════════════════
+
+
+async def refresh_dashboard(city_info: Dict) -> DashboardResponse:
+    """Monta o dashboard de uma cidade e grava no cache."""
+    return (await refresh_dashboards([city_info]))[0]
+
+
+async def refresh_dashboards(cities: List[Dict]) -> List[DashboardResponse]:
+    """
+    Monta os dashboards e grava no cache (um pipeline).
+
+    Payload parcial (alguma fonte em fallback) usa TTL soft curto.
+    """
+    responses = await build_dashboards(cities)
+    await cache_service.set_dashboard_many({
+        response.geocode: (
+            response.model_dump(),
+            ttl_policy.PARTIAL_DASHBOARD_TTL if response.degraded else None,
+        )
+        for response in responses
+    })
+    return responses
+
+
+def _schedule_refresh(city_info: Dict) -> None:
+    """Revalida o dashboard em background (ignora se já em andamento)."""
+    city_id = city_info["ibge_codigo"]
+    if city_id in _refresh_tasks:
+        return
+
+    task = asyncio.create_task(refresh_dashboard(city_info))
+    _refresh_tasks[city_id] = task
+
+    def done(finished: asyncio.Task) -> None:
+        _refresh_tasks.pop(city_id, None)
+        if not finished.cancelled() and finished.exception():
+            logger.warning(
+                f"⚠️  Revalidação do dashboard {city_id} falhou: {finished.exception()}"
+            )
+
+    task.add_done_callback(done)
+
+
+async def get_cached_dashboard(city_info: Dict) -> Tuple[Dict, str]:
+    """
+    Dashboard da cidade pelo cache, com stale-while-revalidate.
+
+    Args:
+        city_info: Registro da cidade (CitiesService.get_city_by_ibge)
+
+    Returns:
+        Tuple: (payload, estado do cache: "HIT", "STALE" ou "MISS")
+    """
+    return (await get_cached_dashboards([city_info]))[0]
+
+
+async def get_cached_dashboards(cities: List[Dict]) -> List[Tuple[Dict, str]]:
+    """
+    Versão em lote de get_cached_dashboard.
+
+    Uma leitura em lote do cache (MGET); as ausentes são montadas juntas
+    (build_dashboards: clima por célula, predição em lote) e gravadas num
+    único pipeline.
+
+    Returns:
+        List: (payload, "HIT" | "STALE" | "MISS") na ordem de ``cities``
+    """
+    entries = await cache_service.get_dashboard_entries(
+        [city["ibge_codigo"] for city in cities]
+    )
+
+    results: List[Tuple[Dict, str]] = [None] * len(cities)
+    missing: List[int] = []
+    for index, (city, entry) in enumerate(zip(cities, entries)):
+        if entry is None:
+            missing.append(index)
+            continue
+
+        payload, fresh = entry
+        status = "HIT" if fresh else "STALE"
+        if not fresh:
+            _schedule_refresh(city)
+        metrics.incr("dashboard_cache_total", result=status.lower())
+        results[index] = (payload, status)
+
+    if missing:
+        metrics.incr("dashboard_cache_total", amount=len(missing), result="miss")
+        responses = await refresh_dashboards([cities[index] for index in missing])
+        for index, response in zip(missing, responses):
+            results[index] = (response.model_dump(), "MISS")
+
+    return results
+
+
+async def invalidate_dashboard(city_id: str) -> None:
+    """Descarta o dashboard da cidade (nova semana epidemiológica)."""
+    if await cache_service.delete(city_id):
+        metrics.incr("dashboard_invalidations_total")
@@ -5,7 +5,12 @@ Data Service - Gerenciamento Híbrido de Dados para Predição
 Implementa estratégia híbrida de obtenção de dados:
 1. Tenta API InfoDengue (dados em tempo real)
 2. Fallback para CSV local (DATASET_PARA_IA.csv)
-3. Cache Redis para otimização
+3. Cache Redis para otimização (DataFrames em Arrow IPC)
+4. InfoDengue store local (séries de todas as cidades, ingestão em lote)
+
+Uma predição busca a série UMA vez (get_series, janela máxima) e fatia
+gráfico e entrada do modelo dela, sem cópia; o nome da cidade vem do
+índice do CitiesService.
 
 Garante resiliência e disponibilidade mesmo com APIs externas instáveis.
 
@@ -14,22 +19,27 @@ Created: 2025-12-25
 """
 
 import asyncio
-import io
+import heapq
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 from functools import lru_cache
 
 import pandas as pd
 import httpx
 from loguru import logger
 
-try:
-    from redis import asyncio as aioredis
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
-    logger.warning("Redis não instalado - cache desabilitado")
+from app.core import ttl_policy
+from app.core.arrow_codec import ARROW_AVAILABLE, decode_frame, encode_frame
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.epiweek import date_to_epiweek
+from app.core.http_clients import http_clients
+from app.core.json_stream import iter_json_array
+from app.core.retry_policy import RetryPolicy, is_retryable_status
+from app.services.cache_service import CacheService, cache_service
+from app.services.cities_service import cities_service
+from app.services.infodengue_store import infodengue_store
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -40,13 +50,20 @@ except ImportError:
 MODELS_DIR = Path(__file__).parent.parent.parent / "models"
 DATASET_PATH = MODELS_DIR / "DATASET_PARA_IA.csv"
 
-# API InfoDengue
-INFODENGUE_BASE_URL = "https://info.dengue.mat.br/api/alertcity"
+# API InfoDengue (URL base em settings.infodengue_base_url)
 INFODENGUE_TIMEOUT = 15  # segundos
-INFODENGUE_MAX_RETRIES = 2
+# Sem hedge: a resposta é lida em streaming e a perdedora ficaria aberta
+INFODENGUE_RETRY = RetryPolicy(
+    "infodengue",
+    max_retries=settings.infodengue_max_retries,
+    deadline=settings.infodengue_retry_deadline,
+    hedge=False,
+)
+# Semanas a mais na janela pedida (atraso de publicação do InfoDengue)
+INFODENGUE_WINDOW_MARGIN_WEEKS = 4
 
-# Cache
-CACHE_TTL = 3600  # 1 hora
+# Cache (TTL de dados da API segue ttl_policy.series_ttl)
+CSV_FALLBACK_TTL = ttl_policy.LATE_PUBLICATION_TTL  # Retenta a API em 1h
 CACHE_KEY_PREFIX = "dengo:data:"
 
 # Features obrigatórias do dataset
@@ -66,6 +83,16 @@ REQUIRED_COLUMNS = [
     "cidade",
 ]
 
+# Colunas guardadas das respostas da API (REQUIRED_COLUMNS sem "cidade")
+API_COLUMNS = [col for col in REQUIRED_COLUMNS if col != "cidade"]
+
+
+async def _aenumerate(items: AsyncIterator[Any]) -> AsyncIterator[Tuple[int, Any]]:
+    index = 0
+    async for item in items:
+        yield index, item
+        index += 1
+
 
 # ════════════════════════════════════════════════════════════════════════════
 # EXCEPTIONS
@@ -82,6 +109,49 @@ class GeocodeNotFoundError(Exception):
     pass
 
 
+# ════════════════════════════════════════════════════════════════════════════
+# SERIES HANDLE
+# ════════════════════════════════════════════════════════════════════════════
+
+
+class HistoricalSeries:
+    """
+    Série histórica de uma cidade, buscada uma vez na janela máxima.
+
+    Gráfico e entrada do modelo são fatias (``last``) do mesmo DataFrame:
+    sem nova busca, nova chave de cache ou cópia dos dados.
+
+    Attributes:
+        geocode: Código IBGE
+        city_name: Nome do município
+        frame: Semanas ordenadas por data (mais antiga primeiro)
+    """
+
+    def __init__(self, geocode: str, city_name: str, frame: pd.DataFrame):
+        if not frame["data_iniSE"].is_monotonic_increasing:
+            frame = frame.sort_values("data_iniSE")
+        self.geocode = geocode
+        self.city_name = city_name
+        self.frame = frame
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def last(self, weeks: int) -> pd.DataFrame:
+        """
+        Últimas ``weeks`` semanas (view da série, não copiar para alterar).
+
+        Raises:
+            DataNotFoundError: Se a série tiver menos semanas
+        """
+        if len(self.frame) < weeks:
+            raise DataNotFoundError(
+                f"Dados insuficientes para município {self.geocode}: "
+                f"Encontrado {len(self.frame)} semanas, necessário {weeks}"
+            )
+        return self.frame.iloc[len(self.frame) - weeks:]
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # DATA SERVICE
 # ════════════════════════════════════════════════════════════════════════════
@@ -97,35 +167,29 @@ class DataService:
     3. CSV local (fallback confiável)
     
     Attributes:
-        redis_client: Cliente Redis assíncrono (opcional)
+        cache: CacheService compartilhado (mesma conexão Redis da API)
         dataset_cache: Cache em memória do CSV
     
     Example:
-        >>> data_service = DataService()
+        >>> data_service = DataService(cache=cache_service)
         >>> df = await data_service.get_historical_data("4106902", weeks=4)
         >>> print(df.tail())
     """
     
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(self, cache: Optional[CacheService] = None):
         """
         Inicializa DataService.
         
         Args:
-            redis_url: URL do Redis (ex: redis://localhost:6379)
-                      Se None, cache é desabilitado
+            cache: CacheService usado para armazenar DataFrames
+                   Se None, cache é desabilitado
         """
-        self.redis_client: Optional[aioredis.Redis] = None
+        self.cache: Optional[CacheService] = cache
         self.dataset_cache: Optional[pd.DataFrame] = None
         
-        if redis_url and REDIS_AVAILABLE:
-            try:
-                self.redis_client = aioredis.from_url(
-                    redis_url,
-                    decode_responses=False  # Vamos armazenar pickle
-                )
-                logger.info(f"✅ Redis conectado: {redis_url}")
-            except Exception as e:
-                logger.warning(f"⚠️ Redis indisponível: {e}")
+        if cache is not None and not ARROW_AVAILABLE:
+            logger.warning("⚠️ PyArrow indisponível - cache de DataFrames desabilitado")
+            self.cache = None
     
     @lru_cache(maxsize=1)
     def _load_dataset(self) -> pd.DataFrame:
@@ -164,51 +228,52 @@ class DataService:
         """
         Busca dados do cache Redis.
         
+        Os DataFrames são armazenados em Arrow IPC e reconstruídos sem
+        cópia das colunas numéricas (o resultado é somente leitura).
+        
         Args:
             cache_key: Chave do cache
         
         Returns:
             DataFrame se encontrado, None caso contrário
         """
-        if not self.redis_client:
+        if not self.cache:
+            return None
+        
+        cached = await self.cache.get_bytes(cache_key)
+        if not cached:
             return None
         
         try:
-            cached = await self.redis_client.get(cache_key)
-            if cached:
-                # Desserializa pickle
-                df = pd.read_pickle(io.BytesIO(cached))
-                logger.debug(f"✅ Cache HIT: {cache_key}")
-                return df
+            df = decode_frame(cached)
+            logger.debug(f"✅ Cache HIT: {cache_key}")
+            return df
         except Exception as e:
+            # Payload antigo (pickle) ou corrompido: trata como MISS
             logger.warning(f"⚠️ Erro ao ler cache: {e}")
         
         return None
     
-    async def _set_cache(self, cache_key: str, df: pd.DataFrame) -> None:
+    async def _set_cache(self, cache_key: str, df: pd.DataFrame, ttl: int) -> None:
         """
-        Armazena dados no cache Redis.
+        Armazena dados no cache Redis (Arrow IPC).
         
         Args:
             cache_key: Chave do cache
             df: DataFrame a cachear
+            ttl: Time To Live em segundos
         """
-        if not self.redis_client:
+        if not self.cache:
             return
         
         try:
-            import io
-            buffer = io.BytesIO()
-            df.to_pickle(buffer)
-            
-            await self.redis_client.setex(
-                cache_key,
-                CACHE_TTL,
-                buffer.getvalue()
-            )
-            logger.debug(f"💾 Cache salvo: {cache_key}")
+            payload = encode_frame(df)
         except Exception as e:
-            logger.warning(f"⚠️ Erro ao salvar cache: {e}")
+            logger.warning(f"⚠️ Erro ao serializar cache: {e}")
+            return
+        
+        if await self.cache.set_bytes(cache_key, payload, ttl=ttl):
+            logger.debug(f"💾 Cache salvo: {cache_key} ({len(payload)} bytes)")
     
     async def _fetch_from_api(
         self,
@@ -228,43 +293,59 @@ class DataService:
         try:
             logger.debug(f"🌐 Tentando API InfoDengue para {geocode}...")
             
-            # Calcula período
-            end_year = datetime.now().year
-            start_year = end_year - 1  # Últimos 2 anos
+            # Janela: só as semanas pedidas + margem de atraso da publicação
+            today = datetime.now().date()
+            start_year, start_week = date_to_epiweek(
+                today - timedelta(weeks=weeks + INFODENGUE_WINDOW_MARGIN_WEEKS)
+            )
+            end_year, end_week = date_to_epiweek(today)
             
-            url = (
-                f"{INFODENGUE_BASE_URL}"
-                f"?geocode={geocode}"
-                f"&disease=dengue"
-                f"&format=json"
-                f"&ew_start=1"
-                f"&ew_end=53"
-                f"&ey_start={start_year}"
-                f"&ey_end={end_year}"
+            client = http_clients.get("infodengue")
+            request = client.build_request(
+                "GET",
+                f"{settings.infodengue_base_url}/alertcity",
+                params={
+                    "geocode": geocode,
+                    "disease": "dengue",
+                    "format": "json",
+                    "ew_start": start_week,
+                    "ew_end": end_week,
+                    "ey_start": start_year,
+                    "ey_end": end_year,
+                },
+                timeout=INFODENGUE_TIMEOUT,
             )
             
-            async with httpx.AsyncClient(timeout=INFODENGUE_TIMEOUT) as client:
-                response = await client.get(url)
+            async def open_stream() -> httpx.Response:
+                response = await client.send(request, stream=True)
+                if is_retryable_status(response.status_code):
+                    await response.aread()  # Corpo de erro é pequeno; libera a conexão
+                return response
+            
+            response = await INFODENGUE_RETRY.run(open_stream)
+            try:
                 response.raise_for_status()
-                
-                data = response.json()
-                
-                if not data:
-                    logger.warning("API retornou dados vazios")
-                    return None
-                
-                df = pd.DataFrame(data)
-                
-                # Converte data
-                df["data_iniSE"] = pd.to_datetime(df["data_iniSE"], unit="ms")
-                
-                # Ordena e pega últimas N semanas
-                df = df.sort_values("data_iniSE").tail(weeks)
-                
-                logger.success(f"✅ API InfoDengue: {len(df)} semanas")
-                
-                return df
-                
+                rows = await self._read_latest_rows(response, weeks)
+            finally:
+                await response.aclose()
+
+            if not rows:
+                logger.warning("API retornou dados vazios")
+                return None
+
+            df = pd.DataFrame(rows, columns=API_COLUMNS)
+
+            # Converte data e ordena (mais antiga primeiro)
+            df["data_iniSE"] = pd.to_datetime(df["data_iniSE"], unit="ms")
+            df = df.sort_values("data_iniSE").reset_index(drop=True)
+
+            logger.success(f"✅ API InfoDengue: {len(df)} semanas")
+
+            return df
+
+        except CircuitOpenError:
+            logger.info("🔌 API InfoDengue indisponível (breaker aberto)")
+            return None
         except httpx.TimeoutException:
             logger.warning(f"⏱️ Timeout na API InfoDengue")
             return None
@@ -275,6 +356,28 @@ class DataService:
             logger.warning(f"⚠️ Erro inesperado na API: {e}")
             return None
     
+    @staticmethod
+    async def _read_latest_rows(response: httpx.Response, weeks: int) -> List[Dict[str, Any]]:
+        """
+        Lê a resposta em streaming e guarda só as ``weeks`` semanas mais
+        recentes, apenas com as colunas usadas (API_COLUMNS).
+
+        O buffer é limitado: um heap de ``weeks`` linhas, independente do
+        tamanho da resposta.
+        """
+        newest: List[Tuple[int, int, Dict[str, Any]]] = []
+
+        async for index, row in _aenumerate(iter_json_array(response.aiter_bytes())):
+            if not isinstance(row, dict) or row.get("data_iniSE") is None:
+                continue
+            entry = (row["data_iniSE"], index, {col: row.get(col) for col in API_COLUMNS})
+            if len(newest) < weeks:
+                heapq.heappush(newest, entry)
+            elif entry[0] > newest[0][0]:
+                heapq.heapreplace(newest, entry)
+
+        return [row for _, _, row in newest]
+
     def _get_from_csv(
         self,
         geocode: str,
@@ -338,8 +441,9 @@ class DataService:
         
         Ordem de tentativa:
         1. Cache Redis
-        2. API InfoDengue
-        3. CSV Local (fallback)
+        2. InfoDengue store local (ingestão em lote, se atualizado)
+        3. API InfoDengue
+        4. CSV Local (fallback)
         
         Args:
             geocode: Código IBGE do município (7 dígitos)
@@ -361,28 +465,62 @@ class DataService:
         # 1. Tenta cache
         cached_data = await self._get_from_cache(cache_key)
         if cached_data is not None:
-            logger.info(f"📦 Dados do cache: {geocode}")
+            logger.debug(f"📦 Dados do cache: {geocode}")
             return cached_data
         
-        # 2. Tenta API InfoDengue
+        # 2. Tenta o store local preenchido pelo InfoDenguePrefetcher
+        stored_data = infodengue_store.get_city(geocode, weeks)
+        if stored_data is not None:
+            logger.debug(f"🗄️  Dados do InfoDengue store: {geocode}")
+            return stored_data
+
+        # 3. Tenta API InfoDengue
         api_data = await self._fetch_from_api(geocode, weeks)
         if api_data is not None and len(api_data) >= weeks:
-            await self._set_cache(cache_key, api_data)
+            # Expira na próxima publicação semanal do InfoDengue
+            ttl = ttl_policy.series_ttl(api_data["data_iniSE"].max())
+            await self._set_cache(cache_key, api_data, ttl)
             logger.info(f"🌐 Dados da API: {geocode}")
             return api_data
         
-        # 3. Fallback para CSV
+        # 4. Fallback para CSV
         logger.info(f"💾 Usando CSV como fallback: {geocode}")
         csv_data = self._get_from_csv(geocode, weeks)
         
-        await self._set_cache(cache_key, csv_data)
+        await self._set_cache(cache_key, csv_data, CSV_FALLBACK_TTL)
         
         return csv_data
     
+    async def get_series(self, geocode: str, weeks: int) -> HistoricalSeries:
+        """
+        Busca a série na janela máxima necessária, uma única vez.
+        
+        Args:
+            geocode: Código IBGE do município (7 dígitos)
+            weeks: Maior janela usada pelo chamador (ex: 12 do gráfico)
+        
+        Returns:
+            HistoricalSeries com nome da cidade e as ``weeks`` semanas
+        
+        Raises:
+            GeocodeNotFoundError: Se geocode inválido
+            DataNotFoundError: Se não houver dados
+        
+        Example:
+            >>> series = await data_service.get_series("4106902", weeks=12)
+            >>> chart, model_input = series.last(12), series.last(4)
+        """
+        city_name = await self.get_city_name(geocode)
+        frame = await self.get_historical_data(geocode, weeks=weeks)
+        return HistoricalSeries(geocode, city_name, frame)
+    
     async def get_city_name(self, geocode: str) -> str:
         """
         Obtém nome da cidade pelo geocode.
         
+        Usa o índice do CitiesService (O(1)); o CSV só é varrido para
+        geocodes fora do índice.
+        
         Args:
             geocode: Código IBGE (deve começar com 41 - Paraná)
         
@@ -392,6 +530,10 @@ class DataService:
         Raises:
             GeocodeNotFoundError: Se não encontrar município do Paraná
         """
+        city = cities_service.get_city_by_ibge(geocode)
+        if city and city.get("nome"):
+            return city["nome"]
+        
         try:
             df = self._load_dataset()
             
@@ -425,10 +567,13 @@ class DataService:
             ) from e
     
     async def close(self) -> None:
-        """Fecha conexões (cleanup)."""
-        if self.redis_client:
-            await self.redis_client.close()
-            logger.info("Redis desconectado")
+        """
+        Cleanup do serviço.
+        
+        A conexão Redis pertence ao CacheService e é fechada no
+        shutdown da aplicação (lifespan), não aqui.
+        """
+        self.cache = None
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -449,7 +594,7 @@ def get_data_service() -> DataService:
     global _data_service_instance
     
     if _data_service_instance is None:
-        # TODO: Pegar redis_url do config
-        _data_service_instance = DataService(redis_url=None)
+        # Reutiliza a conexão Redis do CacheService (aberta no lifespan)
+        _data_service_instance = DataService(cache=cache_service)
     
     return _data_service_instance
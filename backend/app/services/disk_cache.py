@@ -0,0 +1,258 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+DISK CACHE - CAMADA LOCAL PERSISTENTE (SQLITE)
+════════════════════════════════════════════════════════════════════════════
+
+Cache em disco usado pelo CacheService quando o Redis está indisponível.
+
+Sem essa camada, uma queda do Redis desliga o cache inteiro: toda
+requisição vai ao InfoDengue/OpenWeather e o limite do free tier do
+OpenWeather (60 chamadas/min) estoura em minutos.
+
+Features:
+    - Mesma semântica do Redis: get/set/mget/delete/ttl com expiração
+    - SQLite embutido (stdlib), arquivo no diretório gravável do container
+    - Recebe cópia das gravações com o Redis no ar (write-through), então
+      uma queda já encontra o cache local aquecido
+    - Entradas gravadas durante a queda ficam marcadas (dirty) e são
+      reenviadas ao Redis quando ele volta (resync)
+    - Tamanho limitado (CACHE_DISK_MAX_MB): remove as mais antigas
+
+As operações de I/O rodam em thread (asyncio.to_thread) para não
+bloquear o event loop.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.logger import logger
+
+# Limpa entradas expiradas a cada N gravações
+PURGE_EVERY_WRITES = 200
+
+
+class DiskCache:
+    """
+    Cache chave/valor binário com TTL sobre SQLite.
+
+    Attributes:
+        path: Caminho do arquivo SQLite
+        max_bytes: Tamanho máximo aproximado dos valores armazenados
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        """
+        Inicializa o cache (arquivo aberto sob demanda).
+
+        Args:
+            path: Caminho do arquivo SQLite
+            max_bytes: Tamanho máximo dos valores (bytes)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    # ════════════════════════════════════════════════════════════════════════
+    # CONEXÃO
+    # ════════════════════════════════════════════════════════════════════════
+
+    def _connection(self) -> sqlite3.Connection:
+        """Abre (uma vez) a conexão SQLite e cria o schema."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    dirty INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_dirty ON cache (dirty)")
+            conn.commit()
+            self._conn = conn
+            logger.info(f"💽 Disk cache aberto: {self.path}")
+        return self._conn
+
+    def close(self) -> None:
+        """Fecha o arquivo SQLite."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ════════════════════════════════════════════════════════════════════════
+    # OPERAÇÕES SÍNCRONAS (executadas em thread)
+    # ════════════════════════════════════════════════════════════════════════
+
+    def _get_many_sync(self, keys: List[str]) -> List[Optional[bytes]]:
+        now = time.time()
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT key, value FROM cache WHERE expires_at > ? "
+                f"AND key IN ({','.join('?' * len(keys))})",
+                [now, *keys],
+            ).fetchall()
+        found = dict(rows)
+        return [found.get(key) for key in keys]
+
+    def _set_many_sync(self, items: Dict[str, Tuple[bytes, int]], dirty: bool) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, updated_at, dirty) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (key, value, now + ttl, now, int(dirty))
+                    for key, (value, ttl) in items.items()
+                ],
+            )
+            conn.commit()
+
+            self._writes += len(items)
+            if self._writes >= PURGE_EVERY_WRITES:
+                self._writes = 0
+                self._purge_locked(conn, now)
+
+    def _purge_locked(self, conn: sqlite3.Connection, now: float) -> None:
+        """Remove expirados e, se acima do limite, as entradas mais antigas."""
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+        total = conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache").fetchone()[0]
+        if total > self.max_bytes:
+            # Remove ~25% das entradas menos recentes
+            count = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY updated_at LIMIT ?)",
+                (max(1, count // 4),),
+            )
+            logger.warning(f"💽 Disk cache acima do limite ({total} bytes) - entradas antigas removidas")
+
+        conn.commit()
+
+    def _delete_sync(self, key: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            conn.commit()
+
+    def _ttl_sync(self, key: str) -> int:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return -2  # Mesma convenção do Redis: chave inexistente
+        remaining = int(row[0] - time.time())
+        return remaining if remaining > 0 else -2
+
+    def _expire_many_sync(self, items: Dict[str, int]) -> List[bool]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            found = [
+                conn.execute(
+                    "UPDATE cache SET expires_at = ? WHERE key = ? AND expires_at > ?",
+                    (now + ttl, key, now),
+                ).rowcount
+                > 0
+                for key, ttl in items.items()
+            ]
+            conn.commit()
+        return found
+
+    def _dirty_items_sync(self, limit: int) -> List[Tuple[str, bytes, int]]:
+        now = time.time()
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT key, value, expires_at FROM cache "
+                "WHERE dirty = 1 AND expires_at > ? LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        return [(key, value, max(1, int(expires_at - now))) for key, value, expires_at in rows]
+
+    def _mark_clean_sync(self, keys: List[str]) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("UPDATE cache SET dirty = 0 WHERE key = ?", [(k,) for k in keys])
+            conn.commit()
+
+    def _stats_sync(self) -> Dict:
+        now = time.time()
+        with self._lock:
+            entries, size, dirty = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0), COALESCE(SUM(dirty), 0) "
+                "FROM cache WHERE expires_at > ?",
+                (now,),
+            ).fetchone()
+        return {"entries": entries, "bytes": size, "pending_resync": dirty}
+
+    # ════════════════════════════════════════════════════════════════════════
+    # API ASSÍNCRONA
+    # ════════════════════════════════════════════════════════════════════════
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Busca valor (None se ausente ou expirado)."""
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Busca vários valores, na ordem das chaves."""
+        if not keys:
+            return []
+        return await asyncio.to_thread(self._get_many_sync, keys)
+
+    async def set(self, key: str, value: bytes, ttl: int, dirty: bool = True) -> None:
+        """Salva valor com TTL (dirty=True: reenviar ao Redis no resync)."""
+        await self.set_many({key: (value, ttl)}, dirty=dirty)
+
+    async def set_many(
+        self, items: Dict[str, Tuple[bytes, int]], dirty: bool = True
+    ) -> None:
+        """Salva vários valores, cada um com seu TTL."""
+        if items:
+            await asyncio.to_thread(self._set_many_sync, items, dirty)
+
+    async def delete(self, key: str) -> None:
+        """Remove valor."""
+        await asyncio.to_thread(self._delete_sync, key)
+
+    async def ttl(self, key: str) -> int:
+        """Segundos restantes (-2 se ausente), como o TTL do Redis."""
+        return await asyncio.to_thread(self._ttl_sync, key)
+
+    async def expire_many(self, items: Dict[str, int]) -> List[bool]:
+        """Renova o TTL de chaves existentes (True para as encontradas)."""
+        if not items:
+            return []
+        return await asyncio.to_thread(self._expire_many_sync, items)
+
+    async def dirty_items(self, limit: int = 500) -> List[Tuple[str, bytes, int]]:
+        """Entradas gravadas durante a queda do Redis: (chave, valor, ttl restante)."""
+        return await asyncio.to_thread(self._dirty_items_sync, limit)
+
+    async def mark_clean(self, keys: List[str]) -> None:
+        """Marca entradas como já sincronizadas com o Redis."""
+        if keys:
+            await asyncio.to_thread(self._mark_clean_sync, keys)
+
+    async def stats(self) -> Dict:
+        """Entradas válidas, bytes e pendências de resync."""
+        return await asyncio.to_thread(self._stats_sync)
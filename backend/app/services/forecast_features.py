@@ -0,0 +1,107 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+FORECAST FEATURES - PREVISÃO DO OPENWEATHER COMO FEATURES CLIMÁTICAS
+════════════════════════════════════════════════════════════════════════════
+
+As predições multi-semana são recursivas: cada semana prevista vira uma
+nova linha da janela do modelo. Antes, essa linha copiava o clima da
+última semana observada. Aqui a previsão de 5 dias do OpenWeather (em
+cache por célula do Smart Grid) é agregada por semana epidemiológica nas
+mesmas features climáticas do modelo (ml_service.REQUIRED_FEATURES):
+
+    tempmin / tempmed / tempmax   temperatura dos pontos da semana (°C)
+    umidmin / umidmed / umidmax   umidade relativa dos pontos (%)
+
+A agregação é vetorizada (pandas groupby sobre os ~40 pontos de 3h).
+Semanas sem previsão continuam copiando o clima da última linha.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from app.core.epiweek import dates_to_epiweek_ids
+from app.core.logger import logger
+from app.services.cities_service import cities_service
+from app.services.weather_grid import weather_grid
+from app.services.weather_service import weather_service
+
+# Colunas climáticas do modelo preenchidas pela previsão
+CLIMATE_FEATURES = ["tempmed", "tempmin", "tempmax", "umidmed", "umidmin", "umidmax"]
+
+# Os horários da previsão vêm em UTC; a semana epidemiológica é local
+LOCAL_TIMEZONE = "America/Sao_Paulo"
+
+
+def aggregate_by_epiweek(forecasts: List[Dict]) -> pd.DataFrame:
+    """
+    Agrega os pontos de 3h da previsão por semana epidemiológica.
+
+    Args:
+        forecasts: Saída de WeatherService.get_forecast_5_days
+
+    Returns:
+        pd.DataFrame: Índice = id da SE (YYYYWW, int),
+                      colunas = CLIMATE_FEATURES (vazio se não houver pontos)
+    """
+    if not forecasts:
+        return pd.DataFrame(columns=CLIMATE_FEATURES)
+
+    points = pd.DataFrame.from_records(forecasts)
+    local = (
+        pd.to_datetime(points["timestamp"], unit="s", utc=True)
+        .dt.tz_convert(LOCAL_TIMEZONE)
+        .dt.tz_localize(None)
+    )
+    points["SE"] = dates_to_epiweek_ids(local)
+
+    # Pontos antigos no cache não têm min/max por ponto: usa a temperatura
+    if "temperatura_min" not in points:
+        points["temperatura_min"] = points["temperatura"]
+    if "temperatura_max" not in points:
+        points["temperatura_max"] = points["temperatura"]
+
+    weekly = points.groupby("SE").agg(
+        tempmed=("temperatura", "mean"),
+        tempmin=("temperatura_min", "min"),
+        tempmax=("temperatura_max", "max"),
+        umidmed=("umidade", "mean"),
+        umidmin=("umidade", "min"),
+        umidmax=("umidade", "max"),
+    )
+    return weekly[CLIMATE_FEATURES]
+
+
+async def get_city_forecast_features(geocode: str) -> Optional[pd.DataFrame]:
+    """
+    Features climáticas semanais previstas para o município.
+
+    A previsão vem do cache da célula do grid (uma chamada ao OpenWeather
+    por célula a cada FORECAST_TTL, não por predição).
+
+    Args:
+        geocode: Código IBGE
+
+    Returns:
+        pd.DataFrame: Ver aggregate_by_epiweek (None se não houver previsão)
+    """
+    city = cities_service.get_city_by_ibge(geocode)
+    if not city or city.get("latitude") is None or city.get("longitude") is None:
+        return None
+
+    try:
+        forecasts = await weather_service.get_forecast_5_days(
+            city["latitude"],
+            city["longitude"],
+            grid_key=weather_grid.cell_for_city(geocode),
+        )
+        weekly = aggregate_by_epiweek(forecasts)
+    except Exception as e:
+        logger.warning(f"⚠️  Previsão climática indisponível para {geocode}: {e}")
+        return None
+
+    return weekly if not weekly.empty else None
@@ -0,0 +1,243 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+INFODENGUE PREFETCHER - INGESTÃO EM LOTE DE TODOS OS MUNICÍPIOS
+════════════════════════════════════════════════════════════════════════════
+
+Sem este job, o InfoDengue é consultado sob demanda, cidade a cidade, e o
+primeiro acesso paga segundos de latência. O prefetcher busca o
+``alertcity`` de todos os geocodes de ``cidades_parana.json`` logo após
+cada publicação semanal e normaliza o resultado em:
+
+    1. InfoDengueStore - tabela colunar local (todas as colunas, N semanas),
+       lida pelo DataService nas predições
+    2. Cache segmentado do InfoDengueService - janela do dashboard no Redis
+
+Assim as requisições de usuários quase nunca chamam o InfoDengue de forma
+síncrona.
+
+Limites:
+    - Concorrência limitada (INFODENGUE_PREFETCH_CONCURRENCY)
+    - Taxa máxima de disparos (INFODENGUE_PREFETCH_RPS)
+    - Retry com backoff exponencial + jitter (RetryPolicy própria do lote:
+      mais tentativas e prazo maior, sem hedging)
+    - Só busca cidades ainda não ingeridas desde a última publicação
+    - Buscas condicionais: se a resposta não mudou (304 ou mesmo hash),
+      não faz parse nem regrava; só renova os TTLs. O início do intervalo
+      é ancorado em blocos fixos (PREFETCH_ANCHOR_WEEKS), para que a mesma
+      busca se repita entre execuções e os validadores continuem valendo
+    - Cidade com semana nova: o dashboard em cache é invalidado
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+from datetime import date
+from typing import Dict, Optional
+
+from app.core import ttl_policy
+from app.core.conditional_fetch import NOT_MODIFIED
+from app.core.config import settings
+from app.core.epiweek import anchored_epiweek, last_epiweeks
+from app.core.logger import logger
+from app.core.rate_limiter import set_background_priority
+from app.core.retry_policy import RetryPolicy
+from app.services.cities_service import cities_service
+from app.services.dashboard_service import DASHBOARD_HISTORY_WEEKS, invalidate_dashboard
+from app.services.infodengue_service import infodengue_service
+from app.services.infodengue_store import infodengue_store
+
+# Se algumas cidades falharem, tenta de novo antes da próxima publicação
+RETRY_FAILED_AFTER = 1800  # 30 min
+
+# Início da janela muda só a cada N semanas (busca até N-1 semanas a mais)
+PREFETCH_ANCHOR_WEEKS = 13
+
+
+class InfoDenguePrefetcher:
+    """
+    Tarefa de background que ingere as séries de todas as cidades.
+
+    Attributes:
+        last_run: Estatísticas da última execução (exibidas no /health)
+    """
+
+    def __init__(self):
+        """Inicializa o prefetcher (tarefa criada no start())."""
+        self._task: Optional[asyncio.Task] = None
+        self._rate_lock = asyncio.Lock()
+        self._next_slot = 0.0
+        # Lote não tem usuário esperando: backoff mais longo e sem hedge
+        self.retry_policy = RetryPolicy(
+            "infodengue",
+            max_retries=settings.infodengue_prefetch_retries,
+            deadline=120.0,
+            base_delay=2.0,
+            max_delay=30.0,
+            hedge=False,
+        )
+        self.last_run: Optional[Dict] = None
+
+    def start(self) -> None:
+        """Agenda o prefetcher em background (não bloqueia o startup)."""
+        if not settings.infodengue_prefetch_enabled:
+            logger.info("🗄️  InfoDengue prefetch desabilitado (INFODENGUE_PREFETCH_ENABLED=false)")
+            return
+
+        if self._task and not self._task.done():
+            return
+
+        self._task = asyncio.create_task(self._run_forever(), name="infodengue-prefetch")
+        logger.info("🗄️  InfoDengue prefetch agendado (após cada publicação semanal)")
+
+    async def stop(self) -> None:
+        """Cancela a tarefa de background."""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("🗄️  InfoDengue prefetch parado")
+
+    async def _run_forever(self) -> None:
+        """Ingere no startup (se necessário) e após cada publicação."""
+        set_background_priority()
+        infodengue_store.load()
+
+        while True:
+            stats: Dict = {}
+            try:
+                stats = await self.prefetch_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Erro no InfoDengue prefetch: {e}")
+
+            delay = ttl_policy.seconds_until_next_publication()
+            if stats.get("failed"):
+                delay = min(delay, RETRY_FAILED_AFTER)
+            await asyncio.sleep(delay)
+
+    async def prefetch_all(self) -> Dict:
+        """
+        Busca e normaliza a série de cada cidade ainda não atualizada.
+
+        Returns:
+            Dict: Estatísticas do ciclo
+        """
+        cities = [
+            city
+            for city in cities_service.cities_data
+            if not infodengue_store.is_fresh(city["ibge_codigo"])
+        ]
+        if not cities:
+            logger.debug("🗄️  InfoDengue store já atualizado - nada a buscar")
+            return {}
+
+        started = time.perf_counter()
+        window = last_epiweeks(date.today(), settings.infodengue_prefetch_weeks)
+        first_week = anchored_epiweek(window[-1], PREFETCH_ANCHOR_WEEKS)
+        stats = {
+            "cities": len(cities),
+            "ok": 0,
+            "not_modified": 0,
+            "failed": 0,
+            "rows": 0,
+            "invalidated": 0,
+        }
+
+        semaphore = asyncio.Semaphore(settings.infodengue_prefetch_concurrency)
+
+        async def run(city: Dict) -> None:
+            async with semaphore:
+                try:
+                    await self._prefetch_city(city, first_week, window[0], stats)
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.warning(f"⚠️  Prefetch falhou para {city['ibge_codigo']}: {e}")
+
+        logger.info(f"🗄️  InfoDengue prefetch: {len(cities)} cidades ({len(window)} semanas)")
+        await asyncio.gather(*(run(city) for city in cities))
+
+        await infodengue_store.save()
+
+        stats["duration_s"] = round(time.perf_counter() - started, 1)
+        stats["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.last_run = stats
+
+        logger.success(f"🗄️  InfoDengue prefetch concluído: {stats}")
+        return stats
+
+    async def _prefetch_city(
+        self, city: Dict, first_week: date, last_week: date, stats: Dict
+    ) -> None:
+        """Busca (com retry) e grava a série de uma cidade."""
+        geocode = city["ibge_codigo"]
+
+        await self._throttle()
+        rows, _ = await infodengue_service.fetch_raw_weeks(
+            geocode,
+            first_week,
+            last_week,
+            retry_policy=self.retry_policy,
+            conditional=True,
+        )
+
+        if rows is None:
+            stats["failed"] += 1
+            return
+
+        if rows is NOT_MODIFIED and infodengue_store.touch(geocode):
+            # Nada mudou: só renova a cabeça em cache (regrava se expirou)
+            if not await infodengue_service.extend_series(
+                geocode, infodengue_store.latest_week(geocode)
+            ):
+                await infodengue_service.ingest(
+                    geocode, infodengue_store.raw_rows(geocode), DASHBOARD_HISTORY_WEEKS
+                )
+            stats["not_modified"] += 1
+            stats["ok"] += 1
+            return
+        if rows is NOT_MODIFIED:
+            # Validadores sem a série na tabela (ex: arquivo apagado): rebusca
+            rows, _ = await infodengue_service.fetch_raw_weeks(
+                geocode, first_week, last_week, retry_policy=self.retry_policy
+            )
+            if rows is None:
+                stats["failed"] += 1
+                return
+
+        previous_week = infodengue_store.latest_week(geocode)
+        stats["rows"] += infodengue_store.upsert(geocode, city.get("nome", ""), rows)
+        await infodengue_service.ingest(geocode, rows, DASHBOARD_HISTORY_WEEKS)
+        stats["ok"] += 1
+
+        # Nova semana epidemiológica: o painel em cache ficou desatualizado
+        if infodengue_store.latest_week(geocode) != previous_week:
+            await invalidate_dashboard(geocode)
+            stats["invalidated"] += 1
+
+    async def _throttle(self) -> None:
+        """Espaça os disparos em INFODENGUE_PREFETCH_RPS requisições/segundo."""
+        interval = 1.0 / max(settings.infodengue_prefetch_rps, 0.01)
+
+        async with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + interval
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# SINGLETON INSTANCE
+# ════════════════════════════════════════════════════════════════════════════
+
+infodengue_prefetcher = InfoDenguePrefetcher()
@@ -9,7 +9,11 @@ Features:
     - Dados semanais de casos de dengue por município
     - Níveis de alerta (verde, amarelo, laranja, vermelho)
     - Incidência por 100 mil habitantes
-    - Cache inteligente (24h TTL)
+    - Cache segmentado por semana (semanas fechadas imutáveis + cabeça mutável)
+    - Cache negativo de falhas (timeout/5xx/429): fallback imediato até o
+      retry-after, sem esperar o timeout de novo
+    - Buscas condicionais (ETag/Last-Modified/hash do corpo) no lote e na
+      revalidação da cabeça: resposta igual só renova os TTLs
     - Graceful degradation (fallback para dados estimados)
 
 API Docs:
@@ -24,13 +28,33 @@ Data: 2025-12-23
 ════════════════════════════════════════════════════════════════════════════
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple, Union
 
 import httpx
-
+import numpy as np
+
+from app.core import ttl_policy
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.conditional_fetch import (
+    NOT_MODIFIED,
+    NotModified,
+    check_response,
+    conditional_headers,
+)
 from app.core.config import settings
+from app.core.epiweek import (
+    date_to_epiweek,
+    dates_to_epiweek_ids,
+    epiweek_id,
+    epiweek_start,
+    last_epiweeks,
+)
+from app.core.http_clients import http_clients
 from app.core.logger import logger
+from app.core.metrics import metrics
+from app.core.retry_policy import RetryPolicy
 
 
 class InfoDengueService:
@@ -45,7 +69,11 @@ class InfoDengueService:
         """Inicializa o serviço."""
         self.base_url = settings.infodengue_base_url
         self.timeout = 15  # segundos (API pode ser lenta)
-        self.max_retries = 2
+        self.retry_policy = RetryPolicy(
+            "infodengue",
+            max_retries=settings.infodengue_max_retries,
+            deadline=settings.infodengue_retry_deadline,
+        )
 
     async def get_historical_data(
         self,
@@ -56,16 +84,23 @@ class InfoDengueService:
         """
         Busca dados históricos de dengue das últimas N semanas.
 
+        Cache segmentado: cada cidade tem UMA série canônica no Redis,
+        guardada como segmentos imutáveis por semana epidemiológica
+        (``infodengue:week:{ibge}:{YYYYWW}``) mais uma cabeça mutável
+        (``infodengue:head:{ibge}``) com a semana atual e a última semana
+        publicada. Qualquer ``weeks=N`` é servido fatiando a mesma série,
+        e o upstream só é consultado para as semanas que faltam.
+
         Args:
             ibge_code: Código IBGE de 7 dígitos (ex: "3550308" para São Paulo)
             weeks: Número de semanas para buscar (padrão: 5)
             use_cache: Se True, tenta buscar do cache Redis primeiro
 
         Returns:
-            List[Dict]: Lista de dados semanais
+            List[Dict]: Lista de dados semanais (mais recente primeiro)
                 [
                     {
-                        "data": "2025-12-15",  # Segunda-feira da semana epidemiológica
+                        "data": "2025-12-14",  # Domingo de início da semana epidemiológica
                         "casos": 142,           # Casos notificados
                         "nivel_alerta": 2,      # 1=verde, 2=amarelo, 3=laranja, 4=vermelho
                         "incidencia": 12.5,     # Por 100 mil habitantes
@@ -74,46 +109,507 @@ class InfoDengueService:
                     },
                     ...
                 ]
-
-        Raises:
-            httpx.HTTPError: Se API falhar após retries
         """
-        cache_key = f"infodengue:historical:{ibge_code}:{weeks}"
+        # ════════════════════════════════════════════════════════════════════
+        # STEP 1: JANELA DE SEMANAS EPIDEMIOLÓGICAS
+        # ════════════════════════════════════════════════════════════════════
+
+        target_weeks = last_epiweeks(date.today(), weeks)
+        current_week = target_weeks[0]
 
         # ════════════════════════════════════════════════════════════════════
-        # STEP 1: VERIFICA CACHE
+        # STEP 2: LÊ A SÉRIE SEGMENTADA DO CACHE
         # ════════════════════════════════════════════════════════════════════
-        
+
+        segments: Dict[date, Dict] = {}
+        head: Optional[Dict] = None
+        head_fresh = False
+        failure: Optional[Dict] = None
+
         if use_cache:
-            from app.services.cache_service import cache_service
-            cached_data = await cache_service.get(cache_key)
-            if cached_data:
-                logger.info(f"✓ InfoDengue cache hit para {ibge_code}")
-                return cached_data
+            segments, head, head_fresh, failure = await self._read_series(
+                ibge_code, target_weeks
+            )
+
+        missing = self._missing_weeks(target_weeks, segments, head, head_fresh)
+
+        if not missing:
+            logger.debug(f"✓ InfoDengue cache hit para {ibge_code} ({weeks} semanas)")
+            return self._compose_window(target_weeks, segments)
+
+        metrics.incr("infodengue_upstream_requests_total")
+
+        # Falha recente registrada: não espera o timeout de novo
+        if failure:
+            metrics.incr(
+                "infodengue_negative_cache_hits_total",
+                error_class=failure.get("error_class", "unexpected"),
+            )
+            logger.info(
+                f"⏭️  InfoDengue em cache negativo para {ibge_code} "
+                f"({failure.get('error_class')}, retry após {failure.get('retry_after')})"
+            )
+            return self._compose_window(target_weeks, segments)
 
         # ════════════════════════════════════════════════════════════════════
-        # STEP 2: CALCULA SEMANAS EPIDEMIOLÓGICAS
+        # STEP 3: BUSCA SOMENTE AS SEMANAS FALTANTES
         # ════════════════════════════════════════════════════════════════════
 
-        # Semana epidemiológica: domingo a sábado
-        # Primeira semana do ano: aquela que contém 1º de janeiro
-        today = datetime.now()
-        current_epiweek = self._get_epiweek(today)
-        current_year = today.year
+        first_week, last_week = min(missing), max(missing)
+        refresh_head = last_week >= current_week
+        if refresh_head:
+            # A semana atual quase nunca está publicada: a busca da cabeça
+            # inclui a última semana publicada para conhecer latest_week
+            first_week = min(first_week, ttl_policy.expected_latest_week())
+
+        # Cabeça vencida e só faltam semanas que não estavam publicadas:
+        # revalida a partir da última semana conhecida (intervalo estável
+        # entre as retentativas) com busca condicional
+        revalidate_from = (
+            self._revalidation_start(head, missing, segments) if use_cache else None
+        )
+        if revalidate_from is not None:
+            first_week = revalidate_from
+
+        fetched, failure = await self._fetch_weeks(
+            ibge_code, first_week, last_week, conditional=revalidate_from is not None
+        )
+
+        if fetched is NOT_MODIFIED:
+            await self.extend_series(ibge_code, revalidate_from)
+            logger.debug(f"✓ InfoDengue não modificado para {ibge_code} (cabeça renovada)")
+            return self._compose_window(target_weeks, segments)
+
+        if fetched is None:
+            # Breaker aberto já falha rápido - não precisa de entrada negativa
+            if use_cache and failure and failure["error_class"] != "circuit_open":
+                await self._store_failure(ibge_code, failure)
+            logger.warning(f"⚠️ Usando fallback para {ibge_code}")
+            return self._compose_window(target_weeks, segments)
 
-        # Busca das últimas N semanas
-        start_epiweek = max(1, current_epiweek - weeks + 1)
-        start_year = current_year
+        if not fetched:
+            logger.warning(f"⚠️ InfoDengue retornou vazio para {ibge_code}")
 
-        # Se passou do ano anterior
-        if start_epiweek <= 0:
-            start_year = current_year - 1
-            start_epiweek = 52 + start_epiweek  # Ex: -2 -> 50
+        rows_by_week = {self._week_of(row): row for row in fetched}
+        segments.update(rows_by_week)
 
         # ════════════════════════════════════════════════════════════════════
-        # STEP 3: CHAMA API INFODENGUE
+        # STEP 4: SALVA SEGMENTOS (IMUTÁVEIS) E CABEÇA (MUTÁVEL)
         # ════════════════════════════════════════════════════════════════════
 
+        if use_cache:
+            await self._write_series(
+                ibge_code,
+                rows_by_week,
+                current_week,
+                refresh_head=refresh_head,
+                previous_head=head,
+            )
+
+        logger.success(
+            f"✓ InfoDengue: {len(fetched)} semanas para {ibge_code} "
+            f"({len(missing)} faltantes na janela de {weeks})"
+        )
+
+        return self._compose_window(target_weeks, segments)
+
+    # ════════════════════════════════════════════════════════════════════════
+    # SÉRIE SEGMENTADA (CACHE)
+    # ════════════════════════════════════════════════════════════════════════
+
+    @staticmethod
+    def _segment_key(ibge_code: str, week: date) -> str:
+        """Chave do segmento imutável de uma semana."""
+        return f"infodengue:week:{ibge_code}:{epiweek_id(week)}"
+
+    @staticmethod
+    def _head_key(ibge_code: str) -> str:
+        """Chave da cabeça mutável da série."""
+        return f"infodengue:head:{ibge_code}"
+
+    @staticmethod
+    def _fresh_key(ibge_code: str) -> str:
+        """Chave do marcador de cabeça conferida (vence antes da cabeça)."""
+        return f"infodengue:fresh:{ibge_code}"
+
+    @staticmethod
+    def _negative_key(ibge_code: str) -> str:
+        """Chave da falha recente do upstream (cache negativo)."""
+        return f"infodengue:neg:{ibge_code}"
+
+    @staticmethod
+    def _validators_key(ibge_code: str, first_week: date) -> str:
+        """
+        Chave dos validadores da última resposta a partir de uma semana.
+
+        Só o início entra na chave: o fim do intervalo (semana atual) anda
+        toda semana, e semanas ainda não publicadas não mudam o corpo.
+        """
+        return f"infodengue:validators:{ibge_code}:{epiweek_id(first_week)}"
+
+    @staticmethod
+    def _week_of(row: Dict) -> date:
+        """Domingo de início da semana de uma linha formatada."""
+        return epiweek_start(datetime.strptime(row["data"], "%Y-%m-%d").date())
+
+    async def _read_series(
+        self, ibge_code: str, target_weeks: List[date]
+    ) -> Tuple[Dict[date, Dict], Optional[Dict], bool, Optional[Dict]]:
+        """
+        Lê cabeça, marcador de cabeça conferida, segmentos da janela e a
+        falha recente (cache negativo) em uma única ida ao Redis (MGET).
+
+        Args:
+            ibge_code: Código IBGE
+            target_weeks: Semanas da janela (mais recente primeiro)
+
+        Returns:
+            Tuple: ({semana: linha}, cabeça ou None, cabeça ainda válida?,
+                   falha ou None)
+        """
+        from app.services.cache_service import cache_service
+
+        current_week = target_weeks[0]
+        past_weeks = [w for w in target_weeks if w < current_week]
+
+        keys = [
+            self._head_key(ibge_code),
+            self._fresh_key(ibge_code),
+            self._negative_key(ibge_code),
+        ] + [self._segment_key(ibge_code, w) for w in past_weeks]
+        values = await cache_service.get_many(keys)
+
+        head, fresh, failure = values[0], values[1], values[2]
+        segments = {
+            week: row for week, row in zip(past_weeks, values[3:]) if row is not None
+        }
+
+        # Cabeça vencida ainda serve as linhas até ser revalidada
+        if head:
+            for row in head.get("rows", []):
+                segments[self._week_of(row)] = row
+
+        return segments, head, head is not None and fresh is not None, failure
+
+    def _missing_weeks(
+        self,
+        target_weeks: List[date],
+        segments: Dict[date, Dict],
+        head: Optional[Dict],
+        head_fresh: bool,
+    ) -> List[date]:
+        """
+        Determina quais semanas precisam ser buscadas no upstream.
+
+        Com a cabeça válida, semanas posteriores à última publicada já
+        foram verificadas (ainda não existem no InfoDengue) e não geram
+        nova chamada. Sem cabeça (ou com ela vencida), a semana atual
+        sempre é reconsultada para renová-la. Cabeça sem nenhuma semana publicada conhecida
+        (latest_week None) só cobre a semana atual: as anteriores que
+        faltam continuam sendo buscadas.
+
+        Returns:
+            List[date]: Semanas faltantes (pode ser vazia)
+        """
+        missing = [w for w in target_weeks if w not in segments]
+
+        if head is None or not head_fresh:
+            current_week = target_weeks[0]
+            if current_week not in missing:
+                missing.append(current_week)
+            return missing
+
+        latest = head.get("latest_week")
+        if latest is None:
+            return [w for w in missing if w < target_weeks[0]]
+
+        latest_week = datetime.strptime(latest, "%Y-%m-%d").date()
+        return [w for w in missing if w <= latest_week]
+
+    @staticmethod
+    def _revalidation_start(
+        head: Optional[Dict], missing: List[date], segments: Dict[date, Dict]
+    ) -> Optional[date]:
+        """
+        Início da busca condicional que revalida uma cabeça vencida.
+
+        Só vale se nenhuma semana já publicada se perdeu do cache: cada
+        semana faltante é posterior à última publicada conhecida ou está
+        na própria cabeça vencida. Aí uma resposta igual à anterior
+        significa "nada novo".
+
+        Returns:
+            date: Última semana publicada da cabeça, ou None (busca normal)
+        """
+        latest = head.get("latest_week") if head else None
+        if latest is None:
+            return None
+
+        latest_week = datetime.strptime(latest, "%Y-%m-%d").date()
+        if any(w <= latest_week and w not in segments for w in missing):
+            return None
+        return min(latest_week, min(missing))
+
+    async def _write_series(
+        self,
+        ibge_code: str,
+        rows_by_week: Dict[date, Dict],
+        current_week: date,
+        refresh_head: bool,
+        previous_head: Optional[Dict] = None,
+    ) -> None:
+        """
+        Persiste semanas buscadas: completas como segmentos imutáveis,
+        a semana atual (parcial) na cabeça.
+
+        Args:
+            ibge_code: Código IBGE
+            rows_by_week: Linhas formatadas indexadas pela semana
+            current_week: Início da semana atual
+            refresh_head: Se a busca cobriu a semana atual (renova a cabeça)
+            previous_head: Cabeça anterior (mantém latest_week se a busca
+                           não trouxe nenhuma semana publicada)
+        """
+        from app.services.cache_service import cache_service
+
+        items = {
+            self._segment_key(ibge_code, week): (row, ttl_policy.epiweek_ttl(week))
+            for week, row in rows_by_week.items()
+            if week < current_week
+        }
+
+        if refresh_head:
+            latest_week = self._latest_week(list(rows_by_week.values()))
+            if latest_week is None and previous_head and previous_head.get("latest_week"):
+                latest_week = datetime.strptime(
+                    previous_head["latest_week"], "%Y-%m-%d"
+                ).date()
+            head = {
+                "latest_week": latest_week.isoformat() if latest_week else None,
+                "rows": [
+                    row for week, row in rows_by_week.items() if week >= current_week
+                ],
+            }
+            ttl = ttl_policy.series_ttl(latest_week)
+            # A cabeça dura mais que o marcador: vencida, é revalidada
+            # (busca condicional) em vez de rebaixada por inteiro
+            items[self._head_key(ibge_code)] = (head, ttl + ttl_policy.HEAD_REVALIDATE_TTL)
+            items[self._fresh_key(ibge_code)] = (self._fresh_marker(), ttl)
+
+        await cache_service.set_many(items)
+
+    async def _store_failure(self, ibge_code: str, failure: Dict) -> None:
+        """
+        Grava a falha do upstream como entrada negativa de vida curta.
+
+        Enquanto ela existir, get_historical_data vai direto ao fallback
+        (semanas em cache + estimativa) sem chamar o InfoDengue.
+
+        Args:
+            ibge_code: Código IBGE
+            failure: {"error_class", "status_code", "retry_after_s"}
+        """
+        from app.services.cache_service import cache_service
+
+        ttl = ttl_policy.negative_ttl(failure["error_class"], failure.get("retry_after_s"))
+        entry = {
+            "error_class": failure["error_class"],
+            "status_code": failure.get("status_code"),
+            "failed_at": datetime.now().isoformat(timespec="seconds"),
+            "retry_after": (datetime.now() + timedelta(seconds=ttl)).isoformat(
+                timespec="seconds"
+            ),
+        }
+
+        metrics.incr(
+            "infodengue_negative_cache_stores_total", error_class=failure["error_class"]
+        )
+        await cache_service.set(self._negative_key(ibge_code), entry, ttl=ttl)
+
+    def negative_cache_stats(self) -> Dict:
+        """
+        Resumo do cache negativo (exibido no /health).
+
+        Returns:
+            Dict: Chamadas que precisaram do upstream, quantas foram
+                  atendidas pelo cache negativo e a taxa correspondente
+        """
+        requests = metrics.value("infodengue_upstream_requests_total")
+        hits = metrics.value("infodengue_negative_cache_hits_total")
+        return {
+            "upstream_requests": int(requests),
+            "negative_hits": int(hits),
+            "negative_rate": round(hits / requests, 3) if requests else 0.0,
+            "failures": {
+                label.split("=", 1)[1]: int(count)
+                for label, count in (
+                    metrics.snapshot()
+                    .get("infodengue_negative_cache_stores_total", {})
+                    .items()
+                )
+            },
+        }
+
+    async def ingest(self, ibge_code: str, raw_rows: List[Dict], weeks: int) -> int:
+        """
+        Grava no cache segmentado a janela das últimas ``weeks`` semanas
+        a partir de linhas brutas já buscadas (ingestão em lote).
+
+        A busca em lote cobre a semana atual, então a cabeça é renovada.
+
+        Args:
+            ibge_code: Código IBGE
+            raw_rows: Linhas brutas da API (fetch_raw_weeks)
+            weeks: Tamanho da janela a manter no Redis
+
+        Returns:
+            int: Semanas gravadas
+        """
+        target_weeks = last_epiweeks(date.today(), weeks)
+        oldest = target_weeks[-1]
+
+        rows_by_week = {
+            week: row
+            for week, row in (
+                (self._week_of(row), row) for row in self._parse_infodengue_response(raw_rows)
+            )
+            if week >= oldest
+        }
+
+        await self._write_series(
+            ibge_code, rows_by_week, target_weeks[0], refresh_head=True
+        )
+        return len(rows_by_week)
+
+    async def extend_series(self, ibge_code: str, latest_week: Optional[date]) -> bool:
+        """
+        Renova o TTL da cabeça da série sem regravá-la (upstream não mudou).
+
+        Os segmentos de semanas fechadas já são imutáveis (TTL longo).
+        Só o marcador de cabeça conferida é regravado.
+
+        Returns:
+            bool: False se a cabeça não estava mais em cache
+        """
+        from app.services.cache_service import cache_service
+
+        ttl = ttl_policy.series_ttl(latest_week)
+        found = await cache_service.expire_many(
+            {self._head_key(ibge_code): ttl + ttl_policy.HEAD_REVALIDATE_TTL}
+        )
+        if not (found and found[0]):
+            return False
+
+        await cache_service.set(self._fresh_key(ibge_code), self._fresh_marker(), ttl=ttl)
+        return True
+
+    @staticmethod
+    def _fresh_marker() -> Dict:
+        """Valor do marcador de cabeça conferida."""
+        return {"checked_at": datetime.now().isoformat(timespec="seconds")}
+
+    async def get_cached_window(self, ibge_code: str, weeks: int) -> List[Dict]:
+        """
+        Janela das últimas ``weeks`` semanas só com o que está em cache.
+
+        Não chama o upstream: semanas ausentes saem como estimativa (ver
+        _compose_window). Usado quando a busca normal estoura o prazo.
+
+        Args:
+            ibge_code: Código IBGE
+            weeks: Número de semanas
+
+        Returns:
+            List[Dict]: Dados semanais (mais recente primeiro)
+        """
+        target_weeks = last_epiweeks(date.today(), weeks)
+        try:
+            segments, _, _, _ = await self._read_series(ibge_code, target_weeks)
+        except Exception as e:
+            logger.warning(f"⚠️ Leitura do cache InfoDengue falhou para {ibge_code}: {e}")
+            segments = {}
+        return self._compose_window(target_weeks, segments)
+
+    def _compose_window(
+        self, target_weeks: List[date], segments: Dict[date, Dict]
+    ) -> List[Dict]:
+        """
+        Fatia a série para a janela pedida (mais recente primeiro).
+
+        Semanas ausentes (não publicadas ou upstream indisponível) são
+        completadas no próprio lugar com dados de fallback, datados com o
+        início da semana, mantendo ``len == weeks`` e a ordem.
+        """
+        absent = [w for w in target_weeks if w not in segments]
+        if not absent:
+            return [segments[w] for w in target_weeks]
+
+        logger.warning(
+            f"⚠️ InfoDengue: apenas {len(target_weeks) - len(absent)}/{len(target_weeks)} "
+            f"semanas disponíveis"
+        )
+        estimated = dict(zip(absent, self._generate_fallback_data(absent)))
+        return [segments.get(w) or estimated[w] for w in target_weeks]
+
+    # ════════════════════════════════════════════════════════════════════════
+    # UPSTREAM
+    # ════════════════════════════════════════════════════════════════════════
+
+    async def _fetch_weeks(
+        self,
+        ibge_code: str,
+        first_week: date,
+        last_week: date,
+        conditional: bool = False,
+    ) -> Tuple[Union[List[Dict], NotModified, None], Optional[Dict]]:
+        """
+        Chama a API InfoDengue para um intervalo contínuo de semanas.
+
+        Args:
+            ibge_code: Código IBGE
+            first_week: Primeira semana do intervalo
+            last_week: Última semana do intervalo
+            conditional: Busca condicional (ver fetch_raw_weeks)
+
+        Returns:
+            Tuple: (linhas formatadas, None) em caso de sucesso (lista
+                   vazia se não houver dados), (NOT_MODIFIED, None) se
+                   nada mudou, ou (None, falha) se a API falhar - ver
+                   _classify_error
+        """
+        raw_data, failure = await self.fetch_raw_weeks(
+            ibge_code, first_week, last_week, conditional=conditional
+        )
+        if raw_data is None or raw_data is NOT_MODIFIED:
+            return raw_data, failure
+        return self._parse_infodengue_response(raw_data), None
+
+    async def fetch_raw_weeks(
+        self,
+        ibge_code: str,
+        first_week: date,
+        last_week: date,
+        retry_policy: Optional[RetryPolicy] = None,
+        conditional: bool = False,
+    ) -> Tuple[Union[List[Dict], NotModified, None], Optional[Dict]]:
+        """
+        Busca as linhas brutas (formato da API) de um intervalo de semanas.
+
+        Usado diretamente pelo InfoDenguePrefetcher, que guarda todas as
+        colunas (temperatura, umidade, Rt...) no InfoDengueStore.
+
+        Args:
+            retry_policy: Política de retry (padrão: self.retry_policy)
+            conditional: Se True, usa os validadores da última resposta a
+                         partir da mesma semana (ETag/Last-Modified/hash)
+
+        Returns:
+            Tuple: (linhas brutas, None), (NOT_MODIFIED, None) se a
+                   resposta não mudou desde a última busca, ou (None, falha)
+        """
+        start_year, start_epiweek = date_to_epiweek(first_week)
+        end_year, end_epiweek = date_to_epiweek(last_week)
+
         try:
             url = f"{self.base_url}/alertcity"
             params = {
@@ -121,67 +617,102 @@ class InfoDengueService:
                 "disease": "dengue",
                 "format": "json",
                 "ew_start": start_epiweek,
-                "ew_end": current_epiweek,
+                "ew_end": end_epiweek,
                 "ey_start": start_year,
-                "ey_end": current_year,
+                "ey_end": end_year,
             }
 
             logger.info(
                 f"🌐 Buscando InfoDengue: {ibge_code} "
-                f"(semanas {start_epiweek}-{current_epiweek}/{start_year}-{current_year})"
+                f"(SE {start_epiweek}/{start_year} - {end_epiweek}/{end_year})"
             )
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-
-            raw_data = response.json()
-
-            # ════════════════════════════════════════════════════════════════
-            # STEP 4: PROCESSA RESPOSTA
-            # ════════════════════════════════════════════════════════════════
-
-            if not raw_data:
-                logger.warning(f"⚠️ InfoDengue retornou vazio para {ibge_code}")
-                return self._generate_fallback_data(weeks)
-
-            # Transforma resposta da API em formato padronizado
-            historical_data = self._parse_infodengue_response(raw_data, weeks)
+            from app.services.cache_service import cache_service
 
-            # ════════════════════════════════════════════════════════════════
-            # STEP 5: SALVA NO CACHE (24h)
-            # ════════════════════════════════════════════════════════════════
+            validators_key = self._validators_key(ibge_code, first_week)
+            previous = await cache_service.get(validators_key) if conditional else None
+
+            client = http_clients.get("infodengue")
+            policy = retry_policy or self.retry_policy
+            response = await policy.run(
+                lambda: client.get(
+                    url,
+                    params=params,
+                    headers=conditional_headers(previous),
+                    timeout=self.timeout,
+                )
+            )
+            if response.status_code != 304:
+                response.raise_for_status()
 
-            if use_cache:
-                from app.services.cache_service import cache_service
-                await cache_service.set(cache_key, historical_data, ttl=86400)
+            if conditional:
+                not_modified, validators = check_response("infodengue", response, previous)
+                await cache_service.set(validators_key, validators, ttl=ttl_policy.VALIDATORS_TTL)
+                if not_modified:
+                    logger.debug(f"✓ InfoDengue não modificado para {ibge_code}")
+                    return NOT_MODIFIED, None
 
-            logger.success(
-                f"✓ InfoDengue: {len(historical_data)} semanas para {ibge_code}"
-            )
+            return response.json() or [], None
 
-            return historical_data
+        except CircuitOpenError as e:
+            logger.info(f"🔌 InfoDengue indisponível (breaker aberto) para {ibge_code}")
+            return None, self._classify_error(e)
 
         except httpx.HTTPError as e:
             logger.error(f"❌ Erro ao buscar InfoDengue: {e}")
-            logger.warning(f"⚠️ Usando fallback para {ibge_code}")
-            return self._generate_fallback_data(weeks)
+            return None, self._classify_error(e)
 
         except Exception as e:
             logger.error(f"❌ Erro inesperado InfoDengue: {e}")
-            return self._generate_fallback_data(weeks)
+            return None, self._classify_error(e)
 
-    def _parse_infodengue_response(
-        self, raw_data: List[Dict], max_weeks: int
-    ) -> List[Dict]:
+    @staticmethod
+    def _classify_error(error: Exception) -> Dict:
+        """
+        Classifica uma falha do upstream para o cache negativo.
+
+        Returns:
+            Dict: {"error_class", "status_code", "retry_after_s"}
+        """
+        status_code: Optional[int] = None
+        retry_after: Optional[int] = None
+
+        if isinstance(error, CircuitOpenError):
+            error_class = "circuit_open"
+            retry_after = int(error.retry_after) or None
+        elif isinstance(error, httpx.TimeoutException):
+            error_class = "timeout"
+        elif isinstance(error, httpx.HTTPStatusError):
+            status_code = error.response.status_code
+            if status_code == 429:
+                error_class = "rate_limited"
+                retry_after = _parse_retry_after(error.response.headers.get("Retry-After"))
+            elif status_code >= 500:
+                error_class = "server_error"
+            else:
+                error_class = "client_error"
+        elif isinstance(error, httpx.TransportError):
+            error_class = "network"
+        elif isinstance(error, ValueError):
+            error_class = "invalid_response"  # JSON inválido
+        else:
+            error_class = "unexpected"
+
+        return {
+            "error_class": error_class,
+            "status_code": status_code,
+            "retry_after_s": retry_after,
+        }
+
+    def _parse_infodengue_response(self, raw_data: List[Dict]) -> List[Dict]:
         """
         Transforma resposta da API InfoDengue em formato padronizado.
 
         Formato da API InfoDengue:
         [
             {
-                "SE": 50,  # Semana epidemiológica
-                "data_iniSE": 1765065600000,  # Timestamp Unix em MILISSEGUNDOS
+                "SE": 202550,  # Semana epidemiológica (YYYYWW)
+                "data_iniSE": 1765065600000,  # Timestamp Unix em MILISSEGUNDOS (UTC)
                 "casos": 142,
                 "nivel": 2,  # 1=verde, 2=amarelo, 3=laranja, 4=vermelho
                 "casos_est": 138.5,  # Casos estimados (modelo InfoDengue)
@@ -195,28 +726,26 @@ class InfoDengueService:
 
         Args:
             raw_data: Resposta bruta da API
-            max_weeks: Número máximo de semanas a retornar
 
         Returns:
-            List[Dict]: Dados formatados
+            List[Dict]: Dados formatados (mais recente primeiro)
         """
         formatted = []
 
-        # Ordena por semana (mais recente primeiro) e limita
-        sorted_data = sorted(
-            raw_data, key=lambda x: (x.get("SE", 0)), reverse=True
-        )[:max_weeks]
-
-        for week_data in sorted_data:
-            # Converte timestamp Unix (milissegundos) para data string
-            timestamp_ms = week_data.get("data_iniSE", 0)
-            if timestamp_ms:
-                # Timestamp está em milissegundos, divide por 1000 para segundos
-                timestamp_sec = timestamp_ms / 1000
-                date_obj = datetime.fromtimestamp(timestamp_sec)
-                date_str = date_obj.strftime("%Y-%m-%d")
-            else:
-                date_str = datetime.now().strftime("%Y-%m-%d")
+        # Timestamp Unix (milissegundos, meia-noite UTC) -> data; sem data = hoje
+        today_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+        timestamps = np.array(
+            [week_data.get("data_iniSE") or today_ms for week_data in raw_data],
+            dtype="datetime64[ms]",
+        )
+        # A SE vem do calendário, não do campo "SE" do upstream
+        week_ids = dates_to_epiweek_ids(timestamps)
+        dates = timestamps.astype("datetime64[D]").astype(str)
+
+        # Ordena por semana (mais recente primeiro)
+        for i in np.argsort(-week_ids, kind="stable"):
+            week_data = raw_data[i]
+            date_str = str(dates[i])
 
             formatted.append(
                 {
@@ -237,50 +766,61 @@ class InfoDengueService:
                         (week_data.get("umidmin", 40.0) + week_data.get("umidmax", 80.0)) / 2,
                         1,
                     ),
-                    "semana_epidemiologica": week_data.get("SE", 0),
+                    "semana_epidemiologica": int(week_ids[i]),
                     "fonte": "InfoDengue",
                 }
             )
 
-        # Se não retornou semanas suficientes, completa com fallback
-        if len(formatted) < max_weeks:
-            logger.warning(
-                f"⚠️ InfoDengue retornou apenas {len(formatted)}/{max_weeks} semanas"
-            )
-            remaining = max_weeks - len(formatted)
-            formatted.extend(self._generate_fallback_data(remaining))
+        return formatted
 
-        return formatted[:max_weeks]  # Garante max_weeks
+    def _latest_week(self, historical_data: List[Dict]) -> Optional[date]:
+        """
+        Retorna a data da semana mais recente vinda do InfoDengue.
+
+        Semanas de fallback são ignoradas (não refletem a publicação).
+
+        Args:
+            historical_data: Dados formatados por _parse_infodengue_response
+
+        Returns:
+            date: Início da semana mais recente, ou None se não houver
+        """
+        dates = [
+            row["data"]
+            for row in historical_data
+            if row.get("fonte") == "InfoDengue" and row.get("data")
+        ]
+        if not dates:
+            return None
+        return datetime.strptime(max(dates), "%Y-%m-%d").date()
 
-    def _generate_fallback_data(self, weeks: int) -> List[Dict]:
+    def _generate_fallback_data(self, week_starts: List[date]) -> List[Dict]:
         """
         Gera dados de fallback quando InfoDengue falha.
 
         Usa dados baseados em média histórica + variação aleatória.
+        ``semana_epidemiologica`` fica 0 para marcar a linha como estimada.
 
         Args:
-            weeks: Número de semanas a gerar
+            week_starts: Início (domingo) de cada semana a gerar
 
         Returns:
-            List[Dict]: Dados estimados
+            List[Dict]: Dados estimados, na ordem de ``week_starts``
         """
         import random
 
-        logger.warning(f"⚠️ Gerando {weeks} semanas de fallback")
+        logger.warning(f"⚠️ Gerando {len(week_starts)} semanas de fallback")
 
         fallback = []
         base_casos = 15  # Média histórica (baixa)
 
-        for i in range(weeks):
-            # Gera data retroativa (7 dias por semana)
-            date = datetime.now() - timedelta(days=7 * (weeks - i - 1))
-
+        for week in week_starts:
             # Variação aleatória ±30%
             casos = max(0, int(base_casos * random.uniform(0.7, 1.3)))
 
             fallback.append(
                 {
-                    "data": date.strftime("%Y-%m-%d"),
+                    "data": week.isoformat(),
                     "casos": casos,
                     "casos_estimados": float(casos),
                     "nivel_alerta": 1,  # Verde (baixo risco)
@@ -298,36 +838,6 @@ class InfoDengueService:
 
         return fallback
 
-    def _get_epiweek(self, date: datetime) -> int:
-        """
-        Calcula semana epidemiológica de uma data.
-
-        Semana epidemiológica: domingo a sábado.
-        Primeira semana do ano: aquela que contém 1º de janeiro.
-
-        Args:
-            date: Data para calcular
-
-        Returns:
-            int: Número da semana epidemiológica (1-53)
-        """
-        # Primeiro dia do ano
-        jan_1 = datetime(date.year, 1, 1)
-
-        # Primeiro domingo do ano (início da semana 1)
-        days_to_sunday = (6 - jan_1.weekday()) % 7
-        first_sunday = jan_1 + timedelta(days=days_to_sunday)
-
-        # Se 1º de janeiro é domingo, é a semana 1
-        if jan_1.weekday() == 6:  # Sunday = 6
-            first_sunday = jan_1
-
-        # Calcula diferença em semanas
-        delta = (date - first_sunday).days
-        epiweek = (delta // 7) + 1
-
-        return max(1, min(53, epiweek))
-
     async def get_alert_level(self, ibge_code: str) -> Dict:
         """
         Busca apenas o nível de alerta atual de uma cidade.
@@ -368,6 +878,19 @@ class InfoDengueService:
         }
 
 
+def _parse_retry_after(value: Optional[str]) -> Optional[int]:
+    """Converte o header Retry-After (segundos ou data HTTP) em segundos."""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return int(value.strip())
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0, int((retry_at - datetime.now(timezone.utc)).total_seconds()))
+
+
 # ════════════════════════════════════════════════════════════════════════════
 # INSTÂNCIA SINGLETON
 # ════════════════════════════════════════════════════════════════════════════
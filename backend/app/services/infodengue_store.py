@@ -0,0 +1,246 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+INFODENGUE STORE - TABELA COLUNAR LOCAL COM AS SÉRIES DE TODAS AS CIDADES
+════════════════════════════════════════════════════════════════════════════
+
+Guarda as linhas brutas do ``alertcity`` (todas as colunas: casos,
+casos_est, temperatura, umidade, Rt...) dos 399 municípios do Paraná
+numa única tabela, persistida em disco como arquivo Arrow IPC.
+
+Preenchida pelo InfoDenguePrefetcher (ingestão em lote) e lida pelo
+DataService antes de chamar a API, para que as predições não dependam
+do InfoDengue de forma síncrona.
+
+Esquema (uma linha por cidade x semana epidemiológica):
+    geocode      str   Código IBGE
+    cidade       str   Nome do município (cidades_parana.json)
+    SE           int   Semana epidemiológica (YYYYWW)
+    data_iniSE   datetime  Domingo de início da semana
+    ...          float Demais colunas numéricas da API
+    ingested_at  float Unix timestamp da ingestão
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from app.core import ttl_policy
+from app.core.arrow_codec import ARROW_AVAILABLE, decode_frame, encode_frame
+from app.core.config import settings
+from app.core.epiweek import dates_to_epiweek_ids
+from app.core.logger import logger
+
+
+class InfoDengueStore:
+    """
+    Séries brutas do InfoDengue em memória (por cidade) + arquivo Arrow.
+
+    Attributes:
+        path: Arquivo Arrow IPC da tabela
+    """
+
+    def __init__(self, path: Path):
+        """
+        Inicializa o store (arquivo lido no load()).
+
+        Args:
+            path: Caminho do arquivo Arrow IPC
+        """
+        self.path = Path(path)
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    # ════════════════════════════════════════════════════════════════════════
+    # PERSISTÊNCIA
+    # ════════════════════════════════════════════════════════════════════════
+
+    def load(self) -> None:
+        """Carrega a tabela do disco (uma vez; sem arquivo, começa vazia)."""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not ARROW_AVAILABLE or not self.path.exists():
+            return
+
+        try:
+            table = decode_frame(self.path.read_bytes())
+        except Exception as e:
+            logger.warning(f"⚠️ InfoDengue store ilegível ({self.path}): {e}")
+            return
+
+        with self._lock:
+            self._frames = {
+                str(geocode): frame.reset_index(drop=True)
+                for geocode, frame in table.groupby("geocode", sort=False)
+            }
+
+        logger.info(f"🗄️  InfoDengue store: {len(self._frames)} cidades ({len(table)} linhas)")
+
+    async def save(self) -> None:
+        """Grava a tabela inteira no disco (escrita atômica, em thread)."""
+        if not ARROW_AVAILABLE:
+            return
+
+        with self._lock:
+            frames = list(self._frames.values())
+        if not frames:
+            return
+
+        table = pd.concat(frames, ignore_index=True)
+        await asyncio.to_thread(self._write_atomic, encode_frame(table))
+        logger.info(f"🗄️  InfoDengue store salvo: {len(frames)} cidades ({len(table)} linhas)")
+
+    def _write_atomic(self, payload: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, self.path)
+
+    # ════════════════════════════════════════════════════════════════════════
+    # ESCRITA / LEITURA
+    # ════════════════════════════════════════════════════════════════════════
+
+    def upsert(self, geocode: str, city_name: str, raw_rows: List[Dict]) -> int:
+        """
+        Substitui a série de uma cidade pelas linhas brutas da API.
+
+        Args:
+            geocode: Código IBGE
+            city_name: Nome do município
+            raw_rows: Linhas do alertcity (InfoDengueService.fetch_raw_weeks)
+
+        Returns:
+            int: Linhas gravadas
+        """
+        if not raw_rows:
+            return 0
+
+        frame = pd.DataFrame(raw_rows)
+        frame["data_iniSE"] = pd.to_datetime(frame["data_iniSE"], unit="ms")
+        # SE recalculada pelo calendário (chave das junções e da deduplicação)
+        frame["SE"] = dates_to_epiweek_ids(frame["data_iniSE"])
+
+        # Colunas numéricas com None da API viram float/NaN; texto fica como está
+        for column in frame.columns.difference(["data_iniSE", "SE"]):
+            if frame[column].dtype == object:
+                numeric = pd.to_numeric(frame[column], errors="coerce")
+                if numeric.notna().sum() == frame[column].notna().sum():
+                    frame[column] = numeric
+
+        frame.insert(0, "geocode", str(geocode))
+        frame.insert(1, "cidade", city_name)
+        frame["ingested_at"] = time.time()
+
+        frame = frame.sort_values("data_iniSE").drop_duplicates("SE", keep="last")
+
+        with self._lock:
+            self._frames[str(geocode)] = frame.reset_index(drop=True)
+        return len(frame)
+
+    def touch(self, geocode: str) -> bool:
+        """
+        Marca a série da cidade como conferida agora (upstream não mudou).
+
+        Returns:
+            bool: False se a cidade não está na tabela
+        """
+        with self._lock:
+            frame = self._frames.get(str(geocode))
+            if frame is None:
+                return False
+            frame = frame.copy()
+            frame["ingested_at"] = time.time()
+            self._frames[str(geocode)] = frame
+        return True
+
+    def latest_week(self, geocode: str) -> Optional[date]:
+        """Início da semana mais recente da cidade (None se ausente)."""
+        with self._lock:
+            frame = self._frames.get(str(geocode))
+        if frame is None or frame.empty:
+            return None
+        return frame["data_iniSE"].iloc[-1].date()
+
+    def raw_rows(self, geocode: str) -> List[Dict]:
+        """Série da cidade no formato da API (inverso de upsert)."""
+        with self._lock:
+            frame = self._frames.get(str(geocode))
+        if frame is None:
+            return []
+
+        raw = frame.drop(columns=["geocode", "cidade", "ingested_at"])
+        raw["data_iniSE"] = raw["data_iniSE"].astype("datetime64[ms]").astype("int64")
+        raw = raw.astype(object).where(raw.notna(), None)
+        return raw.to_dict("records")
+
+    def get_city(self, geocode: str, weeks: int) -> Optional[pd.DataFrame]:
+        """
+        Últimas ``weeks`` semanas de uma cidade, se ingeridas após a
+        última publicação do InfoDengue.
+
+        Args:
+            geocode: Código IBGE
+            weeks: Número de semanas
+
+        Returns:
+            DataFrame ordenado por data (mais antiga primeiro) ou None
+            (cidade ausente, série curta ou ingestão anterior à publicação)
+        """
+        self.load()
+
+        with self._lock:
+            frame = self._frames.get(str(geocode))
+        if frame is None or len(frame) < weeks:
+            return None
+
+        if not self.is_fresh(geocode):
+            return None
+
+        return frame.tail(weeks)
+
+    def ingested_at(self, geocode: str) -> Optional[float]:
+        """Unix timestamp da última ingestão da cidade (None se ausente)."""
+        with self._lock:
+            frame = self._frames.get(str(geocode))
+        if frame is None or frame.empty:
+            return None
+        return float(frame["ingested_at"].iloc[-1])
+
+    def is_fresh(self, geocode: str) -> bool:
+        """True se a cidade foi ingerida depois da última publicação."""
+        ingested = self.ingested_at(geocode)
+        return ingested is not None and ingested >= ttl_policy.last_publication().timestamp()
+
+    def stats(self) -> Dict:
+        """Cidades, linhas e frescor da tabela (para o /health)."""
+        self.load()
+        with self._lock:
+            geocodes = list(self._frames)
+            rows = sum(len(frame) for frame in self._frames.values())
+
+        fresh = sum(1 for geocode in geocodes if self.is_fresh(geocode))
+        return {
+            "cities": len(geocodes),
+            "fresh_cities": fresh,
+            "rows": rows,
+            "path": str(self.path),
+        }
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# SINGLETON INSTANCE
+# ════════════════════════════════════════════════════════════════════════════
+
+infodengue_store = InfoDengueStore(Path(settings.infodengue_store_path))
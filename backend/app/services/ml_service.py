@@ -36,6 +36,8 @@ import pandas as pd
 import joblib
 from loguru import logger
 
+from app.core.epiweek import epiweek_id
+
 # Lazy import para evitar erro se TensorFlow não estiver instalado
 try:
     import tensorflow as tf
@@ -347,7 +349,8 @@ class MLService:
     async def predict_multiple_weeks(
         self,
         historical_data: pd.DataFrame,
-        weeks_ahead: int = 4
+        weeks_ahead: int = 4,
+        future_climate: Optional[pd.DataFrame] = None,
     ) -> list[Tuple[float, float]]:
         """
         Prediz múltiplas semanas à frente (iterativo).
@@ -358,6 +361,9 @@ class MLService:
         Args:
             historical_data: DataFrame com últimas semanas
             weeks_ahead: Quantas semanas prever (1-4)
+            future_climate: Features climáticas previstas por id de SE
+                            (forecast_features.get_city_forecast_features).
+                            Semanas ausentes copiam o clima da última linha.
         
         Returns:
             Lista de tuplas [(cases, confidence), ...]
@@ -380,6 +386,15 @@ class MLService:
                 last_row = current_data.iloc[-1].copy()
                 last_row["casos_est"] = cases
                 
+                # Clima previsto da semana, se houver
+                if future_climate is not None and "data_iniSE" in last_row:
+                    week_start = pd.Timestamp(last_row["data_iniSE"]).normalize() + pd.Timedelta(weeks=1)
+                    last_row["data_iniSE"] = week_start
+                    week_id = epiweek_id(week_start)
+                    if week_id in future_climate.index:
+                        forecast = future_climate.loc[week_id]
+                        last_row[forecast.index] = forecast.values
+                
                 # Adiciona e remove primeira linha (mantém janela de 4)
                 current_data = pd.concat([
                     current_data.iloc[1:],
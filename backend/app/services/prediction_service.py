@@ -10,6 +10,7 @@ Features:
     - Predições baseadas em clima + histórico
     - Classificação de risco (Verde/Amarelo/Vermelho)
     - Fallback seguro se modelo não existir
+    - Predição em lote (predict_many): uma chamada ao modelo por lote
 
 Model Input:
     - mes: Mês (1-12)
@@ -30,15 +31,29 @@ Data: 2025-12-09
 
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 import joblib
 import numpy as np
 import pandas as pd
 
+from app.core.epiweek import date_to_epiweek
 from app.core.logger import logger
 
 
+# ════════════════════════════════════════════════════════════════════════════
+# DECISÃO: Usar Fallback Inteligente como principal método
+# ════════════════════════════════════════════════════════════════════════════
+# O modelo Keras atual tem R² = -0.25 (pior que média)
+# O fallback baseado em histórico + clima é mais preciso
+# Quando tivermos um modelo com R² > 0.5, podemos reverter
+USE_ML_MODEL = False  # Flag para ativar/desativar ML
+
+# Cap máximo baseado em histórico real de Curitiba (pico ~200 casos/semana)
+MAX_CASOS_SEMANAL = 300
+MIN_CASOS_SEMANAL = 0
+
+
 class PredictionService:
     """
     Serviço de predição usando modelo de Machine Learning.
@@ -164,133 +179,165 @@ class PredictionService:
             - alto: 150-300 casos
             - muito_alto: > 300 casos
         """
-        # ════════════════════════════════════════════════════════════════════
-        # DECISÃO: Usar Fallback Inteligente como principal método
-        # ════════════════════════════════════════════════════════════════════
-        # O modelo Keras atual tem R² = -0.25 (pior que média)
-        # O fallback baseado em histórico + clima é mais preciso
-        # Quando tivermos um modelo com R² > 0.5, podemos reverter
-        
-        USE_ML_MODEL = False  # Flag para ativar/desativar ML
-        
+        return self.predict_many(
+            [
+                {
+                    "temperatura_media": temperatura_media,
+                    "temperatura_min": temperatura_min,
+                    "temperatura_max": temperatura_max,
+                    "umidade": umidade,
+                    "precipitacao": precipitacao,
+                    "populacao_densidade": populacao_densidade,
+                    "casos_semana_anterior": casos_semana_anterior,
+                    "casos_2sem_anterior": casos_2sem_anterior,
+                }
+            ]
+        )[0]
+
+    def predict_many(self, inputs: List[Dict]) -> List[dict]:
+        """
+        Predição em lote: uma única chamada ao scaler e ao modelo.
+
+        Args:
+            inputs: Argumentos de predict() por cidade
+
+        Returns:
+            List[dict]: Predições na mesma ordem (formato de predict())
+        """
+        if not inputs:
+            return []
+
         if not USE_ML_MODEL or not self.is_loaded:
             if not self.is_loaded:
                 logger.warning("⚠️  Modelo não carregado - usando fallback inteligente")
             else:
                 logger.info("📊 Usando fallback inteligente (ML desabilitado por baixa acurácia)")
-            return self._get_fallback_prediction(
-                temperatura_media=temperatura_media,
-                casos_semana_anterior=casos_semana_anterior,
-                casos_2sem_anterior=casos_2sem_anterior,
-            )
+            return [self._fallback_for(item) for item in inputs]
 
         try:
             # Features para o modelo (baseado no treinamento do ETL pipeline)
-            now = datetime.now()
-            semana_do_ano = now.isocalendar()[1]  # Semana do ano (1-52)
-            
-            # Sazonalidade (componentes trigonométricas)
-            sazonalidade_sen = np.sin(2 * np.pi * semana_do_ano / 52)
-            sazonalidade_cos = np.cos(2 * np.pi * semana_do_ano / 52)
-            
-            # Médias móveis (simplificadas para tempo real)
-            casos_media_4sem = (casos_semana_anterior + casos_2sem_anterior) / 2
-            temp_media_movel_4sem = temperatura_media
-            umid_media_movel_4sem = umidade
-            
-            # Amplitude térmica e de umidade (estimativas)
-            amplitude_termica = temperatura_max - temperatura_min
-            amplitude_umidade = 20.0  # Valor padrão
-            
-            # Tendência (sequencial - usar número da semana)
-            tendencia = semana_do_ano
-            
-            # Interação temperatura × umidade
-            temp_umid_interacao = temperatura_media * umidade
-
-            # Monta DataFrame com features (na ordem esperada pelo modelo)
+            _, semana_do_ano = date_to_epiweek(datetime.now())  # Semana epidemiológica (1-53)
             input_data = pd.DataFrame(
-                [
-                    {
-                        "tempmin": temperatura_min,
-                        "tempmed": temperatura_media,
-                        "tempmax": temperatura_max,
-                        "umidmin": umidade - 10,  # Estimativa
-                        "umidmed": umidade,
-                        "umidmax": umidade + 10,  # Estimativa
-                        "casos_semana_anterior": casos_semana_anterior,
-                        "casos_2sem_anterior": casos_2sem_anterior,
-                        "casos_3sem_anterior": 0,  # Não temos histórico suficiente
-                        "casos_4sem_anterior": 0,  # Não temos histórico suficiente
-                        "casos_media_4sem": casos_media_4sem,
-                        "temp_media_movel_4sem": temp_media_movel_4sem,
-                        "umid_media_movel_4sem": umid_media_movel_4sem,
-                        "sazonalidade_sen": sazonalidade_sen,
-                        "sazonalidade_cos": sazonalidade_cos,
-                        "amplitude_termica": amplitude_termica,
-                        "amplitude_umidade": amplitude_umidade,
-                        "tendencia": tendencia,
-                        "temp_umid_interacao": temp_umid_interacao,
-                        "semana_do_ano": semana_do_ano,
-                    }
-                ]
+                [self._feature_row(item, semana_do_ano) for item in inputs]
             )
 
-            # Normaliza dados (StandardScaler)
+            # Normaliza dados (StandardScaler) e prediz todas as linhas de uma vez
             input_scaled = self.scaler.transform(input_data)
+            raw_predictions = np.asarray(self.model.predict(input_scaled)).reshape(len(inputs), -1)[:, 0]
 
-            # Predição
-            prediction = self.model.predict(input_scaled)[0]
-            casos_estimados_raw = max(0, int(prediction))  # Não pode ser negativo
+            return [
+                self._ml_result(float(raw), item.get("casos_semana_anterior", 0))
+                for raw, item in zip(raw_predictions, inputs)
+            ]
 
-            # SAFEGUARD: Se modelo tem R² negativo, aplica caps e ajustes
-            # Baseado nas métricas reais do modelo (MAE ~700, R² -0.25)
-            # Isso evita previsões absurdas como 3000+ casos em uma semana
-            
-            # Cap máximo baseado em histórico real de Curitiba (pico ~200 casos/semana)
-            MAX_CASOS_SEMANAL = 300
-            MIN_CASOS_SEMANAL = 0
-            
-            # Aplica blend com heurística se casos_semana_anterior disponível
-            if casos_semana_anterior > 0:
-                # Blend: 70% modelo + 30% persistência (semana anterior)
-                # Isso suaviza previsões extremas
-                casos_estimados = int(
-                    0.7 * min(casos_estimados_raw, MAX_CASOS_SEMANAL) +
-                    0.3 * casos_semana_anterior
-                )
-            else:
-                casos_estimados = min(casos_estimados_raw, MAX_CASOS_SEMANAL)
-            
-            casos_estimados = max(MIN_CASOS_SEMANAL, casos_estimados)
+        except Exception as e:
+            logger.error(f"❌ Erro ao fazer predição: {e}")
+            return [self._get_fallback_prediction(item["temperatura_media"]) for item in inputs]
+
+    def _fallback_for(self, item: Dict) -> dict:
+        """Fallback inteligente a partir dos argumentos de predict()."""
+        return self._get_fallback_prediction(
+            temperatura_media=item["temperatura_media"],
+            casos_semana_anterior=item.get("casos_semana_anterior", 0),
+            casos_2sem_anterior=item.get("casos_2sem_anterior", 0),
+        )
+
+    @staticmethod
+    def _feature_row(item: Dict, semana_do_ano: int) -> Dict:
+        """Linha de features do modelo (na ordem esperada pelo scaler)."""
+        temperatura_media = item["temperatura_media"]
+        temperatura_min = item["temperatura_min"]
+        temperatura_max = item["temperatura_max"]
+        umidade = item["umidade"]
+        casos_semana_anterior = item.get("casos_semana_anterior", 0)
+        casos_2sem_anterior = item.get("casos_2sem_anterior", 0)
+
+        # Sazonalidade (componentes trigonométricas)
+        sazonalidade_sen = np.sin(2 * np.pi * semana_do_ano / 52)
+        sazonalidade_cos = np.cos(2 * np.pi * semana_do_ano / 52)
+
+        # Médias móveis (simplificadas para tempo real)
+        casos_media_4sem = (casos_semana_anterior + casos_2sem_anterior) / 2
+        temp_media_movel_4sem = temperatura_media
+        umid_media_movel_4sem = umidade
+
+        # Amplitude térmica e de umidade (estimativas)
+        amplitude_termica = temperatura_max - temperatura_min
+        amplitude_umidade = 20.0  # Valor padrão
+
+        # Tendência (sequencial - usar número da semana)
+        tendencia = semana_do_ano
+
+        # Interação temperatura × umidade
+        temp_umid_interacao = temperatura_media * umidade
+
+        return {
+            "tempmin": temperatura_min,
+            "tempmed": temperatura_media,
+            "tempmax": temperatura_max,
+            "umidmin": umidade - 10,  # Estimativa
+            "umidmed": umidade,
+            "umidmax": umidade + 10,  # Estimativa
+            "casos_semana_anterior": casos_semana_anterior,
+            "casos_2sem_anterior": casos_2sem_anterior,
+            "casos_3sem_anterior": 0,  # Não temos histórico suficiente
+            "casos_4sem_anterior": 0,  # Não temos histórico suficiente
+            "casos_media_4sem": casos_media_4sem,
+            "temp_media_movel_4sem": temp_media_movel_4sem,
+            "umid_media_movel_4sem": umid_media_movel_4sem,
+            "sazonalidade_sen": sazonalidade_sen,
+            "sazonalidade_cos": sazonalidade_cos,
+            "amplitude_termica": amplitude_termica,
+            "amplitude_umidade": amplitude_umidade,
+            "tendencia": tendencia,
+            "temp_umid_interacao": temp_umid_interacao,
+            "semana_do_ano": semana_do_ano,
+        }
+
+    def _ml_result(self, prediction: float, casos_semana_anterior: int) -> dict:
+        """Aplica os safeguards à saída bruta do modelo e monta a predição."""
+        casos_estimados_raw = max(0, int(prediction))  # Não pode ser negativo
 
-            logger.info(
-                f"🎯 Predição ML: {casos_estimados} casos "
-                f"(raw: {casos_estimados_raw}, capped: {casos_estimados_raw > MAX_CASOS_SEMANAL})"
+        # SAFEGUARD: Se modelo tem R² negativo, aplica caps e ajustes
+        # Baseado nas métricas reais do modelo (MAE ~700, R² -0.25)
+        # Isso evita previsões absurdas como 3000+ casos em uma semana
+        
+        # Aplica blend com heurística se casos_semana_anterior disponível
+        if casos_semana_anterior > 0:
+            # Blend: 70% modelo + 30% persistência (semana anterior)
+            # Isso suaviza previsões extremas
+            casos_estimados = int(
+                0.7 * min(casos_estimados_raw, MAX_CASOS_SEMANAL) +
+                0.3 * casos_semana_anterior
             )
+        else:
+            casos_estimados = min(casos_estimados_raw, MAX_CASOS_SEMANAL)
+        
+        casos_estimados = max(MIN_CASOS_SEMANAL, casos_estimados)
 
-            # Classifica nível de risco
-            nivel_risco = self._classify_risk_level(casos_estimados)
-
-            # Calcula confiança baseada nas métricas reais do modelo
-            # R² = -0.25 indica modelo com baixa confiança
-            # Confiança ajustada: 0.50 (baixa, pois R² < 0)
-            confianca = 0.50 if self.is_loaded else 0.30
-
-            return {
-                "casos_estimados": casos_estimados,
-                "nivel_risco": nivel_risco,
-                "confianca": confianca,
-                "tendencia": self._get_trend(
-                    casos_estimados, casos_semana_anterior
-                ),
-                "fonte": "ML (XGBoost) com safeguards",
-                "observacao": "Modelo com R² negativo. Previsão ajustada com heurísticas." if self.is_loaded else None,
-            }
+        logger.info(
+            f"🎯 Predição ML: {casos_estimados} casos "
+            f"(raw: {casos_estimados_raw}, capped: {casos_estimados_raw > MAX_CASOS_SEMANAL})"
+        )
 
-        except Exception as e:
-            logger.error(f"❌ Erro ao fazer predição: {e}")
-            return self._get_fallback_prediction(temperatura_media)
+        # Classifica nível de risco
+        nivel_risco = self._classify_risk_level(casos_estimados)
+
+        # Calcula confiança baseada nas métricas reais do modelo
+        # R² = -0.25 indica modelo com baixa confiança
+        # Confiança ajustada: 0.50 (baixa, pois R² < 0)
+        confianca = 0.50 if self.is_loaded else 0.30
+
+        return {
+            "casos_estimados": casos_estimados,
+            "nivel_risco": nivel_risco,
+            "confianca": confianca,
+            "tendencia": self._get_trend(
+                casos_estimados, casos_semana_anterior
+            ),
+            "fonte": "ML (XGBoost) com safeguards",
+            "observacao": "Modelo com R² negativo. Previsão ajustada com heurísticas." if self.is_loaded else None,
+        }
 
     def _classify_risk_level(self, casos: int) -> str:
         """
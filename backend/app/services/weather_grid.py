@@ -0,0 +1,317 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+WEATHER GRID - CÉLULAS DO SMART GRID PRÉ-CALCULADAS E REFRESH EM LOTE
+════════════════════════════════════════════════════════════════════════════
+
+O Smart Grid Cache agrupa cidades próximas numa mesma célula
+(lat/lon arredondados a 0.1°, ~11km). Antes, a célula era calculada a
+cada requisição e só era preenchida quando algum usuário pedia.
+
+Aqui:
+
+    1. WeatherGrid - no startup, mapeia cada cidade do CitiesService para
+       sua célula e guarda as células distintas (coordenadas da cidade
+       mais populosa, cidades e população atendidas)
+    2. WeatherGridRefresher - a cada WEATHER_GRID_REFRESH_INTERVAL,
+       busca no OpenWeather as células ausentes ou que expiram antes do
+       próximo ciclo, em ordem de prioridade (tráfego do dashboard e
+       população). Cada célula é buscada uma vez por TTL: o número de
+       chamadas depende do número de células, não do tráfego.
+
+O refresher roda com prioridade de background no token bucket do
+OpenWeather (app.core.rate_limiter).
+
+O WeatherGrid também serve de índice espacial: as coordenadas das
+células ficam num array NumPy (radianos) e nearest_cached() calcula o
+haversine para todas de uma vez e consulta o cache em ordem de
+distância, devolvendo a célula em cache mais próxima dentro do raio.
+Células gravadas fora do mapeamento das cidades (coordenadas avulsas,
+busca por nome) entram no índice via register_cell(). O WeatherService
+usa isso quando a própria célula falta e a API falha ou está sem token.
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.rate_limiter import set_background_priority
+from app.services.cache_service import cache_service
+from app.services.cities_service import cities_service
+from app.services.weather_service import weather_service
+
+EARTH_RADIUS_KM = 6371.0
+
+# Vizinhas consultadas por ida ao Redis (MGET), em ordem de distância
+NEAREST_CANDIDATES = 8
+
+# Limite de células avulsas no índice (fora do mapeamento das cidades)
+MAX_EXTRA_CELLS = 5000
+
+
+class WeatherGrid:
+    """
+    Mapeamento cidade -> célula do Smart Grid (calculado uma vez).
+
+    Attributes:
+        cells: {grid_key: {"key", "lat", "lon", "cities", "population"}}
+    """
+
+    def __init__(self, cities: List[Dict]):
+        """
+        Pré-calcula as células a partir da lista de cidades.
+
+        Args:
+            cities: Cidades do CitiesService (ibge_codigo, latitude, longitude)
+        """
+        self.cells: Dict[str, Dict] = {}
+        self._cell_by_city: Dict[str, str] = {}
+
+        # Mais populosas primeiro: a 1ª cidade da célula define as coordenadas
+        for city in sorted(cities, key=lambda c: c.get("populacao", 0), reverse=True):
+            if city.get("latitude") is None or city.get("longitude") is None:
+                continue
+
+            key = weather_service._get_grid_key(city["latitude"], city["longitude"])
+            self._cell_by_city[city["ibge_codigo"]] = key
+
+            cell = self.cells.setdefault(
+                key,
+                {
+                    "key": key,
+                    "lat": city["latitude"],
+                    "lon": city["longitude"],
+                    "cities": [],
+                    "population": 0,
+                },
+            )
+            cell["cities"].append(city["ibge_codigo"])
+            cell["population"] += city.get("populacao", 0)
+
+        # Índice espacial: coordenadas das células em radianos, na ordem de _keys
+        self._keys: List[str] = list(self.cells)
+        self._extra_keys: set = set()
+        self._coords_rad = np.radians(
+            np.array(
+                [(cell["lat"], cell["lon"]) for cell in self.cells.values()], dtype=np.float64
+            ).reshape(-1, 2)
+        )
+
+        logger.info(f"🗺️  Weather grid: {len(self._cell_by_city)} cidades em {len(self.cells)} células")
+
+    def cell_for_city(self, ibge_code: str) -> Optional[str]:
+        """Chave da célula da cidade (None se a cidade não tiver coordenadas)."""
+        return self._cell_by_city.get(str(ibge_code))
+
+    def register_cell(self, key: str, lat: float, lon: float) -> None:
+        """
+        Inclui no índice espacial uma célula fora do mapeamento das cidades.
+
+        Chamado quando o WeatherService grava o clima de uma célula avulsa
+        (coordenadas de fora do Paraná, busca por nome). Essas células só
+        entram no índice: o refresher continua cuidando apenas de ``cells``.
+        """
+        if key in self.cells or key in self._extra_keys:
+            return
+        if len(self._extra_keys) >= MAX_EXTRA_CELLS:
+            return
+
+        self._extra_keys.add(key)
+        self._keys.append(key)
+        self._coords_rad = np.vstack([self._coords_rad, np.radians([[lat, lon]])])
+
+    def nearby_cells(self, lat: float, lon: float, radius_km: float) -> List[Tuple[str, float]]:
+        """
+        Células num raio de ``radius_km``, da mais próxima para a mais distante.
+
+        Returns:
+            List: [(grid_key, distância_km)]
+        """
+        if not self._keys:
+            return []
+
+        lat_rad, lon_rad = np.radians(lat), np.radians(lon)
+        cell_lat, cell_lon = self._coords_rad[:, 0], self._coords_rad[:, 1]
+
+        # Haversine vetorizado
+        a = (
+            np.sin((cell_lat - lat_rad) / 2) ** 2
+            + np.cos(lat_rad) * np.cos(cell_lat) * np.sin((cell_lon - lon_rad) / 2) ** 2
+        )
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+        inside = np.flatnonzero(distances <= radius_km)
+        inside = inside[np.argsort(distances[inside], kind="stable")]
+        return [(self._keys[i], float(distances[i])) for i in inside]
+
+    async def nearest_cached(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        exclude: Optional[str] = None,
+    ) -> Optional[Tuple[Dict, float]]:
+        """
+        Clima em cache da célula mais próxima de (lat, lon).
+
+        Args:
+            lat, lon: Ponto de referência
+            radius_km: Distância máxima
+            exclude: Célula a ignorar (a do próprio ponto, já consultada)
+
+        Returns:
+            Tuple: (dados climáticos, distância_km), ou None se nenhuma
+                   célula do raio estiver em cache
+        """
+        candidates = [
+            (key, distance)
+            for key, distance in self.nearby_cells(lat, lon, radius_km)
+            if key != exclude
+        ]
+
+        # Lotes de NEAREST_CANDIDATES (um MGET cada) até achar ou esgotar o raio
+        for start in range(0, len(candidates), NEAREST_CANDIDATES):
+            batch = candidates[start:start + NEAREST_CANDIDATES]
+            try:
+                values = await cache_service.get_many([key for key, _ in batch])
+            except Exception as e:
+                logger.warning(f"⚠️  Busca de células vizinhas falhou: {e}")
+                return None
+
+            for (_, distance), weather in zip(batch, values):
+                if weather:
+                    return weather, distance
+        return None
+
+    def prioritized_cells(self, ranking: Dict[str, float]) -> List[Dict]:
+        """
+        Células ordenadas por tráfego (soma das cidades) e população.
+
+        Args:
+            ranking: {ibge: acessos} de cache_service.get_traffic_ranking()
+        """
+        return sorted(
+            self.cells.values(),
+            key=lambda cell: (
+                sum(ranking.get(ibge, 0.0) for ibge in cell["cities"]),
+                cell["population"],
+            ),
+            reverse=True,
+        )
+
+
+class WeatherGridRefresher:
+    """
+    Tarefa de background que mantém as células do grid em cache.
+
+    Attributes:
+        last_run: Estatísticas do último ciclo (exibidas no /health)
+    """
+
+    def __init__(self):
+        """Inicializa o refresher (tarefa criada no start())."""
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[Dict] = None
+
+    def start(self) -> None:
+        """Agenda o refresher em background (não bloqueia o startup)."""
+        if not settings.weather_grid_refresh_enabled:
+            logger.info("🗺️  Weather grid refresher desabilitado (WEATHER_GRID_REFRESH_ENABLED=false)")
+            return
+
+        if self._task and not self._task.done():
+            return
+
+        self._task = asyncio.create_task(self._run_forever(), name="weather-grid-refresher")
+        logger.info(
+            f"🗺️  Weather grid refresher agendado "
+            f"(intervalo: {settings.weather_grid_refresh_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Cancela a tarefa de background."""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("🗺️  Weather grid refresher parado")
+
+    async def _run_forever(self) -> None:
+        set_background_priority()
+
+        while True:
+            try:
+                await self.refresh_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Erro no weather grid refresher: {e}")
+
+            await asyncio.sleep(settings.weather_grid_refresh_interval)
+
+    async def refresh_once(self) -> Dict:
+        """
+        Busca as células ausentes ou que expiram antes do próximo ciclo.
+
+        Returns:
+            Dict: Estatísticas do ciclo
+        """
+        if not cache_service.is_available:
+            logger.debug("⚠️  Cache offline - pulando weather grid refresher")
+            return {}
+
+        started = time.perf_counter()
+        ranking = await cache_service.get_traffic_ranking()
+        cells = weather_grid.prioritized_cells(ranking)
+
+        ttls = await cache_service.get_ttls([cell["key"] for cell in cells])
+        due = [
+            cell
+            for cell, ttl in zip(cells, ttls)
+            if ttl is None or ttl < 0 or ttl <= settings.weather_grid_refresh_interval
+        ]
+
+        stats = {"cells": len(cells), "due": len(due), "refreshed": 0, "failed": 0}
+        semaphore = asyncio.Semaphore(settings.cache_warmer_concurrency)
+
+        async def refresh(cell: Dict) -> None:
+            async with semaphore:
+                weather = await weather_service.get_current_weather(
+                    cell["lat"], cell["lon"], grid_key=cell["key"], refresh=True
+                )
+                # Fallback não é gravado no cache - a célula continua pendente
+                if weather.get("fonte") == "OpenWeatherMap":
+                    stats["refreshed"] += 1
+                else:
+                    stats["failed"] += 1
+
+        # Em ordem de prioridade: o token bucket libera as primeiras antes
+        await asyncio.gather(*(refresh(cell) for cell in due))
+
+        stats["duration_s"] = round(time.perf_counter() - started, 1)
+        stats["finished_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.last_run = stats
+
+        if due:
+            logger.success(f"🗺️  Weather grid atualizado: {stats}")
+        return stats
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# SINGLETON INSTANCES
+# ════════════════════════════════════════════════════════════════════════════
+
+weather_grid = WeatherGrid(cities_service.cities_data)
+weather_grid_refresher = WeatherGridRefresher()
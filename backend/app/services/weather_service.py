@@ -7,9 +7,11 @@ Busca dados climáticos do OpenWeatherMap API.
 
 Features:
     - Clima atual por coordenadas (lat/lon)
-    - Tratamento de erros com fallback seguro
+    - Clima por nome (resolvido para coordenadas, mesmo cache por região)
+    - Tratamento de erros com fallback seguro (célula vizinha em cache,
+      depois média histórica)
     - Rate limiting awareness (60 calls/min free tier)
-    - Async/await com httpx
+    - Async/await com httpx (client compartilhado, keep-alive/HTTP/2)
 
 API Docs:
     https://openweathermap.org/current
@@ -22,13 +24,19 @@ Data: 2025-12-09
 ════════════════════════════════════════════════════════════════════════════
 """
 
-import json
 from typing import Dict, List, Optional
 
 import httpx
 
+from app.core import ttl_policy
+from app.core.circuit_breaker import CircuitOpenError
 from app.core.config import settings
+from app.core.http_clients import http_clients
 from app.core.logger import logger
+from app.core.metrics import metrics
+from app.core.rate_limiter import RateLimitExceeded, rate_limiters
+from app.core.retry_policy import RetryPolicy
+from app.services.cities_service import cities_service, normalize_text
 
 
 class WeatherService:
@@ -44,6 +52,14 @@ class WeatherService:
         self.base_url = settings.openweather_base_url
         self.api_key = settings.openweather_api_key
         self.timeout = 10  # segundos
+        # Sem hedging: cada cópia gasta um token do rate limiter e uma
+        # chamada da cota diária, que é o recurso escasso deste upstream
+        self.retry_policy = RetryPolicy(
+            "openweather",
+            max_retries=settings.openweather_max_retries,
+            deadline=settings.openweather_retry_deadline,
+            hedge=False,
+        )
     
     def _get_grid_key(self, lat: float, lon: float) -> str:
         """
@@ -76,7 +92,12 @@ class WeatherService:
         return f"weather:grid:{lat_rounded}:{lon_rounded}"
 
     async def get_current_weather(
-        self, lat: float, lon: float, use_cache: bool = True
+        self,
+        lat: float,
+        lon: float,
+        use_cache: bool = True,
+        grid_key: Optional[str] = None,
+        refresh: bool = False,
     ) -> dict:
         """
         Busca clima atual por coordenadas geográficas com Smart Grid Cache.
@@ -85,6 +106,10 @@ class WeatherService:
             lat: Latitude (-90 a 90)
             lon: Longitude (-180 a 180)
             use_cache: Se True, usa cache compartilhado por região (default: True)
+            grid_key: Célula já conhecida (weather_grid.cell_for_city);
+                      se omitida, é calculada a partir de lat/lon
+            refresh: Se True, ignora o valor em cache mas grava o novo
+                     (usado pelo WeatherGridRefresher)
 
         Returns:
             dict: Dados climáticos
@@ -106,31 +131,41 @@ class WeatherService:
             - Cidades num raio de ~11km compartilham o mesmo dado climático
             - TTL: 7200s (2 horas - clima não muda rapidamente)
             - Economia: 97% menos API calls para OpenWeatherMap
+            - Sem a célula (falha da API ou rate limit), usa a célula em
+              cache mais próxima num raio de WEATHER_NEAREST_RADIUS_KM
         """
         logger.info(f"🌦️  Buscando clima atual (lat={lat}, lon={lon})...")
-        
+        grid_key = grid_key or self._get_grid_key(lat, lon)
+        # Em falha, serve a célula vizinha em cache (não no refresh do grid)
+        use_nearest = use_cache and not refresh
+
         # ════════════════════════════════════════════════════════════════════
         # SMART GRID CACHE CHECK
         # ════════════════════════════════════════════════════════════════════
-        if use_cache:
-            grid_key = self._get_grid_key(lat, lon)
-            
+        if use_cache and not refresh:
             try:
                 from app.services import cache_service
                 
-                if cache_service.is_connected:
-                    cached_weather = await cache_service.redis_client.get(grid_key)
-                    if cached_weather:
-                        logger.success(f"✓ Cache HIT (Grid: {grid_key})")
-                        return json.loads(cached_weather)
-                    else:
-                        logger.info(f"⚠ Cache MISS (Grid: {grid_key})")
+                # Redis ou, durante uma queda, o cache em disco
+                cached_weather = await cache_service.get(grid_key)
+                if cached_weather:
+                    logger.debug(f"✓ Cache HIT (Grid: {grid_key})")
+                    return cached_weather
+                logger.debug(f"⚠ Cache MISS (Grid: {grid_key})")
             except Exception as e:
                 logger.warning(f"⚠️  Cache check failed: {e}")
 
+        # Sob pressão de rate limit, a célula vizinha em cache evita a espera por token
+        limiter = rate_limiters.get("openweather")
+        if use_nearest and limiter is not None and limiter.under_pressure():
+            nearest = await self._nearest_cached_weather(lat, lon, grid_key)
+            if nearest is not None:
+                return nearest
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
+            client = http_clients.get("openweather")
+            response = await self.retry_policy.run(
+                lambda: client.get(
                     f"{self.base_url}/weather",
                     params={
                         "lat": lat,
@@ -139,81 +174,144 @@ class WeatherService:
                         "units": "metric",  # Celsius
                         "lang": "pt_br",
                     },
+                    timeout=self.timeout,
                 )
+            )
 
-                # Valida status code
-                if response.status_code == 401:
-                    logger.error("❌ OpenWeather API: Chave inválida (401)")
-                    return self._get_fallback_weather()
-
-                if response.status_code == 429:
-                    logger.error("❌ OpenWeather API: Rate limit excedido (429)")
-                    return self._get_fallback_weather()
-
-                if response.status_code != 200:
-                    logger.error(
-                        f"❌ OpenWeather API error: HTTP {response.status_code}"
-                    )
-                    return self._get_fallback_weather()
-
-                # Parse JSON
-                data = response.json()
-
-                # Extrai dados relevantes
-                weather_data = {
-                    "temperatura_atual": data["main"]["temp"],
-                    "temperatura_min": data["main"]["temp_min"],
-                    "temperatura_max": data["main"]["temp_max"],
-                    "umidade": data["main"]["humidity"],
-                    "descricao": data["weather"][0]["description"],
-                    "icon": data["weather"][0]["icon"],
-                    "fonte": "OpenWeatherMap",
-                }
+            # Valida status code
+            if response.status_code == 401:
+                logger.error("❌ OpenWeather API: Chave inválida (401)")
+                return await self._degraded_weather(lat, lon, grid_key, use_nearest)
+
+            if response.status_code == 429:
+                logger.error("❌ OpenWeather API: Rate limit excedido (429)")
+                return await self._degraded_weather(lat, lon, grid_key, use_nearest)
 
-                logger.success(
-                    f"✓ Clima obtido: {weather_data['temperatura_atual']}°C, "
-                    f"{weather_data['descricao']}"
+            if response.status_code != 200:
+                logger.error(
+                    f"❌ OpenWeather API error: HTTP {response.status_code}"
                 )
-                
-                # ════════════════════════════════════════════════════════════
-                # SMART GRID CACHE SAVE
-                # ════════════════════════════════════════════════════════════
-                if use_cache:
-                    try:
-                        from app.services import cache_service
-                        
-                        if cache_service.is_connected:
-                            grid_key = self._get_grid_key(lat, lon)
-                            # TTL: 2 horas (7200s) - clima não muda rapidamente
-                            await cache_service.redis_client.setex(
-                                grid_key, 7200, json.dumps(weather_data)
-                            )
-                            logger.info(f"✓ Cache SAVED (Grid: {grid_key}, TTL: 2h)")
-                    except Exception as e:
-                        logger.warning(f"⚠️  Cache save failed: {e}")
-
-                return weather_data
+                return await self._degraded_weather(lat, lon, grid_key, use_nearest)
+
+            # Parse JSON
+            data = response.json()
+
+            # Extrai dados relevantes
+            weather_data = {
+                "temperatura_atual": data["main"]["temp"],
+                "temperatura_min": data["main"]["temp_min"],
+                "temperatura_max": data["main"]["temp_max"],
+                "umidade": data["main"]["humidity"],
+                "descricao": data["weather"][0]["description"],
+                "icon": data["weather"][0]["icon"],
+                "fonte": "OpenWeatherMap",
+            }
+
+            logger.success(
+                f"✓ Clima obtido: {weather_data['temperatura_atual']}°C, "
+                f"{weather_data['descricao']}"
+            )
+
+            # ════════════════════════════════════════════════════════════
+            # SMART GRID CACHE SAVE
+            # ════════════════════════════════════════════════════════════
+            if use_cache:
+                try:
+                    from app.services import cache_service
+
+                    # TTL: 2 horas - clima não muda rapidamente
+                    if await cache_service.set(
+                        grid_key, weather_data, ttl=ttl_policy.WEATHER_TTL
+                    ):
+                        self._index_cell(grid_key, lat, lon)
+                        logger.debug(
+                            f"✓ Cache SAVED (Grid: {grid_key}, TTL: {ttl_policy.WEATHER_TTL}s)"
+                        )
+                except Exception as e:
+                    logger.warning(f"⚠️  Cache save failed: {e}")
+
+            return weather_data
+
+        except CircuitOpenError:
+            logger.info("🔌 OpenWeather indisponível (breaker aberto)")
+            return await self._degraded_weather(lat, lon, grid_key, use_nearest)
+
+        except RateLimitExceeded as e:
+            logger.info(f"🚦 OpenWeather não chamado: {e.reason}")
+            return await self._degraded_weather(lat, lon, grid_key, use_nearest)
 
         except httpx.TimeoutException:
             logger.error("❌ OpenWeather API timeout (10s)")
-            return self._get_fallback_weather()
+            return await self._degraded_weather(lat, lon, grid_key, use_nearest)
 
         except httpx.HTTPError as e:
             logger.error(f"❌ OpenWeather HTTP error: {e}")
-            return self._get_fallback_weather()
+            return await self._degraded_weather(lat, lon, grid_key, use_nearest)
 
         except KeyError as e:
             logger.error(f"❌ OpenWeather response parsing error: {e}")
-            return self._get_fallback_weather()
+            return await self._degraded_weather(lat, lon, grid_key, use_nearest)
 
         except Exception as e:
             logger.error(f"❌ Unexpected error fetching weather: {e}")
-            return self._get_fallback_weather()
+            return await self._degraded_weather(lat, lon, grid_key, use_nearest)
+
+    async def _nearest_cached_weather(
+        self, lat: float, lon: float, grid_key: str
+    ) -> Optional[dict]:
+        """
+        Clima da célula em cache mais próxima (dentro de WEATHER_NEAREST_RADIUS_KM).
+
+        Returns:
+            dict: Dados da célula vizinha, com a distância no campo "fonte"
+            None: Se nenhuma célula próxima estiver em cache
+        """
+        from app.services.weather_grid import weather_grid
+
+        found = await weather_grid.nearest_cached(
+            lat, lon, settings.weather_nearest_radius_km, exclude=grid_key
+        )
+        if found is None:
+            return None
+
+        weather, distance_km = found
+        metrics.incr("weather_nearest_cell_served_total")
+        logger.info(f"📍 Usando célula vizinha em cache ({distance_km:.1f} km)")
+        return {**weather, "fonte": f"{weather['fonte']} (célula vizinha a {distance_km:.1f} km)"}
+
+    @staticmethod
+    def _index_cell(grid_key: str, lat: float, lon: float) -> None:
+        """Registra a célula gravada no índice espacial (vizinhas em cache)."""
+        from app.services.weather_grid import weather_grid
+
+        weather_grid.register_cell(grid_key, lat, lon)
+
+    async def _degraded_weather(
+        self, lat: float, lon: float, grid_key: str, use_nearest: bool
+    ) -> dict:
+        """Célula vizinha em cache, se houver; senão, a média histórica."""
+        if use_nearest:
+            nearest = await self._nearest_cached_weather(lat, lon, grid_key)
+            if nearest is not None:
+                return nearest
+        return self._get_fallback_weather()
+
+    @staticmethod
+    def _name_key(city_name: str, state: str) -> str:
+        """Chave do nome já resolvido: "weather:name:{UF}:{nome normalizado}"."""
+        return f"weather:name:{state.upper().strip()}:{normalize_text(city_name)}"
 
     async def get_weather_by_city_name(self, city_name: str, state: str) -> dict:
         """
         Busca clima por nome da cidade (fallback se não tiver coordenadas).
 
+        O nome é resolvido para coordenadas e o clima vem do Smart Grid
+        Cache, com o mesmo custo de get_current_weather:
+            1. Índice de nomes do CitiesService
+            2. Cache de nomes já resolvidos (coordenadas, ou entrada
+               negativa para nomes que o OpenWeather não conhece)
+            3. OpenWeather por nome, uma vez por nome
+
         Args:
             city_name: Nome da cidade (ex: "São Paulo")
             state: Sigla do estado (ex: "SP")
@@ -226,9 +324,41 @@ class WeatherService:
         """
         logger.info(f"🌦️  Buscando clima por nome: {city_name}, {state}")
 
+        city = cities_service.get_city_by_name(city_name, state)
+        if city and city.get("latitude") is not None and city.get("longitude") is not None:
+            return await self.get_current_weather(city["latitude"], city["longitude"])
+
+        from app.services import cache_service
+
+        name_key = self._name_key(city_name, state)
+        try:
+            resolved = await cache_service.get(name_key)
+        except Exception as e:
+            logger.warning(f"⚠️  Cache check failed: {e}")
+            resolved = None
+
+        if resolved:
+            if resolved.get("unknown"):
+                metrics.incr("weather_unknown_city_name_hits_total")
+                logger.debug(f"⏭️  Cidade desconhecida em cache: {city_name}, {state}")
+                return self._get_fallback_weather()
+            return await self.get_current_weather(resolved["lat"], resolved["lon"])
+
+        return await self._fetch_by_city_name(city_name, state, name_key)
+
+    async def _fetch_by_city_name(self, city_name: str, state: str, name_key: str) -> dict:
+        """
+        Busca o clima por nome no OpenWeather e guarda a resolução do nome.
+
+        Sucesso: coordenadas em ``name_key`` e clima na célula do grid.
+        HTTP 404: entrada negativa em ``name_key`` (nome desconhecido).
+        """
+        from app.services import cache_service
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
+            client = http_clients.get("openweather")
+            response = await self.retry_policy.run(
+                lambda: client.get(
                     f"{self.base_url}/weather",
                     params={
                         "q": f"{city_name},{state},BR",
@@ -236,29 +366,49 @@ class WeatherService:
                         "units": "metric",
                         "lang": "pt_br",
                     },
+                    timeout=self.timeout,
                 )
+            )
 
-                if response.status_code != 200:
-                    logger.error(
-                        f"❌ OpenWeather API error: HTTP {response.status_code}"
-                    )
-                    return self._get_fallback_weather()
-
-                data = response.json()
-
-                weather_data = {
-                    "temperatura_atual": data["main"]["temp"],
-                    "temperatura_min": data["main"]["temp_min"],
-                    "temperatura_max": data["main"]["temp_max"],
-                    "umidade": data["main"]["humidity"],
-                    "descricao": data["weather"][0]["description"],
-                    "icon": data["weather"][0]["icon"],
-                    "fonte": "OpenWeatherMap",
-                }
+            if response.status_code == 404:
+                logger.warning(f"⚠️  OpenWeather não conhece a cidade: {city_name}, {state}")
+                await cache_service.set(
+                    name_key, {"unknown": True}, ttl=ttl_policy.UNKNOWN_CITY_NAME_TTL
+                )
+                return self._get_fallback_weather()
 
-                logger.success(f"✓ Clima obtido para {city_name}")
+            if response.status_code != 200:
+                logger.error(
+                    f"❌ OpenWeather API error: HTTP {response.status_code}"
+                )
+                return self._get_fallback_weather()
+
+            data = response.json()
+
+            weather_data = {
+                "temperatura_atual": data["main"]["temp"],
+                "temperatura_min": data["main"]["temp_min"],
+                "temperatura_max": data["main"]["temp_max"],
+                "umidade": data["main"]["humidity"],
+                "descricao": data["weather"][0]["description"],
+                "icon": data["weather"][0]["icon"],
+                "fonte": "OpenWeatherMap",
+            }
+
+            logger.success(f"✓ Clima obtido para {city_name}")
+
+            # Próximas buscas pelo nome (ou por vizinhas) saem da célula do grid
+            lat, lon = data["coord"]["lat"], data["coord"]["lon"]
+            grid_key = self._get_grid_key(lat, lon)
+            await cache_service.set_many(
+                {
+                    name_key: ({"lat": lat, "lon": lon}, ttl_policy.CITY_NAME_TTL),
+                    grid_key: (weather_data, ttl_policy.WEATHER_TTL),
+                }
+            )
+            self._index_cell(grid_key, lat, lon)
 
-                return weather_data
+            return weather_data
 
         except Exception as e:
             logger.error(f"❌ Error fetching weather by city name: {e}")
@@ -286,13 +436,21 @@ class WeatherService:
             "fonte": "Fallback (API indisponível)",
         }
 
-    async def get_forecast_5_days(self, lat: float, lon: float) -> List[Dict]:
+    async def get_forecast_5_days(
+        self,
+        lat: float,
+        lon: float,
+        use_cache: bool = True,
+        grid_key: Optional[str] = None,
+    ) -> List[Dict]:
         """
         Busca previsão de 5 dias (3h intervals).
 
         Args:
             lat: Latitude
             lon: Longitude
+            use_cache: Se True, usa a previsão em cache da célula do grid
+            grid_key: Célula já conhecida (weather_grid.cell_for_city)
 
         Returns:
             list[dict]: Lista com previsões de 3 em 3 horas
@@ -305,10 +463,24 @@ class WeatherService:
             Retorna ~40 pontos de dados (5 dias * 8 pontos/dia)
         """
         logger.info(f"📅 Buscando previsão 5 dias (lat={lat}, lon={lon})...")
+        # Mesma célula do clima atual: cidades vizinhas compartilham a previsão
+        forecast_key = f"{grid_key or self._get_grid_key(lat, lon)}:forecast"
+
+        if use_cache:
+            try:
+                from app.services import cache_service
+
+                cached_forecast = await cache_service.get(forecast_key)
+                if cached_forecast:
+                    logger.debug(f"✓ Cache HIT (Previsão: {forecast_key})")
+                    return cached_forecast
+            except Exception as e:
+                logger.warning(f"⚠️  Cache check failed: {e}")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
+            client = http_clients.get("openweather")
+            response = await self.retry_policy.run(
+                lambda: client.get(
                     f"{self.base_url}/forecast",
                     params={
                         "lat": lat,
@@ -317,32 +489,41 @@ class WeatherService:
                         "units": "metric",
                         "lang": "pt_br",
                     },
+                    timeout=self.timeout,
                 )
+            )
+
+            if response.status_code != 200:
+                logger.error(
+                    f"❌ OpenWeather Forecast API error: HTTP {response.status_code}"
+                )
+                return []
+
+            data = response.json()
+
+            # Processa lista de previsões
+            forecasts = []
+            for item in data["list"]:
+                forecasts.append(
+                    {
+                        "timestamp": item["dt"],
+                        "data_hora": item["dt_txt"],
+                        "temperatura": item["main"]["temp"],
+                        "temperatura_min": item["main"]["temp_min"],
+                        "temperatura_max": item["main"]["temp_max"],
+                        "umidade": item["main"]["humidity"],
+                        "descricao": item["weather"][0]["description"],
+                    }
+                )
+
+            logger.success(f"✓ Previsão obtida: {len(forecasts)} pontos")
+
+            if use_cache and forecasts:
+                from app.services import cache_service
+
+                await cache_service.set(forecast_key, forecasts, ttl=ttl_policy.FORECAST_TTL)
 
-                if response.status_code != 200:
-                    logger.error(
-                        f"❌ OpenWeather Forecast API error: HTTP {response.status_code}"
-                    )
-                    return []
-
-                data = response.json()
-
-                # Processa lista de previsões
-                forecasts = []
-                for item in data["list"]:
-                    forecasts.append(
-                        {
-                            "timestamp": item["dt"],
-                            "data_hora": item["dt_txt"],
-                            "temperatura": item["main"]["temp"],
-                            "umidade": item["main"]["humidity"],
-                            "descricao": item["weather"][0]["description"],
-                        }
-                    )
-
-                logger.success(f"✓ Previsão obtida: {len(forecasts)} pontos")
-
-                return forecasts
+            return forecasts
 
         except Exception as e:
             logger.error(f"❌ Error fetching forecast: {e}")
@@ -0,0 +1,224 @@
+"""
+Teste do CircuitBreaker (sem rede): CLOSED -> OPEN -> HALF_OPEN -> CLOSED.
+
+As chamadas passam pelo CircuitBreakerTransport sobre um transporte falso
+que devolve status/erros de um roteiro.
+
+Usage:
+    python test_circuit_breaker.py
+"""
+
+import asyncio
+from typing import List, Union
+
+import httpx
+
+from app.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerTransport,
+    CircuitOpenError,
+)
+from app.core.config import settings
+
+# Status HTTP, exceção a levantar ou segundos de espera antes de um 200
+Outcome = Union[int, Exception, float]
+
+
+class FakeTransport(httpx.AsyncBaseTransport):
+    """Transporte que responde conforme o roteiro (uma entrada por chamada)."""
+
+    def __init__(self, outcomes: List[Outcome]):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        outcome = self.outcomes[self.calls]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, float):
+            await asyncio.sleep(outcome)
+            return httpx.Response(200, request=request)
+        return httpx.Response(outcome, request=request)
+
+
+def _breaker(outcomes: List[Outcome], slow_call_threshold: float = 1.0):
+    breaker = CircuitBreaker("teste", slow_call_threshold)
+    fake = FakeTransport(outcomes)
+    return breaker, fake, CircuitBreakerTransport(fake, breaker)
+
+
+async def _send(transport: CircuitBreakerTransport) -> Union[int, str]:
+    """Status da resposta, ou o nome da exceção."""
+    try:
+        response = await transport.handle_async_request(httpx.Request("GET", "http://upstream"))
+        return response.status_code
+    except (httpx.TransportError, CircuitOpenError) as e:
+        return type(e).__name__
+
+
+def _expire_open(breaker: CircuitBreaker) -> None:
+    """Simula a passagem de CIRCUIT_BREAKER_OPEN_SECONDS."""
+    breaker._opened_at -= settings.circuit_breaker_open_seconds + 1
+
+
+def test_opens_on_failure_rate() -> None:
+    """Com MIN_CALLS chamadas e >= FAILURE_RATE de falhas, abre e recusa."""
+    breaker, fake, transport = _breaker([200, 200, 503, 429, httpx.ConnectError("x"), 200])
+
+    async def scenario() -> None:
+        for _ in range(settings.circuit_breaker_min_calls - 1):
+            await _send(transport)
+            assert breaker.state == CLOSED, "abriu antes de MIN_CALLS"
+        await _send(transport)
+        assert breaker.state == OPEN
+
+        assert await _send(transport) == "CircuitOpenError"
+        assert fake.calls == settings.circuit_breaker_min_calls, "recusa chamou o upstream"
+
+    asyncio.run(scenario())
+
+
+def test_client_errors_count_as_success() -> None:
+    """4xx (exceto 429) mostram o upstream de pé: não abrem o breaker."""
+    breaker, _, transport = _breaker([404] * 10)
+
+    async def scenario() -> None:
+        for _ in range(10):
+            assert await _send(transport) == 404
+        assert breaker.state == CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_opens_on_slow_call_rate() -> None:
+    """Chamadas acima do limite de lentidão também abrem o breaker."""
+    breaker, _, transport = _breaker([0.02] * 10, slow_call_threshold=0.01)
+
+    async def scenario() -> None:
+        for _ in range(settings.circuit_breaker_min_calls):
+            await _send(transport)
+        assert breaker.state == OPEN
+
+    asyncio.run(scenario())
+
+
+def test_half_open_probes_close_the_circuit() -> None:
+    """OPEN -> HALF_OPEN após o tempo; sondas com sucesso -> CLOSED."""
+    probes = settings.circuit_breaker_half_open_probes
+    breaker, _, transport = _breaker([503] * 5 + [200] * probes)
+
+    async def scenario() -> None:
+        for _ in range(5):
+            await _send(transport)
+        assert breaker.state == OPEN
+
+        _expire_open(breaker)
+        for i in range(probes):
+            assert await _send(transport) == 200
+            expected = CLOSED if i == probes - 1 else HALF_OPEN
+            assert breaker.state == expected, f"sonda {i + 1}: {breaker.state}"
+        assert breaker.stats()["calls"] == 0, "janela não foi zerada ao fechar"
+
+    asyncio.run(scenario())
+
+
+def test_half_open_failure_reopens() -> None:
+    """Qualquer sonda com falha volta para OPEN."""
+    breaker, _, transport = _breaker([503] * 5 + [503])
+
+    async def scenario() -> None:
+        for _ in range(5):
+            await _send(transport)
+        _expire_open(breaker)
+
+        await _send(transport)
+        assert breaker.state == OPEN
+        assert await _send(transport) == "CircuitOpenError"
+
+    asyncio.run(scenario())
+
+
+def test_half_open_limits_concurrent_probes() -> None:
+    """Em HALF_OPEN só HALF_OPEN_PROBES chamadas simultâneas passam."""
+    probes = settings.circuit_breaker_half_open_probes
+    breaker, _, transport = _breaker([503] * 5 + [0.05] * (probes + 1))
+
+    async def scenario() -> None:
+        for _ in range(5):
+            await _send(transport)
+        _expire_open(breaker)
+
+        results = await asyncio.gather(*(_send(transport) for _ in range(probes + 1)))
+        assert results.count(200) == probes
+        assert results.count("CircuitOpenError") == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_call_releases_without_failure() -> None:
+    """Chamada cancelada libera a vaga (release) e não conta como falha."""
+    probes = settings.circuit_breaker_half_open_probes
+    breaker, _, transport = _breaker([503] * 5 + [5.0] * probes + [200] * probes)
+
+    async def scenario() -> None:
+        for _ in range(5):
+            await _send(transport)
+        _expire_open(breaker)
+
+        # Ocupa todas as vagas de sonda com chamadas que não terminam
+        hanging = [asyncio.ensure_future(_send(transport)) for _ in range(probes)]
+        await asyncio.sleep(0.01)
+        assert await _send(transport) == "CircuitOpenError"
+
+        for task in hanging:
+            task.cancel()
+        await asyncio.gather(*hanging, return_exceptions=True)
+
+        # Vagas devolvidas e nenhuma falha registrada: as sondas seguintes fecham
+        assert breaker.state == HALF_OPEN
+        for _ in range(probes):
+            assert await _send(transport) == 200
+        assert breaker.state == CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_call_in_closed_state_is_not_recorded() -> None:
+    """No estado CLOSED o cancelamento não entra na janela."""
+    breaker, _, transport = _breaker([5.0])
+
+    async def scenario() -> None:
+        task = asyncio.ensure_future(_send(transport))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert breaker.state == CLOSED
+        assert breaker.stats()["calls"] == 0
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (
+        test_opens_on_failure_rate,
+        test_client_errors_count_as_success,
+        test_opens_on_slow_call_rate,
+        test_half_open_probes_close_the_circuit,
+        test_half_open_failure_reopens,
+        test_half_open_limits_concurrent_probes,
+        test_cancelled_call_releases_without_failure,
+        test_cancelled_call_in_closed_state_is_not_recorded,
+    ):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,217 @@
+"""
+Teste das buscas condicionais ao InfoDengue (sem rede e sem Redis).
+
+"Não modificado" é um 304 com validadores anteriores ou um 200 com o
+mesmo SHA-256 do corpo anterior. Os validadores são guardados pela
+semana inicial do intervalo, então a busca seguinte (com a semana final
+já adiante) ainda encontra os validadores da anterior.
+
+Usage:
+    python test_conditional_fetch.py
+"""
+
+import asyncio
+import json
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from unittest import mock
+
+import httpx
+
+from app.core.conditional_fetch import (
+    NOT_MODIFIED,
+    check_response,
+    conditional_headers,
+    content_hash,
+)
+from app.core.http_clients import http_clients
+from app.core.metrics import metrics
+from app.services.cache_service import cache_service
+from app.services.infodengue_service import infodengue_service
+
+GEOCODE = "4106902"
+BODY = json.dumps([{"data_iniSE": 1704067200000, "casos": 12}]).encode()
+
+
+def _response(status: int, content: bytes = b"", headers: Optional[Dict] = None) -> httpx.Response:
+    return httpx.Response(
+        status, content=content, headers=headers or {}, request=httpx.Request("GET", "http://x")
+    )
+
+
+def test_conditional_headers() -> None:
+    """If-None-Match / If-Modified-Since só para os validadores presentes."""
+    assert conditional_headers(None) == {}
+    assert conditional_headers({"hash": "abc"}) == {}
+    assert conditional_headers({"etag": '"v1"'}) == {"If-None-Match": '"v1"'}
+    assert conditional_headers(
+        {"etag": '"v1"', "last_modified": "Sun, 05 Jan 2025 00:00:00 GMT"}
+    ) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Sun, 05 Jan 2025 00:00:00 GMT",
+    }
+
+
+def test_304_is_not_modified() -> None:
+    """304 com validadores anteriores: não modificado, validadores mantidos."""
+    metrics.reset()
+    previous = {"etag": '"v1"', "last_modified": None, "hash": content_hash(BODY)}
+
+    not_modified, validators = check_response("infodengue", _response(304), previous)
+
+    assert not_modified
+    assert validators["etag"] == '"v1"' and validators["hash"] == previous["hash"]
+    assert "checked_at" in validators
+    assert metrics.value("upstream_not_modified_total", upstream="infodengue", via="304") == 1
+
+
+def test_304_without_previous_is_not_trusted() -> None:
+    """304 sem validadores guardados não vira "não modificado"."""
+    not_modified, _ = check_response("infodengue", _response(304), None)
+    assert not not_modified
+
+
+def test_200_same_hash_is_not_modified() -> None:
+    """200 com o mesmo corpo (sem ETag): não modificado pelo hash."""
+    metrics.reset()
+    previous = {"etag": None, "last_modified": None, "hash": content_hash(BODY)}
+
+    not_modified, validators = check_response("infodengue", _response(200, BODY), previous)
+
+    assert not_modified
+    assert validators["hash"] == content_hash(BODY)
+    assert metrics.value("upstream_not_modified_total", upstream="infodengue", via="hash") == 1
+
+
+def test_200_same_hash_keeps_new_etag() -> None:
+    """Mesmo corpo com ETag novo: não modificado, mas guarda o ETag novo."""
+    previous = {"etag": '"v1"', "last_modified": None, "hash": content_hash(BODY)}
+
+    not_modified, validators = check_response(
+        "infodengue", _response(200, BODY, {"ETag": '"v2"'}), previous
+    )
+
+    assert not_modified
+    assert validators["etag"] == '"v2"'
+
+
+def test_200_changed_body_is_modified() -> None:
+    """Corpo diferente (ou primeira busca): modificado."""
+    previous = {"etag": None, "last_modified": None, "hash": content_hash(BODY)}
+    changed = BODY.replace(b"12", b"13")
+
+    assert not check_response("infodengue", _response(200, changed), previous)[0]
+    assert not check_response("infodengue", _response(200, BODY), None)[0]
+
+
+class FakeCache:
+    """get/set em memória no lugar do Redis."""
+
+    def __init__(self):
+        self.data: Dict[str, object] = {}
+
+    async def get(self, key: str):
+        return self.data.get(key)
+
+    async def set(self, key: str, value, ttl: Optional[int] = None) -> bool:
+        self.data[key] = value
+        return True
+
+
+class FakeInfoDengue:
+    """Upstream com ETag opcional; responde 304 ao If-None-Match certo."""
+
+    def __init__(self, etag: Optional[str]):
+        self.etag = etag
+        self.body = BODY
+        self.requests: List[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        headers = {"ETag": self.etag} if self.etag else {}
+        return httpx.Response(200, content=self.body, headers=headers)
+
+
+async def _fetch_all(upstream: FakeInfoDengue, ranges: List[tuple]) -> List:
+    """fetch_raw_weeks(conditional=True) para cada (primeira, última) semana."""
+    cache = FakeCache()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+    results = []
+    try:
+        with mock.patch.object(cache_service, "get", cache.get), \
+             mock.patch.object(cache_service, "set", cache.set), \
+             mock.patch.object(http_clients, "get", lambda name: client):
+            for first_week, last_week in ranges:
+                fetched, failure = await infodengue_service.fetch_raw_weeks(
+                    GEOCODE, first_week, last_week, conditional=True
+                )
+                assert failure is None, failure
+                results.append(fetched)
+    finally:
+        await client.aclose()
+    return results
+
+
+FIRST = date(2025, 1, 5)
+RANGES = [
+    (FIRST, FIRST + timedelta(weeks=4)),
+    # Semana seguinte: o fim andou, o início é o mesmo
+    (FIRST, FIRST + timedelta(weeks=5)),
+]
+
+
+def test_fetch_304_with_stable_start() -> None:
+    """Segunda busca com o fim adiante ainda manda If-None-Match e recebe 304."""
+    upstream = FakeInfoDengue(etag='"v1"')
+
+    first, second = asyncio.run(_fetch_all(upstream, RANGES))
+
+    assert first == json.loads(BODY)
+    assert upstream.requests[1].headers.get("If-None-Match") == '"v1"'
+    assert second is NOT_MODIFIED
+
+
+def test_fetch_same_hash_with_stable_start() -> None:
+    """Sem ETag: o 200 com o mesmo corpo vira NOT_MODIFIED pelo hash."""
+    upstream = FakeInfoDengue(etag=None)
+
+    first, second = asyncio.run(_fetch_all(upstream, RANGES))
+
+    assert first == json.loads(BODY)
+    assert "If-None-Match" not in upstream.requests[1].headers
+    assert second is NOT_MODIFIED
+
+
+def test_fetch_other_start_is_full() -> None:
+    """Outro início de intervalo não usa os validadores do anterior."""
+    upstream = FakeInfoDengue(etag='"v1"')
+    other = FIRST + timedelta(weeks=1)
+
+    results = asyncio.run(_fetch_all(upstream, [RANGES[0], (other, RANGES[0][1])]))
+
+    assert "If-None-Match" not in upstream.requests[1].headers
+    assert results[1] == json.loads(BODY)
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (
+        test_conditional_headers,
+        test_304_is_not_modified,
+        test_304_without_previous_is_not_trusted,
+        test_200_same_hash_is_not_modified,
+        test_200_same_hash_keeps_new_etag,
+        test_200_changed_body_is_modified,
+        test_fetch_304_with_stable_start,
+        test_fetch_same_hash_with_stable_start,
+        test_fetch_other_start_is_full,
+    ):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,244 @@
+"""
+Teste do DiskCache e do failover Redis -> disco do CacheService.
+
+O SQLite fica num diretório temporário e o "Redis" é um cliente em
+memória que pode ser derrubado (ConnectionError) a qualquer momento.
+O relógio do DiskCache é falso, para expirar entradas sem esperar.
+
+Usage:
+    python test_disk_cache.py
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest import mock
+
+import redis.asyncio as redis
+
+from app.services.cache_service import CacheService
+from app.services.disk_cache import PURGE_EVERY_WRITES, DiskCache
+
+
+class FakeClock:
+    """Substitui o módulo time dentro de disk_cache."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedis"):
+        self.client = client
+        self.ops: List[tuple] = []
+
+    def setex(self, name: str, time: int, value: bytes) -> None:
+        self.ops.append((name, value))
+
+    async def execute(self) -> List[bool]:
+        self.client._check()
+        for name, value in self.ops:
+            self.client.data[name] = value
+        return [True] * len(self.ops)
+
+
+class FakeRedis:
+    """Redis em memória (MGET/SETEX em pipeline) que pode cair."""
+
+    def __init__(self):
+        self.data: Dict[str, bytes] = {}
+        self.down = False
+
+    def _check(self) -> None:
+        if self.down:
+            raise redis.ConnectionError("Redis fora do ar")
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+
+def _disk(tmp: str, max_bytes: int = 10 * 1024 * 1024) -> DiskCache:
+    return DiskCache(Path(tmp) / "cache.db", max_bytes=max_bytes)
+
+
+def _service(disk: DiskCache, client: FakeRedis) -> CacheService:
+    service = CacheService()
+    service.disk_cache = disk
+    service.redis_client = client
+    service.is_connected = True
+    return service
+
+
+def test_ttl_expiry() -> None:
+    """Entradas vencidas somem de get/ttl/dirty_items."""
+    clock = FakeClock()
+
+    async def scenario(disk: DiskCache) -> None:
+        await disk.set("curta", b"a", ttl=10)
+        await disk.set("longa", b"b", ttl=100)
+        assert await disk.get_many(["curta", "longa"]) == [b"a", b"b"]
+        assert await disk.ttl("curta") == 10
+
+        clock.now += 11
+        assert await disk.get_many(["curta", "longa"]) == [None, b"b"]
+        assert await disk.ttl("curta") == -2
+        assert [key for key, _, _ in await disk.dirty_items()] == ["longa"]
+        assert await disk.expire_many({"curta": 50, "longa": 50}) == [False, True]
+
+    with tempfile.TemporaryDirectory() as tmp, \
+         mock.patch("app.services.disk_cache.time", clock):
+        disk = _disk(tmp)
+        try:
+            asyncio.run(scenario(disk))
+        finally:
+            disk.close()
+
+
+def test_dirty_only_during_outage() -> None:
+    """Write-through com o Redis no ar fica limpo; só a queda marca dirty."""
+    client = FakeRedis()
+
+    async def scenario(service: CacheService) -> None:
+        assert await service._tiered_set_many({"antes": (b"1", 60)})
+        assert client.data == {"antes": b"1"}
+
+        client.down = True
+        assert await service._tiered_set_many({"durante": (b"2", 60)})
+        assert not service._redis_ready(), "ConnectionError não ativou o failover"
+
+        values, tier = await service._tiered_get_many(["antes", "durante"])
+        assert tier == "disk"
+        assert values == [b"1", b"2"]
+
+        dirty = await service.disk_cache.dirty_items()
+        assert [(key, value) for key, value, _ in dirty] == [("durante", b"2")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = _disk(tmp)
+        try:
+            asyncio.run(scenario(_service(disk, client)))
+        finally:
+            disk.close()
+
+
+def test_resync_marks_clean() -> None:
+    """Redis de volta: _resync reenvia as pendências e mark_clean as limpa."""
+    client = FakeRedis()
+
+    async def scenario(service: CacheService) -> None:
+        client.down = True
+        await service._tiered_set_many({"a": (b"1", 60), "b": (b"2", 60)})
+        assert (await service.disk_cache.stats())["pending_resync"] == 2
+
+        client.down = False
+        service.is_connected = True
+        await service._resync()
+
+        assert client.data == {"a": b"1", "b": b"2"}
+        assert await service.disk_cache.dirty_items() == []
+        assert (await service.disk_cache.stats())["pending_resync"] == 0
+
+        # Nada pendente: um segundo resync não regrava
+        client.data.clear()
+        await service._resync()
+        assert client.data == {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = _disk(tmp)
+        try:
+            asyncio.run(scenario(_service(disk, client)))
+        finally:
+            disk.close()
+
+
+def test_mark_clean_only_given_keys() -> None:
+    """mark_clean afeta só as chaves informadas."""
+
+    async def scenario(disk: DiskCache) -> None:
+        await disk.set_many({"a": (b"1", 60), "b": (b"2", 60), "c": (b"3", 60)})
+        await disk.mark_clean(["a", "c"])
+        assert [key for key, _, _ in await disk.dirty_items()] == ["b"]
+        assert await disk.get_many(["a", "b", "c"]) == [b"1", b"2", b"3"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = _disk(tmp)
+        try:
+            asyncio.run(scenario(disk))
+        finally:
+            disk.close()
+
+
+def test_purge_by_size_removes_oldest() -> None:
+    """Acima de max_bytes, a limpeza remove ~25% das entradas mais antigas."""
+    clock = FakeClock()
+    value = b"x" * 100
+
+    async def scenario(disk: DiskCache) -> None:
+        # Uma gravação por "segundo" até disparar a limpeza
+        for i in range(PURGE_EVERY_WRITES):
+            clock.now += 1
+            await disk.set(f"k{i:03d}", value, ttl=3600)
+
+        stats = await disk.stats()
+        assert stats["entries"] == PURGE_EVERY_WRITES - PURGE_EVERY_WRITES // 4, stats
+        oldest = [f"k{i:03d}" for i in range(PURGE_EVERY_WRITES // 4)]
+        assert await disk.get_many(oldest) == [None] * len(oldest)
+        assert await disk.get(f"k{PURGE_EVERY_WRITES - 1:03d}") == value
+
+    with tempfile.TemporaryDirectory() as tmp, \
+         mock.patch("app.services.disk_cache.time", clock):
+        disk = _disk(tmp, max_bytes=len(value) * PURGE_EVERY_WRITES // 2)
+        try:
+            asyncio.run(scenario(disk))
+        finally:
+            disk.close()
+
+
+def test_purge_drops_expired_first() -> None:
+    """Dentro do limite, a limpeza só apaga as vencidas."""
+    clock = FakeClock()
+
+    async def scenario(disk: DiskCache) -> None:
+        await disk.set("vencida", b"v", ttl=1)
+        clock.now += 2
+        for i in range(PURGE_EVERY_WRITES):
+            await disk.set(f"k{i:03d}", b"x", ttl=3600)
+
+        conn = disk._connection()
+        assert conn.execute("SELECT COUNT(*) FROM cache WHERE key = 'vencida'").fetchone()[0] == 0
+        assert (await disk.stats())["entries"] == PURGE_EVERY_WRITES
+
+    with tempfile.TemporaryDirectory() as tmp, \
+         mock.patch("app.services.disk_cache.time", clock):
+        disk = _disk(tmp)
+        try:
+            asyncio.run(scenario(disk))
+        finally:
+            disk.close()
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (
+        test_ttl_expiry,
+        test_dirty_only_during_outage,
+        test_resync_marks_clean,
+        test_mark_clean_only_given_keys,
+        test_purge_by_size_removes_oldest,
+        test_purge_drops_expired_first,
+    ):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,191 @@
+"""
+Teste do calendário epidemiológico: tabela pré-calculada x aritmética.
+
+Cada dia de 1999 a 2042 é convertido pelas funções escalares e pelas
+vetorizadas (searchsorted na tabela) e comparado com uma implementação
+aritmética independente da regra do MMWR. Fora da tabela (2000-2040),
+as vetorizadas recusam e as escalares seguem pela aritmética.
+
+Usage:
+    python test_epiweek.py
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.core.epiweek import (
+    TABLE_FIRST_YEAR,
+    TABLE_LAST_YEAR,
+    anchored_epiweek,
+    date_to_epiweek,
+    dates_to_epiweek_ids,
+    epiweek_id,
+    epiweek_id_range,
+    epiweek_ids_from,
+    epiweek_ids_to_dates,
+    epiweek_starts,
+    epiweek_to_date,
+    shift_epiweek_ids,
+    weeks_in_year,
+)
+
+FIRST_DAY = date(1999, 1, 1)
+LAST_DAY = date(2042, 12, 31)
+
+
+def _se1_start(year: int) -> date:
+    """Domingo da semana que contém 4 de janeiro."""
+    jan4 = date(year, 1, 4)
+    return jan4 - timedelta(days=jan4.isoweekday() % 7)
+
+
+def _reference(d: date) -> Tuple[int, int, date]:
+    """(ano, semana, domingo de início) pela regra, sem tabela."""
+    year = max(y for y in (d.year - 1, d.year, d.year + 1) if _se1_start(y) <= d)
+    sunday = d - timedelta(days=d.isoweekday() % 7)
+    return year, (sunday - _se1_start(year)).days // 7 + 1, sunday
+
+
+def _all_days() -> List[date]:
+    return [FIRST_DAY + timedelta(days=i) for i in range((LAST_DAY - FIRST_DAY).days + 1)]
+
+
+def _in_table(d: date) -> bool:
+    return _se1_start(TABLE_FIRST_YEAR) <= d < _se1_start(TABLE_LAST_YEAR + 1)
+
+
+def _reference_weeks() -> Dict[int, date]:
+    """id YYYYWW -> domingo de início, para todas as semanas de 1999-2042."""
+    weeks: Dict[int, date] = {}
+    for d in _all_days():
+        year, week, sunday = _reference(d)
+        weeks[year * 100 + week] = sunday
+    return weeks
+
+
+def test_scalar_matches_arithmetic() -> None:
+    """date_to_epiweek/epiweek_id/epiweek_to_date em todos os dias."""
+    for d in _all_days():
+        year, week, sunday = _reference(d)
+        assert date_to_epiweek(d) == (year, week), d
+        assert epiweek_id(d) == year * 100 + week, d
+        assert epiweek_to_date(year, week) == sunday, d
+
+
+def test_vectorized_matches_arithmetic() -> None:
+    """dates_to_epiweek_ids/epiweek_starts nos dias dentro da tabela."""
+    days = [d for d in _all_days() if _in_table(d)]
+    expected = [_reference(d) for d in days]
+
+    ids = dates_to_epiweek_ids(np.array(days, dtype="datetime64[D]"))
+    assert ids.tolist() == [year * 100 + week for year, week, _ in expected]
+
+    starts = epiweek_starts(days)
+    assert starts.astype(date).tolist() == [sunday for _, _, sunday in expected]
+
+
+def test_vectorized_rejects_outside_table() -> None:
+    """Fora de 2000-2040 as vetorizadas levantam ValueError."""
+    outside = (
+        date(1999, 6, 1),
+        _se1_start(TABLE_FIRST_YEAR) - timedelta(days=1),
+        _se1_start(TABLE_LAST_YEAR + 1),
+        date(2042, 6, 1),
+    )
+    for d in outside:
+        try:
+            dates_to_epiweek_ids([d])
+            raise AssertionError(f"{d} aceito fora da tabela")
+        except ValueError:
+            pass
+
+
+def test_ids_to_dates_and_year_lengths() -> None:
+    """epiweek_ids_to_dates, weeks_in_year e ids inexistentes (semana 53)."""
+    reference = _reference_weeks()
+    weeks = {
+        week_id: sunday
+        for week_id, sunday in reference.items()
+        if TABLE_FIRST_YEAR * 100 < week_id < (TABLE_LAST_YEAR + 1) * 100
+    }
+    ids = sorted(weeks)
+    assert epiweek_ids_to_dates(ids).astype(date).tolist() == [weeks[i] for i in ids]
+
+    for year in range(1999, 2043):
+        expected = 53 if year * 100 + 53 in reference else 52
+        assert weeks_in_year(year) == expected, year
+    assert weeks_in_year(2020) == 53 and weeks_in_year(2026) == 52
+
+    for invalid in (202653, 202600, 202654):
+        try:
+            epiweek_ids_to_dates([invalid])
+            raise AssertionError(f"{invalid} aceito")
+        except ValueError:
+            pass
+
+
+def test_shift_across_year_boundaries() -> None:
+    """Avançar/recuar em toda a tabela bate com a sequência de semanas."""
+    ids = sorted(
+        week_id for week_id in _reference_weeks()
+        if TABLE_FIRST_YEAR * 100 < week_id < (TABLE_LAST_YEAR + 1) * 100
+    )
+    assert shift_epiweek_ids(ids[:-1], 1).tolist() == ids[1:]
+    assert shift_epiweek_ids(ids[1:], -1).tolist() == ids[:-1]
+    assert shift_epiweek_ids(ids[:-53], 53).tolist() == ids[53:]
+
+    assert shift_epiweek_ids(202652, [1, 2]).tolist() == [202701, 202702]
+    assert shift_epiweek_ids([202052, 202053], 1).tolist() == [202053, 202101]
+    assert shift_epiweek_ids(202101, [-1, -2]).tolist() == [202053, 202052]
+    assert shift_epiweek_ids(202701, -1).tolist() == 202652
+
+    for outside in ((ids[0], -1), (ids[-1], 1)):
+        try:
+            shift_epiweek_ids(*outside)
+            raise AssertionError(f"{outside} aceito fora da tabela")
+        except ValueError:
+            pass
+
+
+def test_ranges_and_composition() -> None:
+    """epiweek_id_range e epiweek_ids_from atravessando o ano."""
+    assert epiweek_id_range(202051, 202102).tolist() == [202051, 202052, 202053, 202101, 202102]
+    assert epiweek_id_range(202651, 202702).tolist() == [202651, 202652, 202701, 202702]
+    assert epiweek_ids_from([2020, 2026], [53, 52]).tolist() == [202053, 202652]
+    try:
+        epiweek_ids_from([2026], [53])
+        raise AssertionError("202653 aceito")
+    except ValueError:
+        pass
+
+
+def test_anchored_epiweek_blocks() -> None:
+    """O início ancorado fica fixo por ``block`` semanas e é um domingo."""
+    block = 13
+    start = anchored_epiweek(date(2026, 1, 1), block)
+    for i in range(block):
+        assert anchored_epiweek(start + timedelta(weeks=i, days=3), block) == start
+    assert anchored_epiweek(start + timedelta(weeks=block), block) == start + timedelta(weeks=block)
+    assert start.isoweekday() == 7
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (
+        test_scalar_matches_arithmetic,
+        test_vectorized_matches_arithmetic,
+        test_vectorized_rejects_outside_table,
+        test_ids_to_dates_and_year_lengths,
+        test_shift_across_year_boundaries,
+        test_ranges_and_composition,
+        test_anchored_epiweek_blocks,
+    ):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
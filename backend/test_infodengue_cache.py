@@ -0,0 +1,143 @@
+"""
+Teste do cache segmentado do InfoDengueService (sem Redis e sem rede).
+
+Regressão: uma busca só da semana atual (weeks=1, ainda não publicada)
+gravava a cabeça com latest_week=None e todas as janelas maiores passavam
+a sair 100% do fallback ("Estimativa") até a próxima publicação.
+
+Usage:
+    python test_infodengue_cache.py
+"""
+
+import asyncio
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+from unittest import mock
+
+from app.core import ttl_policy
+from app.core.epiweek import last_epiweeks
+from app.services.cache_service import cache_service
+from app.services.infodengue_service import infodengue_service
+
+GEOCODE = "4106902"
+
+
+class FakeCache:
+    """Cache em memória no lugar do Redis/disco (TTL ignorado)."""
+
+    def __init__(self):
+        self.data: Dict[str, object] = {}
+
+    async def get(self, key: str):
+        return self.data.get(key)
+
+    async def set(self, key: str, value, ttl: Optional[int] = None) -> bool:
+        self.data[key] = value
+        return True
+
+    async def get_many(self, keys: List[str]) -> List:
+        return [self.data.get(key) for key in keys]
+
+    async def set_many(self, items: Dict) -> bool:
+        for key, (value, _ttl) in items.items():
+            self.data[key] = value
+        return True
+
+
+class FakeUpstream:
+    """InfoDengue com todas as semanas publicadas, exceto as mais recentes."""
+
+    def __init__(self):
+        self.calls: List[tuple] = []
+        self.latest = ttl_policy.expected_latest_week()
+
+    async def fetch_raw_weeks(self, ibge_code: str, first_week: date, last_week: date, **kwargs):
+        self.calls.append((first_week, last_week))
+        rows = []
+        week = first_week
+        while week <= min(last_week, self.latest):
+            midnight = datetime.combine(week, time()) - datetime(1970, 1, 1)
+            rows.append(
+                {
+                    "data_iniSE": int(midnight.total_seconds()) * 1000,
+                    "casos": 42,
+                    "casos_est": 42.0,
+                    "nivel": 2,
+                }
+            )
+            week += timedelta(weeks=1)
+        return rows, None
+
+
+def _fabricated(rows: List[Dict], published_until: date) -> List[date]:
+    """Linhas de fallback em semanas que já estão publicadas no upstream."""
+    published = [w for w in last_epiweeks(date.today(), len(rows)) if w <= published_until]
+    real = {row["data"] for row in rows if row.get("fonte") == "InfoDengue"}
+    return [w for w in published if w.isoformat() not in real]
+
+
+async def _run(order: List[int]) -> Tuple[Dict[int, List[Dict]], "FakeUpstream"]:
+    """Chama get_historical_data na ordem dada com cache/upstream falsos."""
+    cache = FakeCache()
+    upstream = FakeUpstream()
+    results = {}
+
+    with mock.patch.object(cache_service, "get", cache.get), \
+         mock.patch.object(cache_service, "set", cache.set), \
+         mock.patch.object(cache_service, "get_many", cache.get_many), \
+         mock.patch.object(cache_service, "set_many", cache.set_many), \
+         mock.patch.object(infodengue_service, "fetch_raw_weeks", upstream.fetch_raw_weeks):
+        for weeks in order:
+            results[weeks] = await infodengue_service.get_historical_data(GEOCODE, weeks=weeks)
+
+    return results, upstream
+
+
+def test_current_week_first_does_not_poison_head() -> None:
+    """weeks=1 antes de weeks=5/16: as janelas maiores vêm do upstream."""
+    results, upstream = asyncio.run(_run([1, 5, 16]))
+    print(f"Chamadas ao upstream: {upstream.calls}")
+
+    for weeks in (5, 16):
+        fabricated = _fabricated(results[weeks], upstream.latest)
+        assert not fabricated, f"weeks={weeks}: semanas publicadas inventadas {fabricated}"
+
+
+def test_larger_window_first() -> None:
+    """weeks=5 antes de weeks=16 (ordem que já funcionava)."""
+    results, upstream = asyncio.run(_run([5, 16]))
+
+    for weeks in (5, 16):
+        fabricated = _fabricated(results[weeks], upstream.latest)
+        assert not fabricated, f"weeks={weeks}: semanas publicadas inventadas {fabricated}"
+
+
+def test_padding_keeps_week_order() -> None:
+    """Semanas ausentes são estimadas no próprio lugar, datadas com a semana."""
+    results, upstream = asyncio.run(_run([16]))
+    window = results[16]
+
+    expected = [w.isoformat() for w in last_epiweeks(date.today(), 16)]
+    assert [row["data"] for row in window] == expected, "janela fora de ordem"
+
+    for row in window:
+        published = date.fromisoformat(row["data"]) <= upstream.latest
+        assert (row["fonte"] == "InfoDengue") == published, f"linha trocada: {row['data']}"
+        if not published:
+            assert row["semana_epidemiologica"] == 0
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (
+        test_current_week_first_does_not_poison_head,
+        test_larger_window_first,
+        test_padding_keeps_week_order,
+    ):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,129 @@
+"""
+Teste do iter_json_array (leitura incremental de listas JSON).
+
+O corpo é picado em chunks de todos os tamanhos, inclusive cortando
+strings, números e caracteres UTF-8 de vários bytes ao meio; o resultado
+tem que ser igual ao de json.loads no corpo inteiro.
+
+Usage:
+    python test_json_stream.py
+"""
+
+import asyncio
+import json
+from typing import Any, List
+
+from app.core.json_stream import iter_json_array
+
+PAYLOAD = [
+    {"data_iniSE": 1704067200000, "casos": 12, "nivel": 2, "nome": "São José"},
+    {"texto": "fecha ] e vírgula , dentro", "lista": [1, [2, 3], {"k": "]"}]},
+    "string solta com ], vírgulas, e \"aspas\"",
+    -12.5e3,
+    12345678901234567890,
+    True,
+    None,
+    [],
+    {},
+]
+
+
+async def _chunked(body: bytes, size: int):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def _collect(body: bytes, size: int = 1 << 16, **kwargs) -> List[Any]:
+    async def run() -> List[Any]:
+        return [item async for item in iter_json_array(_chunked(body, size), **kwargs)]
+
+    return asyncio.run(run())
+
+
+def _error(body: bytes, size: int = 1 << 16, **kwargs) -> str:
+    try:
+        _collect(body, size, **kwargs)
+    except ValueError as e:
+        return str(e)
+    raise AssertionError(f"deveria falhar: {body[:40]!r}")
+
+
+def test_split_across_chunk_boundaries() -> None:
+    """Qualquer tamanho de chunk dá o mesmo resultado de json.loads."""
+    body = json.dumps(PAYLOAD, ensure_ascii=False, indent=1).encode("utf-8")
+    for size in range(1, 40):
+        assert _collect(body, size) == PAYLOAD, f"chunks de {size} bytes"
+
+
+def test_compact_body_split_everywhere() -> None:
+    """Sem espaços: cada posição de corte entre dois chunks."""
+    body = json.dumps(PAYLOAD, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    for cut in range(1, len(body)):
+        async def two_chunks():
+            yield body[:cut]
+            yield body[cut:]
+
+        async def run() -> List[Any]:
+            return [item async for item in iter_json_array(two_chunks())]
+
+        assert asyncio.run(run()) == PAYLOAD, f"corte no byte {cut}"
+
+
+def test_number_at_chunk_end_is_not_cut() -> None:
+    """Número no fim do chunk espera o próximo ("123" + "45" = 12345)."""
+    async def chunks():
+        yield b"[123"
+        yield b"45, -1."
+        yield b"5e"
+        yield b"2, 6"
+        yield b"7]"
+
+    async def run() -> List[Any]:
+        return [item async for item in iter_json_array(chunks())]
+
+    assert asyncio.run(run()) == [12345, -150.0, 67]
+
+
+def test_empty_array() -> None:
+    """Lista vazia, com e sem espaços."""
+    for body in (b"[]", b" [ \n ] ", b"[\n]\n"):
+        for size in (1, 2, 64):
+            assert _collect(body, size) == [], body
+
+
+def test_max_pending_overflow() -> None:
+    """Item incompleto maior que max_pending: ValueError."""
+    big = json.dumps([{"texto": "x" * 500}]).encode()
+    assert "maior que 100" in _error(big, size=10, max_pending=100)
+
+    # Itens pequenos passam com o mesmo limite, mesmo com o corpo grande
+    many = json.dumps([{"i": i} for i in range(200)]).encode()
+    assert len(_collect(many, size=10, max_pending=100)) == 200
+
+
+def test_invalid_bodies() -> None:
+    """Corpo vazio, não-lista e truncado."""
+    assert "vazia" in _error(b"")
+    assert "vazia" in _error(b"   ")
+    assert "não é uma lista" in _error(b'{"a": 1}')
+    assert "truncada" in _error(b'[{"a": 1}, {"b"', size=4)
+    assert "truncada" in _error(b"[1, 2", size=2)
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (
+        test_split_across_chunk_boundaries,
+        test_compact_body_split_everywhere,
+        test_number_at_chunk_end_is_not_cut,
+        test_empty_array,
+        test_max_pending_overflow,
+        test_invalid_bodies,
+    ):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
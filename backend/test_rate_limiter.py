@@ -0,0 +1,263 @@
+"""
+Teste do UpstreamRateLimiter (sem rede): reserva de usuários, espera
+máxima, cota diária e a contagem feita pelo RateLimitedTransport.
+
+Os limiters são criados com taxas altas (ou baixas) para que as esperas
+caibam em décimos de segundo; o Redis fica desconectado (bucket e ledger
+locais), exceto no teste do ledger compartilhado.
+
+Usage:
+    python test_rate_limiter.py
+"""
+
+import asyncio
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+from unittest import mock
+
+import httpx
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.rate_limiter import (
+    BACKGROUND,
+    INTERACTIVE,
+    RateLimitedTransport,
+    RateLimitExceeded,
+    UpstreamRateLimiter,
+)
+from app.core.retry_policy import LATENCY_METRIC
+from app.services.cache_service import cache_service
+from app.services.weather_service import weather_service
+
+SETTINGS = {
+    "openweather_rate_limit_shared": False,
+    "openweather_user_reserve": 0.25,
+    "openweather_max_wait": 2.0,
+    "openweather_background_quota_share": 0.5,
+}
+
+
+def _limiter(per_minute: int = 600, burst: int = 4, daily_quota: int = 1000) -> UpstreamRateLimiter:
+    metrics.reset()
+    return UpstreamRateLimiter("teste", per_minute=per_minute, burst=burst, daily_quota=daily_quota)
+
+
+def _run(scenario) -> None:
+    with mock.patch.multiple(settings, **SETTINGS), \
+         mock.patch.object(cache_service, "is_connected", False):
+        asyncio.run(scenario())
+
+
+async def _denied(limiter: UpstreamRateLimiter, priority: str) -> str:
+    """Motivo da recusa (falha se o token for concedido)."""
+    try:
+        await limiter.acquire(priority)
+    except RateLimitExceeded as e:
+        return e.reason
+    raise AssertionError(f"{priority}: token concedido")
+
+
+def test_interactive_waits_for_token() -> None:
+    """Bucket vazio: o usuário espera a reposição (dentro de max_wait)."""
+    limiter = _limiter(per_minute=600, burst=4)  # 10 tokens/s
+
+    async def scenario() -> None:
+        for _ in range(4):
+            await limiter.acquire(INTERACTIVE)
+
+        started = time.monotonic()
+        await limiter.acquire(INTERACTIVE)
+        waited = time.monotonic() - started
+
+        assert 0.05 <= waited < 0.5, f"esperou {waited:.2f}s"
+        assert metrics.histogram("rate_limit_wait_seconds", upstream="teste")["count"] == 1
+
+    _run(scenario)
+
+
+def test_interactive_max_wait_refuses_immediately() -> None:
+    """Espera maior que OPENWEATHER_MAX_WAIT: recusa na hora, sem dormir."""
+    limiter = _limiter(per_minute=6, burst=1)  # 1 token a cada 10s
+
+    async def scenario() -> None:
+        await limiter.acquire(INTERACTIVE)
+
+        started = time.monotonic()
+        reason = await _denied(limiter, INTERACTIVE)
+        assert "sem token" in reason
+        assert time.monotonic() - started < 0.1, "dormiu antes de recusar"
+        assert metrics.value("rate_limit_denials_total", upstream="teste", reason="tokens") == 1
+
+    _run(scenario)
+
+
+def test_background_leaves_user_reserve() -> None:
+    """Background para na reserva; o usuário ainda usa o token reservado."""
+    limiter = _limiter(per_minute=6, burst=4)  # reserva = 4 * 0.25 = 1 token
+
+    async def scenario() -> None:
+        for _ in range(3):
+            await limiter.acquire(BACKGROUND)
+
+        # O 4º token é dos usuários: background fica esperando
+        try:
+            await asyncio.wait_for(limiter.acquire(BACKGROUND), 0.1)
+            raise AssertionError("background usou a reserva")
+        except asyncio.TimeoutError:
+            pass
+
+        await limiter.acquire(INTERACTIVE)
+
+    _run(scenario)
+
+
+def test_background_waits_without_limit() -> None:
+    """Background não tem max_wait: espera a reposição acima da reserva."""
+    limiter = _limiter(per_minute=600, burst=4)
+
+    async def scenario() -> None:
+        for _ in range(3):
+            await limiter.acquire(BACKGROUND)
+
+        with mock.patch.object(settings, "openweather_max_wait", 0.0):
+            started = time.monotonic()
+            await limiter.acquire(BACKGROUND)
+            assert time.monotonic() - started >= 0.05
+
+    _run(scenario)
+
+
+def test_daily_quota_ledger() -> None:
+    """Background para em BACKGROUND_QUOTA_SHARE; usuários na cota inteira."""
+    limiter = _limiter(daily_quota=10)
+
+    async def scenario() -> None:
+        for _ in range(5):
+            await limiter.acquire(BACKGROUND)
+            await limiter.record_call(BACKGROUND)
+
+        assert "cota" in await _denied(limiter, BACKGROUND)
+
+        for _ in range(5):
+            await limiter.acquire(INTERACTIVE)
+            await limiter.record_call(INTERACTIVE)
+
+        assert "cota" in await _denied(limiter, INTERACTIVE)
+        assert metrics.value("rate_limit_denials_total", upstream="teste", reason="quota") == 2
+        stats = limiter.stats()
+        assert stats["quota_used"] == 10
+        assert stats["quota_by_priority"] == {BACKGROUND: 5, INTERACTIVE: 5}
+        assert limiter.under_pressure()
+
+        # Virada do dia zera o ledger
+        limiter._quota_day = (date.today() - timedelta(days=1)).isoformat()
+        await limiter.acquire(BACKGROUND)
+        assert limiter.stats()["quota_used"] == 0
+
+    _run(scenario)
+
+
+class FakePipeline:
+    """HINCRBY/EXPIRE/HGETALL sobre um ledger com chamadas de outras instâncias."""
+
+    def __init__(self, ledger: Dict[bytes, bytes], keys: List[str]):
+        self.ledger = ledger
+        self.keys = keys
+
+    def hincrby(self, key: str, field: str, amount: int) -> None:
+        self.keys.append(key)
+        current = int(self.ledger.get(field.encode(), b"0"))
+        self.ledger[field.encode()] = str(current + amount).encode()
+
+    def expire(self, key: str, ttl: int) -> None:
+        pass
+
+    def hgetall(self, key: str) -> None:
+        pass
+
+    async def execute(self) -> list:
+        return [1, True, dict(self.ledger)]
+
+
+def test_shared_ledger_mirrors_all_instances() -> None:
+    """Com Redis, o espelho local passa a ser a soma de todas as instâncias."""
+    limiter = _limiter(daily_quota=10)
+    ledger = {INTERACTIVE.encode(): b"6", BACKGROUND.encode(): b"3"}
+    keys: List[str] = []
+    client = mock.Mock(pipeline=lambda transaction: FakePipeline(ledger, keys))
+
+    async def scenario() -> None:
+        with mock.patch.object(cache_service, "is_connected", True), \
+             mock.patch.object(cache_service, "redis_client", client):
+            await limiter.record_call(INTERACTIVE)
+
+        assert keys == [limiter.quota_key(date.today().isoformat())]
+        assert limiter.stats()["quota_by_priority"] == {INTERACTIVE: 7, BACKGROUND: 3}
+        assert "cota" in await _denied(limiter, INTERACTIVE)
+
+    _run(scenario)
+
+
+class FakeTransport(httpx.AsyncBaseTransport):
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return httpx.Response(self.outcome, request=request)
+
+
+def test_transport_records_only_calls_that_left() -> None:
+    """Resposta e erro de rede contam na cota; breaker aberto não."""
+    limiter = _limiter()
+
+    async def send(outcome) -> None:
+        transport = RateLimitedTransport(FakeTransport(outcome), limiter)
+        try:
+            await transport.handle_async_request(httpx.Request("GET", "http://upstream"))
+        except httpx.TransportError:
+            pass
+
+    async def scenario() -> None:
+        await send(200)
+        await send(httpx.ConnectError("x"))
+        await send(CircuitOpenError("teste", 30))
+        assert limiter.stats()["quota_used"] == 2
+
+    _run(scenario)
+
+
+def test_openweather_never_hedges() -> None:
+    """Hedge gastaria token e cota: a política do OpenWeather não dispara."""
+    metrics.reset()
+    for _ in range(1000):
+        metrics.observe(LATENCY_METRIC, 0.01, upstream="openweather")
+    metrics.incr("http_client_attempts_total", 1000, upstream="openweather")
+
+    assert weather_service.retry_policy._hedge_delay() is None
+    metrics.reset()
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (
+        test_interactive_waits_for_token,
+        test_interactive_max_wait_refuses_immediately,
+        test_background_leaves_user_reserve,
+        test_background_waits_without_limit,
+        test_daily_quota_ledger,
+        test_shared_ledger_mirrors_all_instances,
+        test_transport_records_only_calls_that_left,
+        test_openweather_never_hedges,
+    ):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,173 @@
+"""
+Teste da RetryPolicy (sem rede): deadline, Retry-After e hedging.
+
+As requisições são uma ``call`` falsa que devolve respostas httpx
+montadas à mão depois de um atraso configurável.
+
+Usage:
+    python test_retry_policy.py
+"""
+
+import asyncio
+import time
+from typing import List, Optional, Tuple, Union
+from unittest import mock
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.retry_policy import LATENCY_METRIC, RetryPolicy
+
+# (atraso em segundos, status HTTP ou exceção, headers)
+Step = Tuple[float, Union[int, Exception], Optional[dict]]
+
+
+class FakeCall:
+    """Devolve as respostas do roteiro em ordem (a última se repete)."""
+
+    def __init__(self, plan: List[Step]):
+        self.plan = plan
+        self.calls = 0
+
+    async def __call__(self) -> httpx.Response:
+        delay, outcome, headers = self.plan[min(self.calls, len(self.plan) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(
+            outcome, headers=headers or {}, request=httpx.Request("GET", "http://upstream")
+        )
+
+
+def _policy(**kwargs) -> RetryPolicy:
+    metrics.reset()
+    options = {"max_retries": 5, "deadline": 5.0, "base_delay": 0.01, "max_delay": 0.05}
+    options.update(kwargs)
+    return RetryPolicy("teste", **options)
+
+
+def _warm_latency(seconds: float, samples: int = 1000, attempts: Optional[int] = None) -> None:
+    """Histórico de latência (p95) e tentativas anteriores (orçamento do hedge)."""
+    for _ in range(samples):
+        metrics.observe(LATENCY_METRIC, seconds, upstream="teste")
+    metrics.incr(
+        "http_client_attempts_total",
+        samples if attempts is None else attempts,
+        upstream="teste",
+    )
+
+
+def test_deadline_stops_retries() -> None:
+    """503 contínuo: para no deadline, mesmo com tentativas sobrando."""
+    policy = _policy(max_retries=50, deadline=0.5, base_delay=0.1, max_delay=0.1)
+    call = FakeCall([(0.0, 503, None)])
+
+    started = time.monotonic()
+    response = asyncio.run(policy.run(call))
+    elapsed = time.monotonic() - started
+
+    assert response.status_code == 503
+    assert elapsed < 0.6, f"passou do deadline: {elapsed:.2f}s"
+    assert call.calls < 50, f"{call.calls} tentativas"
+
+
+def test_deadline_cuts_slow_attempt() -> None:
+    """Tentativa que não responde: TimeoutException no deadline."""
+    policy = _policy(deadline=0.2, hedge=False)
+    call = FakeCall([(5.0, 200, None)])
+
+    started = time.monotonic()
+    try:
+        asyncio.run(policy.run(call))
+        raise AssertionError("deveria estourar o deadline")
+    except httpx.TimeoutException:
+        pass
+    assert time.monotonic() - started < 0.5
+
+
+def test_retry_after_is_honoured() -> None:
+    """429 com Retry-After: 1 espera ao menos 1s antes de repetir."""
+    policy = _policy(deadline=5.0)
+    call = FakeCall([(0.0, 429, {"Retry-After": "1"}), (0.0, 200, None)])
+
+    started = time.monotonic()
+    response = asyncio.run(policy.run(call))
+    elapsed = time.monotonic() - started
+
+    assert response.status_code == 200
+    assert call.calls == 2
+    assert elapsed >= 1.0, f"repetiu antes do Retry-After: {elapsed:.2f}s"
+
+
+def test_retry_after_beyond_deadline_gives_up() -> None:
+    """Retry-After maior que o prazo restante: devolve o 429 sem esperar."""
+    policy = _policy(deadline=1.0)
+    call = FakeCall([(0.0, 429, {"Retry-After": "30"})])
+
+    started = time.monotonic()
+    response = asyncio.run(policy.run(call))
+
+    assert response.status_code == 429
+    assert call.calls == 1
+    assert time.monotonic() - started < 0.5
+
+
+def test_retryable_hedge_result_never_wins() -> None:
+    """A primeira a responder com 5xx/429 não vence a corrida do hedge."""
+    cases = [
+        # original 503 antes do hedge 200
+        ([(0.10, 503, None), (0.15, 200, None)], 200),
+        # hedge 429 antes da original 200
+        ([(0.20, 200, None), (0.02, 429, None)], 200),
+        # as duas ruins: fica com a original
+        ([(0.10, 503, None), (0.02, 429, None)], 503),
+    ]
+    for plan, expected in cases:
+        policy = _policy(max_retries=0)
+        _warm_latency(0.01)
+        call = FakeCall(plan)
+
+        response = asyncio.run(policy.run(call))
+
+        assert call.calls == 2, f"{plan}: hedge não disparou"
+        assert response.status_code == expected, f"{plan}: {response.status_code}"
+
+
+def test_hedge_budget_limits_extra_requests() -> None:
+    """Com todas as requisições lentas, hedges <= HTTP_HEDGE_BUDGET das tentativas."""
+    policy = _policy(max_retries=0)
+    _warm_latency(0.005, attempts=1)
+    call = FakeCall([(0.03, 200, None)])
+
+    async def run_many() -> None:
+        for _ in range(40):
+            await policy.run(call)
+
+    with mock.patch.object(settings, "http_hedge_budget", 0.1):
+        asyncio.run(run_many())
+
+    hedges = metrics.value("http_client_hedges_total", upstream="teste")
+    assert hedges > 0, "nenhum hedge disparado"
+    assert hedges <= 0.1 * call.calls + 1, f"{hedges} hedges para {call.calls} requisições"
+    assert call.calls == 40 + hedges
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (
+        test_deadline_stops_retries,
+        test_deadline_cuts_slow_attempt,
+        test_retry_after_is_honoured,
+        test_retry_after_beyond_deadline_gives_up,
+        test_retryable_hedge_result_never_wins,
+        test_hedge_budget_limits_extra_requests,
+    ):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
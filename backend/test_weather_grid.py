@@ -0,0 +1,103 @@
+"""
+Teste do índice espacial do WeatherGrid (sem Redis).
+
+nearest_cached() deve achar a célula em cache mais próxima dentro do
+raio, mesmo quando as NEAREST_CANDIDATES vizinhas mais próximas não estão
+em cache, e também células registradas fora do mapeamento das cidades.
+
+Usage:
+    python test_weather_grid.py
+"""
+
+import asyncio
+from typing import Dict, List
+from unittest import mock
+
+from app.services.cache_service import cache_service
+from app.services.weather_grid import NEAREST_CANDIDATES, WeatherGrid
+from app.services.weather_service import weather_service
+
+# Cidades em linha, 0.1° de longitude entre elas (uma célula cada)
+CITIES = [
+    {
+        "ibge_codigo": str(4100000 + i),
+        "latitude": -25.0,
+        "longitude": -50.0 + 0.1 * i,
+        "populacao": 1000,
+    }
+    for i in range(NEAREST_CANDIDATES * 3)
+]
+
+
+class FakeCache:
+    """get_many em memória, contando as idas ao "Redis"."""
+
+    def __init__(self, data: Dict[str, Dict]):
+        self.data = data
+        self.mgets = 0
+
+    async def get_many(self, keys: List[str]) -> List:
+        self.mgets += 1
+        return [self.data.get(key) for key in keys]
+
+
+def _nearest(grid: WeatherGrid, cache: FakeCache, lat: float, lon: float, radius_km: float):
+    async def run():
+        with mock.patch.object(cache_service, "get_many", cache.get_many):
+            return await grid.nearest_cached(lat, lon, radius_km)
+
+    return asyncio.run(run())
+
+
+def test_cached_cell_beyond_first_candidates() -> None:
+    """Só uma célula além das NEAREST_CANDIDATES mais próximas em cache."""
+    grid = WeatherGrid(CITIES)
+    far_city = CITIES[NEAREST_CANDIDATES + 3]
+    far_key = grid.cell_for_city(far_city["ibge_codigo"])
+    cache = FakeCache({far_key: {"temperatura_atual": 21.0}})
+
+    found = _nearest(grid, cache, -25.0, -50.0, radius_km=500)
+
+    assert found is not None, "célula em cache dentro do raio não encontrada"
+    weather, distance = found
+    assert weather["temperatura_atual"] == 21.0
+    assert cache.mgets == 2, f"{cache.mgets} MGETs"
+
+
+def test_nothing_cached_reads_whole_radius() -> None:
+    """Sem nada em cache: percorre o raio inteiro e devolve None."""
+    grid = WeatherGrid(CITIES)
+    cache = FakeCache({})
+
+    assert _nearest(grid, cache, -25.0, -50.0, radius_km=500) is None
+    assert cache.mgets == 3
+
+
+def test_registered_cell_is_considered() -> None:
+    """Célula avulsa (ex: busca por nome) entra no índice ao ser gravada."""
+    grid = WeatherGrid(CITIES)
+    lat, lon = -23.55, -46.63  # fora do mapeamento das cidades
+    key = weather_service._get_grid_key(lat, lon)
+    cache = FakeCache({key: {"temperatura_atual": 30.0}})
+
+    assert _nearest(grid, cache, -23.5, -46.6, radius_km=20) is None
+
+    grid.register_cell(key, lat, lon)
+    found = _nearest(grid, cache, -23.5, -46.6, radius_km=20)
+    assert found is not None and found[0]["temperatura_atual"] == 30.0
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (
+        test_cached_cell_beyond_first_candidates,
+        test_nothing_cached_reads_whole_radius,
+        test_registered_cell_is_considered,
+    ):
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
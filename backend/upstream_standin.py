@@ -0,0 +1,453 @@
+"""
+════════════════════════════════════════════════════════════════════════════
+UPSTREAM STAND-IN - INFODENGUE E OPENWEATHER LOCAIS PARA TESTE DE CARGA
+════════════════════════════════════════════════════════════════════════════
+
+Servidor local que imita os endpoints usados pela API:
+
+    GET /api/alertcity          InfoDengue (geocode, ew/ey start/end)
+    GET /data/2.5/weather       OpenWeather - clima atual (lat/lon ou q)
+    GET /data/2.5/forecast      OpenWeather - previsão 5 dias / 3h
+
+Modos:
+
+    replay (padrão)  Responde com as fixtures gravadas em --fixtures.
+                     Sem fixture, gera dados sintéticos determinísticos
+                     (mesma entrada -> mesma resposta), então as 399
+                     cidades funcionam sem gravar nada.
+    --record         Repassa cada requisição ao upstream real e grava a
+                     resposta como fixture (use com uma chave real do
+                     OpenWeather configurada na API).
+
+Falhas injetadas (só no replay, por requisição, nesta ordem):
+
+    --latency-ms / --jitter-ms   Atraso antes de responder
+    --rate-limit-rate            Fração de respostas 429 (com Retry-After)
+    --error-rate                 Fração de respostas 503
+    --hang-rate / --hang-s       Fração de requisições que "travam"
+                                 (exercita timeouts e o circuit breaker)
+    --openweather-per-minute     Limite real por minuto (429 acima dele)
+
+A configuração pode ser trocada durante o teste:
+
+    curl -X POST localhost:8099/_standin/config -d '{"error_rate": 0.5}'
+    curl localhost:8099/_standin/stats
+
+Uso:
+    python upstream_standin.py --port 8099 --latency-ms 150 --error-rate 0.05
+
+    # Na API (.env ou ambiente):
+    INFODENGUE_BASE_URL=http://127.0.0.1:8099/api
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8099/data/2.5
+
+Autor: Dengo Team
+Data: 2026-10-18
+════════════════════════════════════════════════════════════════════════════
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core.epiweek import date_to_epiweek, epiweek_id, epiweek_to_date
+
+REAL_UPSTREAMS = {
+    "infodengue": "https://info.dengue.mat.br/api",
+    "openweather": "https://api.openweathermap.org/data/2.5",
+}
+
+DEFAULT_FIXTURES_DIR = Path(__file__).parent / "data" / "upstream_fixtures"
+
+
+@dataclass
+class StandInConfig:
+    """Parâmetros do stand-in (alteráveis em /_standin/config)."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_s: int = 5
+    hang_rate: float = 0.0
+    hang_s: float = 30.0
+    openweather_per_minute: int = 0
+    record: bool = False
+    seed: Optional[int] = None
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ════════════════════════════════════════════════════════════════════════════
+
+
+class FixtureStore:
+    """Respostas gravadas em ``{dir}/{upstream}/{chave}.json``."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, upstream: str, key: str) -> Path:
+        return self.root / upstream / f"{key}.json"
+
+    def load(self, upstream: str, key: str) -> Optional[Dict]:
+        path = self._path(upstream, key)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, upstream: str, key: str, status_code: int, body) -> None:
+        path = self._path(upstream, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"status_code": status_code, "body": body}, f, ensure_ascii=False)
+        tmp.replace(path)
+
+
+def _cell(lat: float, lon: float) -> str:
+    """Mesma célula do Smart Grid da API (0.1°)."""
+    return f"{round(lat, 1)}_{round(lon, 1)}"
+
+
+def _rng(*parts) -> random.Random:
+    """Gerador determinístico por entrada (mesma requisição, mesmos dados)."""
+    digest = hashlib.sha256(":".join(map(str, parts)).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# DADOS SINTÉTICOS
+# ════════════════════════════════════════════════════════════════════════════
+
+
+def synthetic_alertcity(geocode: str, ew_start: int, ew_end: int, ey_start: int, ey_end: int) -> List[Dict]:
+    """Linhas no formato do alertcity, com sazonalidade (pico no verão)."""
+    city = _rng("city", geocode)
+    base = city.uniform(5, 150)
+    population = city.randint(2_000, 1_800_000)
+
+    first = epiweek_to_date(ey_start, ew_start)
+    last = min(epiweek_to_date(ey_end, ew_end), date.today())
+    rows = []
+
+    week = first
+    while week <= last:
+        noise = _rng("week", geocode, week.isoformat())
+        _, number = date_to_epiweek(week)
+        season = 1 + 0.9 * math.sin(2 * math.pi * (number - 1) / 52 + math.pi / 2)
+        casos_est = max(0.0, base * season * noise.uniform(0.7, 1.3))
+        tempmin = 14 + 6 * season + noise.uniform(-2, 2)
+        umidmin = 45 + 10 * season + noise.uniform(-5, 5)
+
+        rows.append(
+            {
+                "data_iniSE": int(
+                    datetime(week.year, week.month, week.day, tzinfo=timezone.utc).timestamp() * 1000
+                ),
+                "SE": epiweek_id(week),
+                "casos_est": round(casos_est, 1),
+                "casos_est_min": int(casos_est * 0.8),
+                "casos_est_max": int(casos_est * 1.2) + 1,
+                "casos": int(casos_est * noise.uniform(0.8, 1.0)),
+                "p_rt1": round(noise.random(), 3),
+                "p_inc100k": round(casos_est / population * 1e5, 3),
+                "Localidade_id": 0,
+                "nivel": 1 + min(3, int(casos_est / base)),
+                "id": int(f"{geocode}{epiweek_id(week)}"),
+                "versao_modelo": "standin",
+                "Rt": round(noise.uniform(0.6, 1.6), 3),
+                "pop": population,
+                "tempmin": round(tempmin, 2),
+                "tempmed": round(tempmin + 5, 2),
+                "tempmax": round(tempmin + 10, 2),
+                "umidmin": round(umidmin, 2),
+                "umidmed": round(umidmin + 15, 2),
+                "umidmax": round(min(100.0, umidmin + 35), 2),
+                "receptivo": int(season > 1),
+                "transmissao": int(casos_est > base),
+                "nivel_inc": 0,
+                "notif_accum_year": 0,
+            }
+        )
+        week += timedelta(weeks=1)
+
+    # O alertcity devolve da semana mais recente para a mais antiga
+    return rows[::-1]
+
+
+def _synthetic_main(rng: random.Random) -> Dict:
+    temp = rng.uniform(12, 32)
+    return {
+        "temp": round(temp, 2),
+        "feels_like": round(temp + rng.uniform(-2, 2), 2),
+        "temp_min": round(temp - rng.uniform(0, 3), 2),
+        "temp_max": round(temp + rng.uniform(0, 3), 2),
+        "pressure": rng.randint(1005, 1025),
+        "humidity": rng.randint(35, 98),
+    }
+
+
+def synthetic_weather(lat: float, lon: float, now: int) -> Dict:
+    """Resposta de /weather (muda a cada hora, estável dentro dela)."""
+    rng = _rng("weather", _cell(lat, lon), now // 3600)
+    return {
+        "coord": {"lon": lon, "lat": lat},
+        "weather": [{"id": 802, "main": "Clouds", "description": "nuvens dispersas", "icon": "03d"}],
+        "main": _synthetic_main(rng),
+        "dt": now,
+        "timezone": -10800,
+        "name": "Stand-in",
+        "cod": 200,
+    }
+
+
+def synthetic_forecast(lat: float, lon: float, now: int) -> Dict:
+    """Resposta de /forecast: 40 pontos de 3h a partir da próxima janela."""
+    start = now - now % 10800 + 10800
+    points = []
+    for i in range(40):
+        dt = start + i * 10800
+        rng = _rng("forecast", _cell(lat, lon), dt)
+        points.append(
+            {
+                "dt": dt,
+                "main": _synthetic_main(rng),
+                "weather": [{"id": 500, "main": "Rain", "description": "chuva leve", "icon": "10d"}],
+                "dt_txt": _dt_txt(dt),
+            }
+        )
+    return {"cod": "200", "cnt": len(points), "list": points, "city": {"coord": {"lat": lat, "lon": lon}}}
+
+
+def _dt_txt(dt: int) -> str:
+    return datetime.fromtimestamp(dt, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _shift_forecast(body: Dict, now: int) -> Dict:
+    """Fixture gravada: desloca os horários para começar na próxima janela."""
+    points = body.get("list") or []
+    if not points:
+        return body
+    offset = (now - now % 10800 + 10800) - points[0]["dt"]
+    shifted = []
+    for point in points:
+        dt = point["dt"] + offset
+        shifted.append(
+            {**point, "dt": dt, "dt_txt": _dt_txt(dt)}
+        )
+    return {**body, "list": shifted}
+
+
+# ════════════════════════════════════════════════════════════════════════════
+# APP
+# ════════════════════════════════════════════════════════════════════════════
+
+
+def create_app(config: StandInConfig, fixtures: FixtureStore) -> FastAPI:
+    """Monta o app do stand-in."""
+    app = FastAPI(title="Dengo upstream stand-in", docs_url=None, redoc_url=None)
+    stats: Counter = Counter()
+    minute_window = {"minute": 0, "count": 0}
+    rng = random.Random(config.seed)
+    proxy = httpx.AsyncClient(timeout=30.0)
+
+    @app.on_event("shutdown")
+    async def close_proxy() -> None:
+        await proxy.aclose()
+
+    async def inject_faults(upstream: str) -> Optional[JSONResponse]:
+        """Atraso e falhas configuradas. None = segue para a resposta."""
+        stats[f"{upstream}.requests"] += 1
+
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if upstream == "openweather" and config.openweather_per_minute > 0:
+            minute = int(time.time() // 60)
+            if minute != minute_window["minute"]:
+                minute_window.update(minute=minute, count=0)
+            minute_window["count"] += 1
+            if minute_window["count"] > config.openweather_per_minute:
+                stats[f"{upstream}.429_quota"] += 1
+                return JSONResponse(
+                    {"cod": 429, "message": "Your account is temporary blocked due to exceeding of requests limitation"},
+                    status_code=429,
+                    headers={"Retry-After": str(60 - int(time.time()) % 60)},
+                )
+
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            stats[f"{upstream}.429"] += 1
+            return JSONResponse(
+                {"cod": 429, "message": "rate limited (stand-in)"},
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after_s)},
+            )
+        roll -= config.rate_limit_rate
+        if roll < config.error_rate:
+            stats[f"{upstream}.503"] += 1
+            return JSONResponse({"message": "service unavailable (stand-in)"}, status_code=503)
+        roll -= config.error_rate
+        if roll < config.hang_rate:
+            stats[f"{upstream}.hang"] += 1
+            await asyncio.sleep(config.hang_s)
+            return JSONResponse({"message": "gateway timeout (stand-in)"}, status_code=504)
+        return None
+
+    async def record(upstream: str, path: str, request: Request, key: str) -> JSONResponse:
+        """Repassa ao upstream real e grava a resposta."""
+        response = await proxy.get(f"{REAL_UPSTREAMS[upstream]}{path}", params=dict(request.query_params))
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        if response.status_code == 200:
+            fixtures.save(upstream, key, response.status_code, body)
+            stats[f"{upstream}.recorded"] += 1
+        return JSONResponse(body, status_code=response.status_code)
+
+    @app.get("/api/alertcity")
+    async def alertcity(
+        request: Request,
+        geocode: str,
+        ew_start: int = 1,
+        ew_end: int = 53,
+        ey_start: int = 0,
+        ey_end: int = 0,
+    ):
+        this_year = date.today().year
+        ey_start, ey_end = ey_start or this_year, ey_end or this_year
+        key = f"alertcity_{geocode}_{ey_start}{ew_start:02d}_{ey_end}{ew_end:02d}"
+
+        # Gravação vai direto ao upstream real (sem falhas injetadas)
+        if config.record:
+            return await record("infodengue", "/alertcity", request, key)
+        fault = await inject_faults("infodengue")
+        if fault is not None:
+            return fault
+
+        fixture = fixtures.load("infodengue", key)
+        if fixture is not None:
+            stats["infodengue.replayed"] += 1
+            return JSONResponse(fixture["body"], status_code=fixture["status_code"])
+
+        stats["infodengue.synthetic"] += 1
+        return synthetic_alertcity(geocode, ew_start, min(ew_end, 53), ey_start, ey_end)
+
+    async def openweather(endpoint: str, request: Request):
+        params = request.query_params
+        now = int(time.time())
+
+        if "lat" in params and "lon" in params:
+            lat, lon = float(params["lat"]), float(params["lon"])
+            key = f"{endpoint}_{_cell(lat, lon)}"
+        else:
+            # Busca por nome (q=Cidade,UF,BR): coordenadas sintéticas estáveis
+            name = params.get("q", "")
+            name_rng = _rng("name", name.lower())
+            lat, lon = name_rng.uniform(-26.5, -22.5), name_rng.uniform(-54.5, -48.0)
+            key = f"{endpoint}_q_{hashlib.sha1(name.lower().encode()).hexdigest()[:12]}"
+
+        if config.record:
+            return await record("openweather", f"/{endpoint}", request, key)
+        fault = await inject_faults("openweather")
+        if fault is not None:
+            return fault
+
+        fixture = fixtures.load("openweather", key)
+        if fixture is not None:
+            stats["openweather.replayed"] += 1
+            body = fixture["body"]
+            if endpoint == "forecast":
+                body = _shift_forecast(body, now)
+            else:
+                body = {**body, "dt": now}
+            return JSONResponse(body, status_code=fixture["status_code"])
+
+        stats["openweather.synthetic"] += 1
+        if endpoint == "forecast":
+            return synthetic_forecast(lat, lon, now)
+        return synthetic_weather(lat, lon, now)
+
+    @app.get("/data/2.5/weather")
+    async def weather(request: Request):
+        return await openweather("weather", request)
+
+    @app.get("/data/2.5/forecast")
+    async def forecast(request: Request):
+        return await openweather("forecast", request)
+
+    @app.get("/_standin/stats")
+    async def get_stats():
+        return {"config": asdict(config), "counters": dict(sorted(stats.items()))}
+
+    @app.post("/_standin/config")
+    async def update_config(request: Request):
+        changes = await request.json()
+        for name, value in changes.items():
+            if name in ("record", "seed") or not hasattr(config, name):
+                return JSONResponse({"error": f"campo inválido: {name}"}, status_code=400)
+            setattr(config, name, type(getattr(config, name))(value))
+        return asdict(config)
+
+    @app.post("/_standin/reset")
+    async def reset_stats():
+        stats.clear()
+        return {"ok": True}
+
+    return app
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Stand-in local do InfoDengue e do OpenWeather")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--record", action="store_true", help="Grava respostas do upstream real")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de respostas 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fração de respostas 429")
+    parser.add_argument("--retry-after-s", type=int, default=5)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-s", type=float, default=30.0)
+    parser.add_argument("--openweather-per-minute", type=int, default=0, help="0 = sem limite")
+    parser.add_argument("--seed", type=int, default=None, help="Semente das falhas injetadas")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = StandInConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_s=args.retry_after_s,
+        hang_rate=args.hang_rate,
+        hang_s=args.hang_s,
+        openweather_per_minute=args.openweather_per_minute,
+        record=args.record,
+        seed=args.seed,
+    )
+
+    print(f"🎭 Upstream stand-in em http://{args.host}:{args.port} (fixtures: {args.fixtures})")
+    print(f"   INFODENGUE_BASE_URL=http://{args.host}:{args.port}/api")
+    print(f"   OPENWEATHER_BASE_URL=http://{args.host}:{args.port}/data/2.5")
+    uvicorn.run(create_app(config, FixtureStore(args.fixtures)), host=args.host, port=args.port, log_level="warning")